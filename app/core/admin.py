@@ -1,10 +1,81 @@
 from django.contrib import admin
 from .models import Customer, ProductLine, ProductGeneration, ComponentType, Component, AddOnProduct, Platform
 
-admin.site.register(Customer)
-admin.site.register(ProductLine)
-admin.site.register(ProductGeneration)
-admin.site.register(ComponentType)
-admin.site.register(Component)
-admin.site.register(AddOnProduct)
-admin.site.register(Platform)
+
+class ProductGenerationListFilter(admin.SimpleListFilter):
+    """
+    Filters on a Product Generation, labelled from one query instead of one per choice.
+
+    ``generation_lookup`` is the field path from the filtered model to its ProductGeneration.
+    """
+    title = 'product generation'
+    parameter_name = 'product_generation'
+    generation_lookup = 'product_generation'
+
+    def lookups(self, request, model_admin):
+        generations = ProductGeneration.objects.order_by('product_line__name', 'generation_number').values_list(
+            'id', 'product_line__name', 'generation_number'
+        )
+        return [(str(pk), f'{line_name} - Gen {number}') for pk, line_name, number in generations]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{f'{self.generation_lookup}_id': self.value()})
+        return queryset
+
+
+@admin.register(Customer)
+class CustomerAdmin(admin.ModelAdmin):
+    list_display = ['name', 'timezone']
+    search_fields = ['name']
+    ordering = ['name']
+
+
+@admin.register(ProductLine)
+class ProductLineAdmin(admin.ModelAdmin):
+    list_display = ['name']
+    search_fields = ['name']
+    ordering = ['name']
+
+
+@admin.register(ProductGeneration)
+class ProductGenerationAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'product_line', 'generation_number']
+    list_select_related = ['product_line']
+    list_filter = ['product_line']
+    search_fields = ['product_line__name', 'generation_number']
+    ordering = ['product_line__name', 'generation_number']
+
+
+@admin.register(ComponentType)
+class ComponentTypeAdmin(admin.ModelAdmin):
+    list_display = ['name']
+    search_fields = ['name']
+    ordering = ['name']
+
+
+@admin.register(Component)
+class ComponentAdmin(admin.ModelAdmin):
+    list_display = ['name', 'requires_customer_preset']
+    list_filter = ['requires_customer_preset']
+    search_fields = ['name']
+    ordering = ['name']
+    autocomplete_fields = ['component_types', 'add_on_products']
+
+
+@admin.register(AddOnProduct)
+class AddOnProductAdmin(admin.ModelAdmin):
+    list_display = ['name']
+    search_fields = ['name']
+    ordering = ['name']
+    autocomplete_fields = ['components']
+
+
+@admin.register(Platform)
+class PlatformAdmin(admin.ModelAdmin):
+    list_display = ['iris_number', 'product_generation', 'customer']
+    list_select_related = ['product_generation__product_line', 'customer']
+    list_filter = [ProductGenerationListFilter]
+    search_fields = ['iris_number', 'customer__name']
+    ordering = ['iris_number']
+    autocomplete_fields = ['product_generation', 'customer', 'components', 'add_ons']
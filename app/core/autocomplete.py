@@ -0,0 +1,54 @@
+from bisect import bisect_left
+
+from .models import Customer
+from .snapshots import VersionedSnapshot
+
+
+class CustomerNameIndex:
+    """
+    Sorted, case-folded customer names for ranked autocomplete lookups.
+    """
+
+    def __init__(self, names):
+        self.entries = sorted({(name.casefold(), name) for name in names})
+        self.keys = [key for key, _ in self.entries]
+
+    @classmethod
+    def build(cls):
+        return cls(Customer.objects.values_list('name', flat=True))
+
+    def search(self, term, limit):
+        """
+        Returns up to ``limit`` names matching ``term``, ranked as: names starting
+        with the term, then names with a word starting with it, then any other
+        names containing it. Each rank is alphabetical.
+        """
+        term = term.strip().casefold()
+        if not term or limit <= 0:
+            return []
+
+        # Names starting with the term are a contiguous run of the sorted keys
+        results = []
+        position = bisect_left(self.keys, term)
+        while position < len(self.keys) and self.keys[position].startswith(term) and len(results) < limit:
+            results.append(self.entries[position][1])
+            position += 1
+        if len(results) == limit:
+            return results
+
+        word_matches, other_matches = [], []
+        word_term = f' {term}'
+        for key, name in self.entries:
+            if key.startswith(term):
+                continue
+            if word_term in key:
+                word_matches.append(name)
+                if len(results) + len(word_matches) == limit:
+                    break
+            elif term in key and len(results) + len(other_matches) < limit:
+                other_matches.append(name)
+
+        return (results + word_matches + other_matches)[:limit]
+
+
+customer_name_index = VersionedSnapshot('core.customer_names', CustomerNameIndex.build)
@@ -0,0 +1,92 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Routing state of the request being handled in the current thread or task, if any
+_current_state = ContextVar('replica_routing', default=None)
+
+
+class RoutingState:
+    """
+    Whether reads may go to the replica, and whether anything has been written since.
+    """
+
+    def __init__(self, use_replica=False):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+def replica_alias():
+    """
+    Returns the configured replica database alias, or None when there is no replica.
+
+    A replica that points at the primary's own database, as a test mirror
+    does, is not worth routing to. A streaming replica usually has the same
+    database NAME on another host, so the host and port are compared too.
+    """
+    alias = getattr(settings, 'REPLICA_DATABASE', None)
+    if not alias:
+        return None
+    if alias in connections and database_location(alias) == database_location(DEFAULT_DB_ALIAS):
+        return None
+    return alias
+
+
+def database_location(alias):
+    settings_dict = connections[alias].settings_dict
+    return settings_dict.get('HOST'), settings_dict.get('PORT'), settings_dict['NAME']
+
+
+def current_state():
+    return _current_state.get()
+
+
+@contextmanager
+def routing_state(use_replica=False):
+    """
+    Tracks reads and writes for the enclosed block; reads go to the replica
+    once ``use_replica`` is set, until the first write.
+    """
+    state = RoutingState(use_replica)
+    token = _current_state.set(state)
+    try:
+        yield state
+    finally:
+        _current_state.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads to the replica inside a routing_state that allows it, and everything else to the primary.
+
+    Outside of such a block, and after the block has written anything, every
+    query goes to the primary so a request always reads its own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = replica_alias()
+        state = current_state()
+        if alias is None or state is None or not state.use_replica or state.wrote:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = current_state()
+        if state is not None:
+            state.wrote = True
+        # Explicit, or rows read from the replica would be saved back to it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Unsaved instances have no database yet and will be written to the primary
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if (obj1._state.db or DEFAULT_DB_ALIAS) in aliases and (obj2._state.db or DEFAULT_DB_ALIAS) in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == replica_alias():
+            return False
+        return None
@@ -0,0 +1,227 @@
+import json
+import logging
+import math
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+from .db_router import current_state, replica_alias, routing_state
+
+logger = logging.getLogger(__name__)
+
+# Metrics of the request being handled in the current thread or task, if instrumented
+_current_metrics = ContextVar('request_metrics', default=None)
+_template_patch_lock = threading.Lock()
+
+
+class RequestMetrics:
+    """
+    SQL and render timings collected while handling one request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.render_seconds = 0.0
+        self.render_depth = 0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper timing every query.
+        """
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.queries += 1
+            self.statements[(sql, repr(params))] += 1
+
+    def duplicates(self):
+        """
+        Returns how many queries repeated an earlier statement with the same parameters.
+        """
+        return sum(count - 1 for count in self.statements.values())
+
+    def as_dict(self):
+        return {
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'db_ms': round(self.db_seconds * 1000, 2),
+            'render_ms': round(self.render_seconds * 1000, 2),
+            'queries': self.queries,
+            'duplicate_queries': self.duplicates(),
+        }
+
+
+class RequestStats:
+    """
+    Recent request metrics per view, kept in memory for percentile summaries.
+
+    Each process keeps its own window of the last ``samples`` requests per view.
+    """
+    PERCENTILES = (50, 90, 99)
+    METRICS = ('total_ms', 'db_ms', 'render_ms', 'queries', 'duplicate_queries')
+
+    def __init__(self, samples):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._views = defaultdict(lambda: deque(maxlen=self.samples))
+
+    def record(self, view, metrics):
+        with self._lock:
+            self._views[view].append(metrics)
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()
+
+    def summary(self):
+        """
+        Returns {view: {'count': n, metric: {'p50': ..., 'p90': ..., 'p99': ...}}}.
+        """
+        with self._lock:
+            views = {view: list(samples) for view, samples in self._views.items()}
+
+        summary = {}
+        for view, samples in sorted(views.items()):
+            entry = {'count': len(samples)}
+            for metric in self.METRICS:
+                values = sorted(sample[metric] for sample in samples)
+                entry[metric] = {f'p{p}': self.percentile(values, p) for p in self.PERCENTILES}
+            summary[view] = entry
+        return summary
+
+    @staticmethod
+    def percentile(values, percent):
+        """
+        Nearest-rank percentile of sorted ``values``.
+        """
+        if not values:
+            return None
+        rank = max(math.ceil(percent / 100 * len(values)), 1)
+        return values[rank - 1]
+
+
+request_stats = RequestStats(getattr(settings, 'REQUEST_INSTRUMENTATION_SAMPLES', 1000))
+
+
+def _instrumented_render(original):
+    def render(self, context):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return original(self, context)
+        # Only the outermost template counts, so includes are not added twice
+        metrics.render_depth += 1
+        started = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            metrics.render_depth -= 1
+            if metrics.render_depth == 0:
+                metrics.render_seconds += time.perf_counter() - started
+    render.instrumented = True
+    return render
+
+
+def _instrument_templates():
+    with _template_patch_lock:
+        if not getattr(Template._render, 'instrumented', False):
+            Template._render = _instrumented_render(Template._render)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Measures SQL query count, database time, duplicate queries and template render time per request.
+
+    Enabled with the REQUEST_INSTRUMENTATION setting. Each request gets a
+    Server-Timing header and a JSON log line, and the metrics are aggregated
+    per view for RequestStatsView.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _instrument_templates()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+
+        values = metrics.as_dict()
+        view = self.view_name(request)
+        request_stats.record(view, values)
+
+        response['Server-Timing'] = ', '.join([
+            f'total;dur={values["total_ms"]}',
+            f'db;dur={values["db_ms"]};desc="{values["queries"]} queries, {values["duplicate_queries"]} duplicate"',
+            f'render;dur={values["render_ms"]}',
+        ])
+        logger.info(json.dumps({
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            'view': view,
+            'status': response.status_code,
+            **values,
+        }))
+        return response
+
+    @staticmethod
+    def view_name(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unresolved'
+        return match.view_name or match.route
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serves safe requests to the views in REPLICA_VIEWS from the read replica.
+
+    Only enabled when REPLICA_DATABASE is set. A request that writes, or uses
+    an unsafe method, pins the client to the primary for REPLICA_PIN_SECONDS
+    through a cookie, so the page it redirects to reads its own writes.
+    """
+    pin_cookie = 'primary_pin'
+
+    def __init__(self, get_response):
+        if replica_alias() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with routing_state() as state:
+            response = self.get_response(request)
+
+        if state.wrote or request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            response.set_cookie(
+                self.pin_cookie, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = current_state()
+        if (
+            state is not None
+            and request.method in ('GET', 'HEAD')
+            and self.pin_cookie not in request.COOKIES
+            and request.resolver_match.view_name in settings.REPLICA_VIEWS
+        ):
+            state.use_replica = True
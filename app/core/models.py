@@ -10,6 +10,12 @@ class Customer(models.Model):
     timezone = TimeZoneField(default='UTC')
     # Additional fields can be added as needed
 
+    class Meta:
+        indexes = [
+            # PostgreSQL additionally gets a trigram index, see core.signals.create_search_indexes
+            models.Index(fields=['name'], name='core_customer_name_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
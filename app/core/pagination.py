@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from django.db.models import Q
+
+
+class KeysetPaginator:
+    """
+    Pages through a queryset newest first on (``field``, id), without OFFSET.
+
+    Every page is a range scan that starts right after the last row of the
+    previous page, so deep pages cost the same as the first one. The cursor
+    is the last row's ``field`` value (a datetime) and id, e.g.
+    ``2024-05-01T10:00:00+00:00_42``.
+    """
+
+    def __init__(self, field, per_page=50):
+        self.field = field
+        self.per_page = per_page
+
+    def page(self, queryset, cursor=None):
+        """
+        Returns the rows after ``cursor`` and the cursor of the next page, or None on the last page.
+
+        An unreadable cursor starts from the first page.
+        """
+        queryset = queryset.order_by(f'-{self.field}', '-id')
+        position = self.parse_cursor(cursor)
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(Q(**{f'{self.field}__lt': value}) | Q(**{self.field: value, 'id__lt': pk}))
+
+        # One extra row tells whether another page follows
+        rows = list(queryset[:self.per_page + 1])
+        if len(rows) <= self.per_page:
+            return rows, None
+        rows = rows[:self.per_page]
+        return rows, self.make_cursor(rows[-1])
+
+    def make_cursor(self, obj):
+        return f'{getattr(obj, self.field).isoformat()}_{obj.pk}'
+
+    @staticmethod
+    def parse_cursor(cursor):
+        if not cursor:
+            return None
+        value, _, pk = cursor.rpartition('_')
+        try:
+            return datetime.fromisoformat(value), int(pk)
+        except ValueError:
+            return None
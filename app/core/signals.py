@@ -0,0 +1,38 @@
+import logging
+
+from django.db import DatabaseError, connections, transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .autocomplete import customer_name_index
+from .models import Customer
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Customer, dispatch_uid='customer_name_index_saved')
+@receiver(post_delete, sender=Customer, dispatch_uid='customer_name_index_deleted')
+def invalidate_customer_name_index(**kwargs):
+    customer_name_index.invalidate()
+    transaction.on_commit(customer_name_index.invalidate)
+
+
+def create_search_indexes(sender, using, **kwargs):
+    """
+    Adds a trigram index on Customer.name when running on PostgreSQL so
+    case-insensitive substring searches (icontains/istartswith) can use it.
+    Other databases rely on the plain name index declared on the model.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+
+    try:
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS core_customer_name_trgm_idx '
+                'ON core_customer USING gin ((UPPER(name::text)) gin_trgm_ops)'
+            )
+    except DatabaseError:
+        logger.warning('Could not create the customer name trigram index; is pg_trgm available?', exc_info=True)
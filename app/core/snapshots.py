@@ -0,0 +1,78 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .db_router import routing_state
+
+
+class VersionedSnapshot:
+    """
+    A process-local copy of rarely changing data, rebuilt lazily when its version changes.
+
+    The version number lives in the ``cache_alias`` cache. Only processes that
+    share that cache (e.g. Redis) notice each other's invalidations at once; a
+    process-local cache such as LocMemCache only sees its own. Either way a
+    copy older than SNAPSHOT_MAX_AGE seconds is rebuilt, which bounds how long
+    another process can serve stale data. The snapshot itself never leaves
+    the process.
+    """
+
+    def __init__(self, name, builder, cache_alias='default'):
+        self.name = name
+        self.builder = builder
+        self.cache_alias = cache_alias
+        self._lock = threading.Lock()
+        self._version = None
+        self._value = None
+        self._built_at = None
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @property
+    def cache_key(self):
+        return f'snapshot:{self.name}:version'
+
+    def version(self):
+        """
+        Returns the current version, seeding the cache if the key is missing.
+        """
+        version = self.cache.get(self.cache_key)
+        if version is None:
+            # Seed with a fresh value so an evicted key can never match a stale local copy
+            self.cache.add(self.cache_key, time.time_ns(), timeout=None)
+            version = self.cache.get(self.cache_key)
+        return version
+
+    def is_stale(self, version):
+        if self._version != version:
+            return True
+        max_age = settings.SNAPSHOT_MAX_AGE
+        return max_age is not None and time.monotonic() - self._built_at >= max_age
+
+    def get(self):
+        """
+        Returns the snapshot, rebuilding it first if it is missing, out of date or too old.
+        """
+        version = self.version()
+        if self.is_stale(version):
+            with self._lock:
+                if self.is_stale(version):
+                    # Build from the primary; a lagging replica would be cached until the next invalidation
+                    with routing_state():
+                        self._value = self.builder()
+                    self._version = version
+                    self._built_at = time.monotonic()
+        return self._value
+
+    def invalidate(self):
+        """
+        Bumps the version so every process rebuilds the snapshot on its next read.
+        """
+        try:
+            self.cache.incr(self.cache_key)
+        except ValueError:
+            self.cache.set(self.cache_key, time.time_ns(), timeout=None)
@@ -1,7 +1,21 @@
-from django.test import TestCase
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
 from django.db.utils import IntegrityError
 from timezone_field import TimeZoneField
 from .models import Customer, ProductLine, ProductGeneration, ComponentType, Component, AddOnProduct, Platform
+from .autocomplete import CustomerNameIndex, customer_name_index
+from .db_router import PrimaryReplicaRouter, replica_alias, routing_state
+from .middleware import ReplicaRoutingMiddleware, RequestMetrics, RequestStats, request_stats
+from .snapshots import VersionedSnapshot
 
 class CustomerModelTest(TestCase):
     def test_create_customer(self):
@@ -117,3 +131,282 @@ class PlatformModelTest(TestCase):
                 product_generation=generation,
                 customer=customer
             )
+
+
+class VersionedSnapshotTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.builds = 0
+
+        def builder():
+            self.builds += 1
+            return self.builds
+
+        self.snapshot = VersionedSnapshot('test', builder)
+
+    def test_built_once_until_invalidated(self):
+        self.assertEqual(self.snapshot.get(), 1)
+        self.assertEqual(self.snapshot.get(), 1)
+        self.snapshot.invalidate()
+        self.assertEqual(self.snapshot.get(), 2)
+
+    def test_rebuilt_when_version_evicted(self):
+        self.snapshot.get()
+        cache.delete(self.snapshot.cache_key)
+        self.assertEqual(self.snapshot.get(), 2)
+
+    @override_settings(
+        CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'},
+            'process_a': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'process_a'},
+            'process_b': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'process_b'},
+        },
+        SNAPSHOT_MAX_AGE=60,
+    )
+    def test_other_process_with_local_cache_rebuilds_after_max_age(self):
+        catalog = ['v1']
+        process_a = VersionedSnapshot('shared', lambda: catalog[0], cache_alias='process_a')
+        process_b = VersionedSnapshot('shared', lambda: catalog[0], cache_alias='process_b')
+        with mock.patch('app.core.snapshots.time.monotonic', return_value=1000):
+            self.assertEqual((process_a.get(), process_b.get()), ('v1', 'v1'))
+            catalog[0] = 'v2'
+            process_a.invalidate()
+            # The invalidation never reaches a separate local-memory cache
+            self.assertEqual((process_a.get(), process_b.get()), ('v2', 'v1'))
+        with mock.patch('app.core.snapshots.time.monotonic', return_value=1060):
+            self.assertEqual(process_b.get(), 'v2')
+
+    @override_settings(SNAPSHOT_MAX_AGE=None)
+    def test_shared_cache_invalidates_other_processes(self):
+        catalog = ['v1']
+        process_a = VersionedSnapshot('shared', lambda: catalog[0])
+        process_b = VersionedSnapshot('shared', lambda: catalog[0])
+        self.assertEqual((process_a.get(), process_b.get()), ('v1', 'v1'))
+        catalog[0] = 'v2'
+        process_a.invalidate()
+        self.assertEqual(process_b.get(), 'v2')
+
+
+class CustomerNameIndexTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.index = CustomerNameIndex([
+            'Metro Police', 'Apex County Sheriff', 'Metropolitan Transit', 'County of Metro',
+            'Gazmetro Utilities', 'metro police',
+        ])
+
+    def test_prefix_matches_rank_first(self):
+        self.assertEqual(
+            self.index.search('metro', 10),
+            ['Metro Police', 'metro police', 'Metropolitan Transit', 'County of Metro', 'Gazmetro Utilities'],
+        )
+
+    def test_limit(self):
+        self.assertEqual(self.index.search('metro', 2), ['Metro Police', 'metro police'])
+        self.assertEqual(self.index.search('county', 1), ['County of Metro'])
+
+    def test_blank_term(self):
+        self.assertEqual(self.index.search('  ', 10), [])
+
+    def test_refreshes_when_customers_change(self):
+        Customer.objects.create(name='Harbor Patrol')
+        self.assertEqual(customer_name_index.get().search('har', 10), ['Harbor Patrol'])
+        Customer.objects.filter(name='Harbor Patrol').get().delete()
+        self.assertEqual(customer_name_index.get().search('har', 10), [])
+
+
+class QueryInstrumentationMiddlewareTest(TestCase):
+    def setUp(self):
+        request_stats.clear()
+        self.addCleanup(request_stats.clear)
+        self.staff = get_user_model().objects.create_user('staff', password='secret', is_staff=True)
+        self.url = reverse('core:request_stats')
+
+    def test_disabled_by_default(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url)
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(response.json(), {'views': {}})
+
+    @override_settings(REQUEST_INSTRUMENTATION=True)
+    def test_records_request_metrics(self):
+        self.client.force_login(self.staff)
+        with self.assertLogs('app.core.middleware', level='INFO') as logs:
+            response = self.client.get(self.url)
+        self.assertRegex(response['Server-Timing'], r'total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries')
+        self.assertIn('"view": "core:request_stats"', logs.output[0])
+
+        summary = self.client.get(self.url).json()['views']['core:request_stats']
+        self.assertEqual(summary['count'], 1)
+        self.assertGreater(summary['queries']['p50'], 0)
+
+    @override_settings(REQUEST_INSTRUMENTATION=True)
+    def test_stats_are_staff_only(self):
+        user = get_user_model().objects.create_user('user', password='secret')
+        self.client.force_login(user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_duplicate_queries(self):
+        metrics = RequestMetrics()
+        with connection.execute_wrapper(metrics):
+            for name in ('A', 'A', 'B'):
+                list(Customer.objects.filter(name=name))
+        self.assertEqual(metrics.queries, 3)
+        self.assertEqual(metrics.duplicates(), 1)
+
+    def test_percentiles(self):
+        stats = RequestStats(samples=100)
+        for value in range(1, 101):
+            stats.record('view', {metric: value for metric in RequestStats.METRICS})
+        summary = stats.summary()['view']
+        self.assertEqual(summary['count'], 100)
+        self.assertEqual(summary['total_ms'], {'p50': 50, 'p90': 90, 'p99': 99})
+
+        # Only the most recent samples are kept, so the oldest one drops out
+        stats.record('view', {metric: 1000 for metric in RequestStats.METRICS})
+        summary = stats.summary()['view']
+        self.assertEqual(summary['count'], 100)
+        self.assertEqual(summary['total_ms']['p50'], 51)
+
+
+@override_settings(REPLICA_DATABASE='read_replica')
+class ReplicaRoutingTest(TestCase):
+    """
+    Routing decisions only; no query is sent to the replica alias, which is not in DATABASES.
+    """
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def test_reads_go_to_primary_outside_of_a_routed_block(self):
+        self.assertIsNone(self.router.db_for_read(Customer))
+        with routing_state():
+            self.assertIsNone(self.router.db_for_read(Customer))
+
+    def test_reads_stay_on_primary_after_a_write(self):
+        with routing_state(use_replica=True) as state:
+            self.assertEqual(self.router.db_for_read(Customer), 'read_replica')
+            self.assertEqual(self.router.db_for_write(Customer), 'default')
+            self.assertTrue(state.wrote)
+            self.assertIsNone(self.router.db_for_read(Customer))
+
+    @override_settings(REPLICA_DATABASE=None)
+    def test_no_replica_configured(self):
+        with routing_state(use_replica=True):
+            self.assertIsNone(self.router.db_for_read(Customer))
+        with self.assertRaises(MiddlewareNotUsed):
+            ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+    def test_replica_with_the_primary_database_name_on_another_host(self):
+        def database(host, name='atg'):
+            return SimpleNamespace(settings_dict={'HOST': host, 'PORT': '5432', 'NAME': name})
+
+        databases = {'default': database('primary.internal'), 'read_replica': database('replica.internal')}
+        with mock.patch('app.core.db_router.connections', databases):
+            self.assertEqual(replica_alias(), 'read_replica')
+            # A test mirror points at the primary's own database
+            databases['read_replica'] = database('primary.internal')
+            self.assertIsNone(replica_alias())
+
+    def test_relations_across_primary_and_replica_are_allowed(self):
+        primary = Customer(name='Primary')
+        replica = Customer(name='Replica')
+        replica._state.db = 'read_replica'
+        self.assertTrue(self.router.allow_relation(primary, replica))
+        self.assertFalse(self.router.allow_migrate('read_replica', 'core'))
+        self.assertIsNone(self.router.allow_migrate('default', 'core'))
+
+    def route(self, method, path, cookies=None, write=False):
+        """
+        Runs a request through the middleware and returns (read alias, response).
+        """
+        request = self.factory.generic(method, path)
+        request.COOKIES.update(cookies or {})
+        request.resolver_match = resolve(path)
+        reads = []
+
+        def view(request):
+            middleware.process_view(request, None, (), {})
+            reads.append(self.router.db_for_read(Customer))
+            if write:
+                self.router.db_for_write(Customer)
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(view)
+        response = middleware(request)
+        return reads[0], response
+
+    def test_listed_views_read_from_replica(self):
+        path = reverse('dept_qa:customer_autocomplete')
+        alias, response = self.route('GET', path)
+        self.assertEqual(alias, 'read_replica')
+        self.assertNotIn(ReplicaRoutingMiddleware.pin_cookie, response.cookies)
+
+    def test_other_views_read_from_primary(self):
+        alias, _ = self.route('GET', reverse('dept_qa:generate_checklist'))
+        self.assertIsNone(alias)
+
+    def test_writes_pin_the_client_to_primary(self):
+        path = reverse('dept_qa:checklist_detail', kwargs={'iris_number': '100'})
+        alias, response = self.route('POST', path)
+        self.assertIsNone(alias)
+        self.assertIn(ReplicaRoutingMiddleware.pin_cookie, response.cookies)
+
+        _, response = self.route('GET', path, write=True)
+        self.assertIn(ReplicaRoutingMiddleware.pin_cookie, response.cookies)
+
+        # The redirected GET reads its own write from the primary
+        alias, _ = self.route('GET', path, cookies={ReplicaRoutingMiddleware.pin_cookie: '1'})
+        self.assertIsNone(alias)
+
+    def test_snapshots_are_built_from_primary(self):
+        aliases = []
+        snapshot = VersionedSnapshot('replica-test', lambda: aliases.append(self.router.db_for_read(Customer)))
+        snapshot.invalidate()
+        with routing_state(use_replica=True):
+            snapshot.get()
+        self.assertEqual(aliases, [None])
+
+
+class PlatformAdminTest(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'secret')
+        self.client.force_login(self.admin)
+        self.product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generations = [
+            ProductGeneration.objects.create(product_line=self.product_line, generation_number=str(number))
+            for number in range(3)
+        ]
+        self.customer = Customer.objects.create(name='Test Agency')
+
+    def add_platforms(self, start, count):
+        for i in range(start, start + count):
+            platform = Platform.objects.create(
+                iris_number=f'{i}', product_generation=self.generations[i % 3], customer=self.customer
+            )
+            platform.components.add(Component.objects.create(name=f'Component {i}'))
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response
+
+    def test_changelist_query_count_is_independent_of_rows(self):
+        url = reverse('admin:core_platform_changelist')
+        self.add_platforms(0, 2)
+        small_count, _ = self.count_queries(url)
+        self.add_platforms(2, 20)
+        large_count, response = self.count_queries(url)
+        self.assertEqual(small_count, large_count)
+        self.assertContains(response, 'Vehicle Surveillance System - Gen 2')
+
+    def test_change_form_does_not_list_every_component(self):
+        self.add_platforms(0, 30)
+        platform = Platform.objects.get(iris_number='0')
+        _, response = self.count_queries(reverse('admin:core_platform_change', args=[platform.pk]))
+        # Only the selected component is rendered; the rest are searched through the autocomplete
+        self.assertContains(response, 'Component 0')
+        self.assertNotContains(response, 'Component 29')
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'app.core'
+
+urlpatterns = [
+    path('request-stats/', views.RequestStatsView.as_view(), name='request_stats'),
+]
@@ -1,3 +1,16 @@
-from django.shortcuts import render
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
 
-# Create your views here.
+from .middleware import request_stats
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class RequestStatsView(View):
+    """
+    Returns per-view request percentiles collected by QueryInstrumentationMiddleware in this process.
+    """
+
+    def get(self, request):
+        return JsonResponse({'views': request_stats.summary()})
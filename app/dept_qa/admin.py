@@ -1,7 +1,174 @@
+from collections import defaultdict
+
 from django.contrib import admin
-from .models import Task, Checklist, ChecklistTask, IssueResolution
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from app.core.admin import ProductGenerationListFilter
+from .archive import archivable_checklists, archive_batch
+from .models import ArchivedChecklist, Task, Checklist, ChecklistTask, CustomerIssueSummary, IssueResolution
+from .services import apply_task_updates
+
+
+class PlatformGenerationListFilter(ProductGenerationListFilter):
+    generation_lookup = 'platform__product_generation'
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'key', 'parent_task', 'order', 'depth']
+    list_select_related = ['parent_task']
+    search_fields = ['name', 'key']
+    ordering = ['path']
+    autocomplete_fields = ['parent_task', 'components', 'product_generations']
+
+
+@admin.register(Checklist)
+class ChecklistAdmin(admin.ModelAdmin):
+    list_display = [
+        'iris_number', 'customer', 'product_generation', 'created_on', 'completed_on',
+        'total_tasks', 'complete_tasks', 'failed_tasks',
+    ]
+    list_select_related = ['platform__customer', 'platform__product_generation__product_line']
+    list_filter = [('completed_on', admin.EmptyFieldListFilter), 'created_on', PlatformGenerationListFilter]
+    search_fields = ['platform__iris_number', 'platform__customer__name']
+    ordering = ['-created_on', '-id']
+    raw_id_fields = ['platform']
+    # The counters are maintained by ChecklistTask writes
+    readonly_fields = Checklist.PROGRESS_FIELDS + ['completed_on', 'version']
+    # Counting every checklist on each page view gets slow on a large table
+    show_full_result_count = False
+    actions = ['recompute_progress', 'archive_selected']
+
+    @admin.display(description='IRIS Number', ordering='platform__iris_number')
+    def iris_number(self, checklist):
+        return checklist.platform.iris_number
+
+    @admin.display(ordering='platform__customer__name')
+    def customer(self, checklist):
+        return checklist.platform.customer
+
+    @admin.display(description='Platform')
+    def product_generation(self, checklist):
+        return checklist.platform.product_generation
+
+    @admin.action(description='Recompute progress counters of the selected checklists')
+    def recompute_progress(self, request, queryset):
+        with transaction.atomic():
+            updated = queryset.refresh_progress()
+            fields = ['id', 'platform_id', 'created_on', 'completed_on', *Checklist.PROGRESS_FIELDS]
+            for checklist in queryset.only(*fields):
+                checklist.sync_completed_on()
+        self.message_user(request, f'Recomputed progress counters for {updated} checklist(s).')
+
+    @admin.action(description='Archive the selected completed checklists')
+    def archive_selected(self, request, queryset):
+        with transaction.atomic():
+            ids = list(archivable_checklists(timezone.now()).filter(
+                pk__in=queryset.values('pk')
+            ).select_for_update().values_list('pk', flat=True))
+            if ids:
+                archive_batch(ids)
+        self.message_user(
+            request, f'Archived {len(ids)} checklist(s); incomplete checklists and ones with open issues were skipped.'
+        )
+
+
+@admin.register(ChecklistTask)
+class ChecklistTaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'iris_number', 'group', 'status', 'notes']
+    list_select_related = ['checklist__platform']
+    list_filter = ['status']
+    search_fields = ['name', 'checklist__platform__iris_number']
+    ordering = ['checklist', 'path']
+    raw_id_fields = ['checklist', 'task', 'parent', 'component']
+    readonly_fields = ['name', 'order', 'path', 'group']
+    show_full_result_count = False
+    actions = ['mark_complete', 'mark_failed', 'mark_incomplete']
+
+    @admin.display(description='IRIS Number', ordering='checklist__platform__iris_number')
+    def iris_number(self, checklist_task):
+        return checklist_task.checklist.platform.iris_number
+
+    @admin.action(description='Mark the selected tasks Complete')
+    def mark_complete(self, request, queryset):
+        self.set_status(request, queryset, 'Complete')
+
+    @admin.action(description='Mark the selected tasks Failed')
+    def mark_failed(self, request, queryset):
+        self.set_status(request, queryset, 'Failed')
+
+    @admin.action(description='Mark the selected tasks Incomplete')
+    def mark_incomplete(self, request, queryset):
+        self.set_status(request, queryset, 'Incomplete')
+
+    def set_status(self, request, queryset, status):
+        """
+        Writes the status one checklist at a time, so completed_on and the analytics stay in step.
+        """
+        task_ids = defaultdict(list)
+        for checklist_id, task_id in queryset.values_list('checklist_id', 'id'):
+            task_ids[checklist_id].append(task_id)
+
+        changed = 0
+        with transaction.atomic():
+            for checklist in Checklist.objects.filter(pk__in=list(task_ids)).only(
+                'id', 'platform_id', 'created_on', 'completed_on'
+            ):
+                updates = {task_id: {'status': status} for task_id in task_ids[checklist.pk]}
+                changed += len(apply_task_updates(checklist, updates))
+        self.message_user(request, f'Marked {changed} task(s) {status}.')
+
+
+@admin.register(IssueResolution)
+class IssueResolutionAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'issue_description', 'reported_on', 'resolved_on']
+    list_select_related = ['checklist__platform']
+    list_filter = [('resolved_on', admin.EmptyFieldListFilter), 'reported_on']
+    search_fields = ['issue_description', 'checklist__platform__iris_number']
+    ordering = ['-reported_on']
+    raw_id_fields = ['checklist']
+    show_full_result_count = False
+    actions = ['mark_resolved']
+
+    @admin.action(description='Mark the selected issues resolved')
+    def mark_resolved(self, request, queryset):
+        with transaction.atomic():
+            open_issues = queryset.filter(resolved_on__isnull=True)
+            # A queryset update skips IssueResolution.save, so move the open issue counts here
+            per_customer = open_issues.order_by().values('checklist__platform__customer_id').annotate(
+                count=Count('pk')
+            )
+            for row in per_customer:
+                CustomerIssueSummary.record(row['checklist__platform__customer_id'], -row['count'])
+            resolved = open_issues.update(resolved_on=timezone.now())
+        self.message_user(request, f'Resolved {resolved} issue(s).')
+
+
+@admin.register(ArchivedChecklist)
+class ArchivedChecklistAdmin(admin.ModelAdmin):
+    list_display = [
+        'checklist_id', 'iris_number', 'created_on', 'completed_on', 'archived_on',
+        'total_tasks', 'complete_tasks', 'failed_tasks',
+    ]
+    list_select_related = ['platform']
+    list_filter = ['archived_on', 'completed_on']
+    search_fields = ['platform__iris_number']
+    ordering = ['-archived_on', '-id']
+    # The compressed document is exported from the archived checklist page instead
+    exclude = ['data']
+    show_full_result_count = False
+
+    @admin.display(description='IRIS Number', ordering='platform__iris_number')
+    def iris_number(self, archive):
+        return archive.platform.iris_number
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('data')
+
+    def has_add_permission(self, request):
+        return False
 
-admin.site.register(Task)
-admin.site.register(Checklist)
-admin.site.register(ChecklistTask)
-admin.site.register(IssueResolution)
+    def has_change_permission(self, request, obj=None):
+        return False
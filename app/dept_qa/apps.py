@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DeptQaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.dept_qa'
+
+    def ready(self):
+        from . import signals  # noqa: F401
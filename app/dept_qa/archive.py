@@ -0,0 +1,112 @@
+"""
+Moves completed checklists out of the hot tables into ArchivedChecklist rows.
+"""
+import json
+import zlib
+from collections import defaultdict
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import Exists, OuterRef
+
+from .models import ArchivedChecklist, Checklist, ChecklistTask, IssueResolution
+
+ARCHIVE_FORMAT = 1
+
+
+def archivable_checklists(completed_before):
+    """
+    Returns the checklists completed before ``completed_before`` that can be archived.
+
+    Checklists with open issues stay live, since an archived issue can no longer be resolved.
+    """
+    return Checklist.objects.filter(completed_on__lt=completed_before).filter(
+        ~Exists(IssueResolution.objects.filter(checklist=OuterRef('pk'), resolved_on__isnull=True))
+    )
+
+
+def archive_checklists(completed_before, batch_size=100, progress=None):
+    """
+    Archives every archivable checklist, one transaction per batch, and returns how many were archived.
+    """
+    archived = 0
+    while True:
+        with transaction.atomic():
+            # Lock the batch so a checklist reopened meanwhile is not archived
+            ids = list(
+                archivable_checklists(completed_before).select_for_update().order_by('pk').values_list(
+                    'pk', flat=True
+                )[:batch_size]
+            )
+            if not ids:
+                return archived
+            archive_batch(ids)
+        archived += len(ids)
+        if progress:
+            progress(archived)
+
+
+def archive_batch(checklist_ids):
+    """
+    Writes an ArchivedChecklist for each checklist and deletes the checklists with their tasks and issues.
+
+    The archived checklists keep counting towards the analytics summaries, so
+    the tasks and issues are deleted through plain QuerySets instead of the
+    tracked ChecklistTask queryset, and the Checklist pre_delete handler
+    leaves checklists that have an archive on the summaries.
+    """
+    checklists = Checklist.objects.filter(pk__in=checklist_ids).select_related(
+        'platform__customer', 'platform__product_generation__product_line'
+    )
+    tasks = defaultdict(list)
+    for checklist_id, *row in ChecklistTask.objects.filter(checklist_id__in=checklist_ids).order_by(
+        'checklist_id', 'path'
+    ).values_list('checklist_id', *ArchivedChecklist.TASK_FIELDS).iterator(chunk_size=2000):
+        tasks[checklist_id].append(row)
+    issues = defaultdict(list)
+    for checklist_id, *row in IssueResolution.objects.filter(checklist_id__in=checklist_ids).order_by(
+        'reported_on', 'pk'
+    ).values_list('checklist_id', *ArchivedChecklist.ISSUE_FIELDS):
+        issues[checklist_id].append(row)
+
+    ArchivedChecklist.objects.bulk_create([
+        build_archive(checklist, tasks[checklist.pk], issues[checklist.pk]) for checklist in checklists
+    ], batch_size=100)
+
+    # Children first, so deleting the checklists has nothing left to cascade to
+    for model in (ChecklistTask, IssueResolution):
+        models.QuerySet(model).filter(checklist_id__in=checklist_ids).delete()
+    Checklist.objects.filter(pk__in=checklist_ids).delete()
+
+
+def build_archive(checklist, task_rows, issue_rows):
+    """
+    Returns an unsaved ArchivedChecklist holding the compressed document of one checklist.
+    """
+    platform = checklist.platform
+    document = {
+        'format': ARCHIVE_FORMAT,
+        'checklist': {
+            'id': checklist.pk,
+            'iris_number': platform.iris_number,
+            'customer': platform.customer.name,
+            'product_line': platform.product_generation.product_line.name,
+            'product_generation': str(platform.product_generation),
+            'customer_presets': platform.customer_presets,
+            'created_on': checklist.created_on,
+            'completed_on': checklist.completed_on,
+        },
+        'tasks': task_rows,
+        'issues': issue_rows,
+    }
+    data = json.dumps(document, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+    return ArchivedChecklist(
+        checklist_id=checklist.pk,
+        platform=platform,
+        created_on=checklist.created_on,
+        completed_on=checklist.completed_on,
+        total_tasks=checklist.total_tasks,
+        complete_tasks=checklist.complete_tasks,
+        failed_tasks=checklist.failed_tasks,
+        data=zlib.compress(data, 9),
+    )
@@ -0,0 +1,143 @@
+import json
+from collections import Counter, namedtuple
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+
+from app.core.models import Component, Platform, ProductGeneration
+from .catalog_import import CatalogImporter, split_list
+from .models import Checklist
+from .services import generate_checklist, resolve_task_ids
+
+# Separates the preset from the channel in a CSV presets cell, e.g. "Dispatch:4|Tac 1:7"
+PRESET_SEPARATOR = ':'
+
+RowError = namedtuple('RowError', ['row', 'iris_number', 'message'])
+
+
+def parse_presets(value):
+    """
+    Returns customer presets as a list of {'preset', 'channel'} dicts.
+
+    Accepts a JSON array (as a list or a string) or LIST_SEPARATOR-separated
+    "preset:channel" pairs.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('['):
+            value = json.loads(value)
+        else:
+            pairs = [pair.rpartition(PRESET_SEPARATOR) for pair in split_list(value)]
+            value = [{'preset': preset, 'channel': channel} for preset, _, channel in pairs]
+    presets = []
+    for item in value:
+        preset = str(item.get('preset') or '').strip()
+        channel = str(item.get('channel') or '').strip()
+        if not preset or not channel:
+            raise ValueError(f'preset {item!r} needs both a preset and a channel')
+        presets.append({'preset': preset, 'channel': channel})
+    return presets
+
+
+class ChecklistBatchGenerator:
+    """
+    Generates a Platform and Checklist for every row of a build manifest.
+
+    Each record has an ``iris_number``, ``customer``, ``product_generation``
+    (displayed form, e.g. "Vehicle - Gen 2"), ``components`` (names) and
+    optional ``customer_presets``. Rows run in chunks of one transaction each,
+    with a savepoint per row, so a bad row is reported in ``errors`` and
+    skipped without aborting the rest. Rows with the same product generation
+    and components share one resolved task set.
+    """
+
+    def __init__(self, chunk_size=25, progress=None):
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.stats = Counter()
+        self.errors = []
+        self.task_sets = {}
+
+    def run(self, records):
+        records = iter(records)
+        self.load_lookups()
+        rows = 0
+        while chunk := list(islice(records, self.chunk_size)):
+            self.generate_chunk(chunk, first_row=rows + 1)
+            rows += len(chunk)
+            if self.progress:
+                self.progress(rows)
+        self.stats['rows'] = rows
+        self.stats['rows_failed'] = len(self.errors)
+        return self.stats
+
+    def load_lookups(self):
+        self.generations = {
+            (generation.product_line.name, generation.generation_number): generation
+            for generation in ProductGeneration.objects.select_related('product_line')
+        }
+        self.components = dict(Component.objects.values_list('name', 'id'))
+
+    def generate_chunk(self, chunk, first_row):
+        iris_numbers = [str(record.get('iris_number') or '').strip() for record in chunk]
+        # Look up every existing platform of the chunk in one query, as PlatformSelectionForm does per platform
+        self.platforms = {
+            platform['iris_number']: platform
+            for platform in Platform.objects.filter(iris_number__in=iris_numbers).annotate(
+                has_checklist=Exists(Checklist.objects.filter(platform=OuterRef('pk')))
+            ).values('iris_number', 'product_generation_id', 'customer__name', 'has_checklist')
+        }
+        with transaction.atomic():
+            for row_number, (iris_number, record) in enumerate(zip(iris_numbers, chunk), start=first_row):
+                try:
+                    with transaction.atomic():
+                        self.generate_row(iris_number, record)
+                except (AttributeError, TypeError, ValueError, IntegrityError) as error:
+                    self.errors.append(RowError(row_number, iris_number, str(error)))
+
+    def generate_row(self, iris_number, record):
+        if not iris_number:
+            raise ValueError('iris_number is required')
+        customer_name = CatalogImporter.required(record, 'customer')
+        reference = CatalogImporter.parse_generation(CatalogImporter.required(record, 'product_generation'))
+        generation = self.generations.get(reference)
+        if generation is None:
+            raise ValueError(f'unknown product generation {" - Gen ".join(reference)!r}')
+
+        component_names = split_list(record.get('components'))
+        unknown = sorted(name for name in component_names if name not in self.components)
+        if unknown:
+            raise ValueError(f'unknown components: {", ".join(unknown)}')
+        component_ids = sorted({self.components[name] for name in component_names})
+        customer_presets = parse_presets(record.get('customer_presets'))
+
+        platform = self.platforms.get(iris_number)
+        if platform is not None:
+            if platform['product_generation_id'] != generation.pk or platform['customer__name'] != customer_name:
+                raise ValueError(
+                    'A platform with this IRIS Number already exists with different product generation or customer.'
+                )
+            if platform['has_checklist']:
+                raise ValueError('A checklist already exists for this platform.')
+
+        key = (generation.pk, tuple(component_ids))
+        if key not in self.task_sets:
+            self.task_sets[key] = resolve_task_ids(generation, component_ids)
+            self.stats['task_sets_resolved'] += 1
+
+        generate_checklist(
+            iris_number=iris_number,
+            product_generation=generation,
+            customer_name=customer_name,
+            component_ids=component_ids,
+            customer_presets=customer_presets,
+            task_ids=self.task_sets[key],
+        )
+        # A repeated IRIS number later in the manifest must not get a second checklist
+        self.platforms[iris_number] = {
+            'product_generation_id': generation.pk, 'customer__name': customer_name, 'has_checklist': True,
+        }
+        self.stats['checklists_created'] += 1
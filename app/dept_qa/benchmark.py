@@ -0,0 +1,275 @@
+"""
+Synthetic data and timing scenarios for the dept_qa hot paths.
+
+Used by the benchmark_dept_qa command, which runs everything inside a
+throwaway test database so the configured database is never touched.
+"""
+import itertools
+import json
+import random
+import statistics
+import time
+
+from django.db import connection, reset_queries
+from django.db.models import Count, F
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.core.models import Component, ComponentType, Customer, ProductGeneration, ProductLine
+from .models import Checklist, ChecklistTask, Task
+from .services import apply_task_updates, generate_checklist
+
+DEFAULT_SCALE = {
+    'components': 2000,
+    'component_types': 40,
+    'tasks': 3000,
+    'subtasks': 2,
+    'customers': 1000,
+    'checklists': 200,
+    'components_per_platform': 12,
+}
+
+CUSTOMER_PLACES = ['Springfield', 'Riverside', 'Franklin', 'Greenville', 'Madison', 'Clinton', 'Salem', 'Fairview']
+CUSTOMER_KINDS = ['Police Department', 'Sheriff Office', 'Fire Rescue', 'Transit Authority', 'County', 'Public Works']
+
+
+def populate(scale, seed=0, progress=None):
+    """
+    Fills the database with a synthetic catalog, customers and checklists of the given scale.
+    """
+    rng = random.Random(seed)
+    progress = progress or (lambda message: None)
+
+    lines = ProductLine.objects.bulk_create([
+        ProductLine(name=name) for name in ('Vehicle Surveillance System', 'Toolbox', 'Mesh Radio')
+    ])
+    ProductGeneration.objects.bulk_create([
+        ProductGeneration(product_line=line, generation_number=str(number)) for line in lines for number in (1, 2)
+    ])
+    generations = list(ProductGeneration.objects.all())
+
+    ComponentType.objects.bulk_create([
+        ComponentType(name=f'Component Type {i:03d}') for i in range(scale['component_types'])
+    ])
+    type_ids = list(ComponentType.objects.values_list('id', flat=True))
+    Component.objects.bulk_create([
+        Component(name=f'Component {i:05d}', requires_customer_preset=i % 25 == 0)
+        for i in range(scale['components'])
+    ], batch_size=1000)
+    component_ids = list(Component.objects.values_list('id', flat=True))
+    Component.component_types.through.objects.bulk_create([
+        Component.component_types.through(component_id=component_id, componenttype_id=type_id)
+        for component_id in component_ids
+        for type_id in rng.sample(type_ids, rng.randint(1, 2))
+    ], batch_size=1000)
+    progress(f'{len(component_ids)} components')
+
+    # Root tasks, each with a few subtasks and one grandchild
+    roots = Task.objects.bulk_create([
+        Task(name=f'Check {i:05d}', order=i % 50) for i in range(scale['tasks'])
+    ], batch_size=1000)
+    children = Task.objects.bulk_create([
+        Task(name=f'{root.name} step {n}', order=n, parent_task_id=root.id)
+        for root in roots for n in range(scale['subtasks'])
+    ], batch_size=1000)
+    grandchildren = Task.objects.bulk_create([
+        Task(name=f'{child.name} detail', order=0, parent_task_id=child.id)
+        for child in children[::max(scale['subtasks'], 1)]
+    ], batch_size=1000)
+    Task.objects.rebuild_paths()
+
+    # Every tenth root applies to a product generation instead of a component
+    by_parent = {}
+    for task in children + grandchildren:
+        by_parent.setdefault(task.parent_task_id, []).append(task)
+    component_links, generation_links = [], []
+    for i, root in enumerate(roots):
+        family = [root]
+        for child in by_parent.get(root.id, []):
+            family.append(child)
+            family.extend(by_parent.get(child.id, []))
+        if i % 10 == 0:
+            generation = generations[i % len(generations)]
+            generation_links.extend(
+                Task.product_generations.through(task_id=task.id, productgeneration_id=generation.id)
+                for task in family
+            )
+        else:
+            component_id = component_ids[i % len(component_ids)]
+            component_links.extend(
+                Task.components.through(task_id=task.id, component_id=component_id) for task in family
+            )
+    Task.components.through.objects.bulk_create(component_links, batch_size=1000)
+    Task.product_generations.through.objects.bulk_create(generation_links, batch_size=1000)
+    progress(f'{len(roots) + len(children) + len(grandchildren)} tasks')
+
+    Customer.objects.bulk_create([
+        Customer(name=f'{rng.choice(CUSTOMER_PLACES)} {rng.choice(CUSTOMER_KINDS)} {i:04d}')
+        for i in range(scale['customers'])
+    ], batch_size=1000)
+    customer_names = list(Customer.objects.values_list('name', flat=True))
+    progress(f'{len(customer_names)} customers')
+
+    # Generate real checklists and complete about half of them
+    for i in range(scale['checklists']):
+        checklist = generate_checklist(
+            iris_number=f'BENCH{i:05d}',
+            product_generation=rng.choice(generations),
+            customer_name=rng.choice(customer_names),
+            component_ids=rng.sample(component_ids, min(scale['components_per_platform'], len(component_ids))),
+        )
+        if i % 2 == 0:
+            task_ids = ChecklistTask.objects.filter(checklist=checklist).values_list('id', flat=True)
+            apply_task_updates(checklist, {
+                task_id: {'status': 'Failed' if rng.random() < 0.05 else 'Complete'} for task_id in task_ids
+            })
+    progress(f'{scale["checklists"]} checklists')
+
+
+def scenarios(scale):
+    """
+    Returns (name, setup, request) triples; only ``request`` is timed.
+    """
+    checklist = Checklist.objects.select_related('platform').order_by('-total_tasks', 'id').first()
+    detail_url = reverse('dept_qa:checklist_detail', kwargs={'iris_number': checklist.platform.iris_number})
+    section_url = reverse('dept_qa:checklist_section', kwargs={'iris_number': checklist.platform.iris_number})
+    task_ids = list(ChecklistTask.objects.filter(checklist=checklist).values_list('id', flat=True))
+    # The largest section of the largest checklist
+    group = ChecklistTask.objects.filter(checklist=checklist).values('group').annotate(
+        task_count=Count('id'),
+    ).order_by('-task_count', 'group').values_list('group', flat=True).first()
+    component_ids = list(Component.objects.values_list('id', flat=True)[:scale['components_per_platform']])
+    generation_id = ProductGeneration.objects.values_list('id', flat=True).first()
+    generated = iter(range(1_000_000))
+    statuses = itertools.cycle(['Failed', 'Complete', 'Incomplete'])
+
+    def bump_version():
+        # Any task write bumps the version, so the next GET misses the fragment cache
+        Checklist.objects.filter(pk=checklist.pk).update(version=F('version') + 1)
+
+    def generate_post(client):
+        return client.post(reverse('dept_qa:generate_checklist'), {
+            'iris_number': f'RUN{next(generated):06d}',
+            'product_generation': generation_id,
+            'customer': 'Benchmark Agency',
+            'components': component_ids,
+            'form-TOTAL_FORMS': '0',
+            'form-INITIAL_FORMS': '0',
+        })
+
+    def detail_post(client):
+        # Cycle one task through every status so each timed POST writes
+        task_id = task_ids[0]
+        return client.post(detail_url, {f'status_{task_id}': next(statuses), f'notes_{task_id}': ''})
+
+    return [
+        ('generate_checklist GET', None, lambda client: client.get(reverse('dept_qa:generate_checklist'))),
+        ('generate_checklist POST', None, generate_post),
+        ('checklist_detail GET (cold)', bump_version, lambda client: client.get(detail_url)),
+        ('checklist_detail GET (cached)', None, lambda client: client.get(detail_url)),
+        ('checklist_section GET (cold)', bump_version, lambda client: client.get(section_url, {'group': group})),
+        ('checklist_section GET (cached)', None, lambda client: client.get(section_url, {'group': group})),
+        ('checklist_detail POST', None, detail_post),
+        (
+            'customer_autocomplete GET', None,
+            lambda client: client.get(reverse('dept_qa:customer_autocomplete'), {'term': 'spring'}),
+        ),
+    ]
+
+
+def run(scale, repeat=5):
+    """
+    Runs every scenario ``repeat`` times after one warm-up and returns its timings and query counts.
+    """
+    client = Client()
+    results = {}
+    for name, setup, request in scenarios(scale):
+        timings = []
+        queries = []
+        for attempt in range(repeat + 1):
+            if setup:
+                setup()
+            # A full query log (DEBUG keeps the last 9000) would hide new queries from the count
+            reset_queries()
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = request(client)
+                elapsed = time.perf_counter() - started
+            if response.status_code >= 400:
+                raise RuntimeError(f'{name} returned HTTP {response.status_code}.')
+            # The first pass warms process-local snapshots and is not counted
+            if attempt:
+                timings.append(elapsed * 1000)
+                queries.append(len(context.captured_queries))
+        results[name] = {
+            'median_ms': round(statistics.median(timings), 2),
+            'min_ms': round(min(timings), 2),
+            'queries': max(queries),
+        }
+    return results
+
+
+def compare(results, baseline):
+    """
+    Returns a message for every scenario that ran more queries than its baseline.
+
+    Query counts do not depend on the machine, so they are what the benchmark gates on.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is not None and result['queries'] > expected['queries']:
+            regressions.append(f'{name}: {result["queries"]} queries, baseline {expected["queries"]}')
+    return regressions
+
+
+def compare_timings(results, baseline, tolerance):
+    """
+    Returns a message for every scenario that slowed down relative to the others.
+
+    Baseline timings come from whatever machine saved them, so each scenario's
+    slowdown is measured against the median slowdown of all scenarios, which
+    stands in for the difference in machine speed. A scenario is flagged when
+    its own slowdown exceeds that by more than ``tolerance``.
+    """
+    ratios = {
+        name: result['median_ms'] / baseline[name]['median_ms']
+        for name, result in results.items()
+        if name in baseline and baseline[name]['median_ms'] > 0
+    }
+    if not ratios:
+        return []
+    machine_ratio = statistics.median(ratios.values())
+    return [
+        f'{name}: {results[name]["median_ms"]} ms median, baseline {baseline[name]["median_ms"]} ms '
+        f'({ratio / machine_ratio:.1f}x the overall {machine_ratio:.1f}x)'
+        for name, ratio in ratios.items()
+        if ratio > machine_ratio * (1 + tolerance)
+    ]
+
+
+def load_baseline(path, vendor, scale):
+    """
+    Returns the saved results for this database vendor and scale, or None.
+    """
+    try:
+        with open(path, encoding='utf-8') as fileobj:
+            entry = json.load(fileobj).get(vendor)
+    except FileNotFoundError:
+        return None
+    if not entry or entry['scale'] != scale:
+        return None
+    return entry['results']
+
+
+def save_baseline(path, vendor, scale, results):
+    try:
+        with open(path, encoding='utf-8') as fileobj:
+            baselines = json.load(fileobj)
+    except FileNotFoundError:
+        baselines = {}
+    baselines[vendor] = {'scale': scale, 'results': results}
+    with open(path, 'w', encoding='utf-8') as fileobj:
+        json.dump(baselines, fileobj, indent=2, sort_keys=True)
+        fileobj.write('\n')
@@ -0,0 +1,43 @@
+from django.db.models import Exists, OuterRef
+
+from app.core.models import Component, ComponentType
+from app.core.snapshots import VersionedSnapshot
+
+
+class ComponentCatalog:
+    """
+    Snapshot of the component catalog shown on the generate checklist form.
+    """
+
+    def __init__(self, groups, choices):
+        # ComponentType -> its components sorted by name, types sorted by name
+        self.groups = groups
+        # (id, name) of the components that can be selected directly on the form
+        self.choices = choices
+
+    @classmethod
+    def build(cls):
+        has_add_ons = Exists(Component.add_on_products.through.objects.filter(component_id=OuterRef('pk')))
+        rows = Component.objects.annotate(has_add_ons=has_add_ons).values_list(
+            'id', 'name', 'has_add_ons', 'component_types__id', 'component_types__name'
+        ).order_by('component_types__name', 'component_types__id', 'name', 'id')
+
+        groups = {}
+        component_types = {}
+        components = {}
+        choices = {}
+        for component_id, name, component_has_add_ons, type_id, type_name in rows:
+            component = components.setdefault(component_id, Component(id=component_id, name=name))
+            if not component_has_add_ons:
+                choices[component_id] = name
+            if type_id is not None:
+                component_type = component_types.setdefault(type_id, ComponentType(id=type_id, name=type_name))
+                groups.setdefault(component_type, []).append(component)
+
+        return cls(
+            groups=groups,
+            choices=sorted(choices.items(), key=lambda choice: (choice[1], choice[0])),
+        )
+
+
+component_catalog = VersionedSnapshot('dept_qa.component_catalog', ComponentCatalog.build)
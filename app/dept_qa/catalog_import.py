@@ -0,0 +1,333 @@
+import csv
+import json
+from collections import Counter
+from itertools import islice
+
+from django.db import transaction
+
+from app.core.models import Component, ComponentType, ProductGeneration, ProductLine
+from .models import Task
+from .signals import invalidate_component_catalog, invalidate_task_index
+
+# Separates multiple values inside one CSV cell, e.g. "Camera|Radio"
+LIST_SEPARATOR = '|'
+# Product generations are referenced the way they are displayed, e.g. "Vehicle - Gen 2"
+GENERATION_SEPARATOR = ' - Gen '
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+FALSE_VALUES = {'0', 'false', 'no', 'n'}
+
+
+def read_records(fileobj, format):
+    """
+    Yields catalog records one at a time from a CSV or JSON Lines file.
+    """
+    if format == 'csv':
+        yield from csv.DictReader(fileobj)
+        return
+
+    for line_number, line in enumerate(fileobj, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f'Line {line_number}: {error}')
+
+
+def split_list(value):
+    """
+    Returns the non-empty names in a list cell, which is a JSON array or a LIST_SEPARATOR string.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(LIST_SEPARATOR)
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+class CatalogImporter:
+    """
+    Upserts Components, Tasks and their links from a stream of catalog records.
+
+    Every record has a ``type``:
+
+    * ``component``: ``name``, ``component_types`` and ``requires_customer_preset``.
+    * ``task``: ``key``, ``name``, ``order``, ``parent`` (the parent's key),
+      ``components`` and ``product_generations``.
+
+    Records are processed in batches. Names are resolved to ids through lookup
+    maps loaded once up front, missing Component Types, Components, Product
+    Lines and Product Generations are created as they are referenced, Tasks are
+    upserted on their key and the links of each imported row are synced to the
+    file. Parents are linked and paths rebuilt after the last batch, so records
+    may come in any order. Importing the same file twice changes nothing.
+    """
+
+    def __init__(self, batch_size=1000, progress=None):
+        self.batch_size = batch_size
+        self.progress = progress
+        self.stats = Counter()
+
+    def run(self, records):
+        records = iter(records)
+        with transaction.atomic():
+            self.load_lookups()
+            rows = 0
+            while batch := list(islice(records, self.batch_size)):
+                self.import_batch(batch, first_row=rows + 1)
+                rows += len(batch)
+                if self.progress:
+                    self.progress(rows)
+
+            self.link_parents()
+            self.stats['paths_updated'] = Task.objects.rebuild_paths()
+
+            # Bulk writes bypass the model signals, so drop the cached catalog explicitly
+            invalidate_task_index()
+            invalidate_component_catalog()
+        self.stats['rows'] = rows
+        return self.stats
+
+    def load_lookups(self):
+        self.component_types = dict(ComponentType.objects.values_list('name', 'id'))
+        self.product_lines = dict(ProductLine.objects.values_list('name', 'id'))
+        self.generations = {
+            (line_name, generation_number): generation_id
+            for line_name, generation_number, generation_id in ProductGeneration.objects.values_list(
+                'product_line__name', 'generation_number', 'id'
+            )
+        }
+        self.components = {
+            name: (component_id, requires_customer_preset)
+            for component_id, name, requires_customer_preset in Component.objects.values_list(
+                'id', 'name', 'requires_customer_preset'
+            )
+        }
+        self.tasks = dict(Task.objects.exclude(key=None).values_list('key', 'id'))
+        # Task key -> parent key, resolved once every task exists
+        self.parent_keys = {}
+
+    def import_batch(self, batch, first_row):
+        component_rows = {}
+        task_rows = {}
+        for row_number, record in enumerate(batch, start=first_row):
+            try:
+                kind = (record.get('type') or '').strip().lower()
+                if kind == 'component':
+                    name = self.required(record, 'name')
+                    component_rows[name] = (
+                        split_list(record.get('component_types')),
+                        self.parse_bool(record.get('requires_customer_preset')),
+                    )
+                elif kind == 'task':
+                    key = self.required(record, 'key')
+                    task_rows[key] = {
+                        'name': self.required(record, 'name'),
+                        'order': int(record.get('order') or 0),
+                        'parent': (record.get('parent') or '').strip() or None,
+                        'components': split_list(record.get('components')),
+                        'generations': [
+                            self.parse_generation(value) for value in split_list(record.get('product_generations'))
+                        ],
+                    }
+                else:
+                    raise ValueError(f'unknown record type {kind!r}')
+            except (AttributeError, TypeError, ValueError) as error:
+                raise ValueError(f'Row {row_number}: {error}')
+
+        self.import_components(component_rows, task_rows)
+        self.import_generations(task_rows)
+        self.import_tasks(task_rows)
+
+    def import_components(self, component_rows, task_rows):
+        type_names = {name for type_names, _ in component_rows.values() for name in type_names}
+        self.create_missing(
+            ComponentType, self.component_types, type_names,
+            lambda name: ComponentType(name=name), 'component_types_created',
+        )
+
+        # Components referenced by tasks alone are created without types
+        names = set(component_rows)
+        for row in task_rows.values():
+            names.update(row['components'])
+
+        new_components = []
+        changed_components = []
+        for name in names:
+            requires_customer_preset = component_rows.get(name, (None, None))[1]
+            if name not in self.components:
+                new_components.append(Component(name=name, requires_customer_preset=bool(requires_customer_preset)))
+                continue
+            component_id, stored = self.components[name]
+            if requires_customer_preset is not None and requires_customer_preset != stored:
+                changed_components.append(Component(id=component_id, requires_customer_preset=requires_customer_preset))
+                self.components[name] = (component_id, requires_customer_preset)
+
+        if new_components:
+            Component.objects.bulk_create(new_components, batch_size=self.batch_size)
+            created = Component.objects.filter(name__in=[c.name for c in new_components]).values_list(
+                'id', 'name', 'requires_customer_preset'
+            )
+            for component_id, name, requires_customer_preset in created:
+                self.components[name] = (component_id, requires_customer_preset)
+        Component.objects.bulk_update(changed_components, ['requires_customer_preset'], batch_size=self.batch_size)
+        self.stats['components_created'] += len(new_components)
+        self.stats['components_updated'] += len(changed_components)
+
+        self.sync_links(
+            Component.component_types.through, 'component_id', 'componenttype_id',
+            {
+                self.components[name][0]: {self.component_types[type_name] for type_name in type_names}
+                for name, (type_names, _) in component_rows.items()
+            },
+        )
+
+    def import_generations(self, task_rows):
+        references = {generation for row in task_rows.values() for generation in row['generations']}
+        self.create_missing(
+            ProductLine, self.product_lines, {line_name for line_name, _ in references},
+            lambda name: ProductLine(name=name), 'product_lines_created',
+        )
+
+        missing = [reference for reference in references if reference not in self.generations]
+        if not missing:
+            return
+        ProductGeneration.objects.bulk_create([
+            ProductGeneration(product_line_id=self.product_lines[line_name], generation_number=generation_number)
+            for line_name, generation_number in missing
+        ], batch_size=self.batch_size)
+        created = ProductGeneration.objects.filter(
+            product_line_id__in={self.product_lines[line_name] for line_name, _ in missing}
+        ).values_list('product_line__name', 'generation_number', 'id')
+        for line_name, generation_number, generation_id in created:
+            self.generations[(line_name, generation_number)] = generation_id
+        self.stats['product_generations_created'] += len(missing)
+
+    def import_tasks(self, task_rows):
+        if not task_rows:
+            return
+        created = sum(1 for key in task_rows if key not in self.tasks)
+        Task.objects.bulk_create(
+            [Task(key=key, name=row['name'], order=row['order']) for key, row in task_rows.items()],
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['key'],
+            update_fields=['name', 'order'],
+        )
+        # Not every backend returns ids from an upsert, so read them back
+        self.tasks.update(Task.objects.filter(key__in=list(task_rows)).values_list('key', 'id'))
+        self.stats['tasks_created'] += created
+        self.stats['tasks_updated'] += len(task_rows) - created
+
+        for key, row in task_rows.items():
+            self.parent_keys[key] = row['parent']
+
+        self.sync_links(
+            Task.components.through, 'task_id', 'component_id',
+            {
+                self.tasks[key]: {self.components[name][0] for name in row['components']}
+                for key, row in task_rows.items()
+            },
+        )
+        self.sync_links(
+            Task.product_generations.through, 'task_id', 'productgeneration_id',
+            {
+                self.tasks[key]: {self.generations[reference] for reference in row['generations']}
+                for key, row in task_rows.items()
+            },
+        )
+
+    def link_parents(self):
+        """
+        Points every imported task at its parent and rejects hierarchies with cycles.
+        """
+        parents = dict(Task.objects.values_list('id', 'parent_task_id'))
+        changed = []
+        for key, parent_key in self.parent_keys.items():
+            if parent_key is not None and parent_key not in self.tasks:
+                raise ValueError(f'Task {key!r} references unknown parent {parent_key!r}.')
+            task_id = self.tasks[key]
+            parent_id = self.tasks.get(parent_key)
+            if parents[task_id] != parent_id:
+                parents[task_id] = parent_id
+                changed.append(Task(id=task_id, parent_task_id=parent_id))
+
+        # Walk each chain once; meeting a task twice on the same walk means a cycle
+        finished = set()
+        for task_id in parents:
+            chain = []
+            while task_id is not None and task_id not in finished:
+                if task_id in chain:
+                    raise ValueError('The imported task hierarchy contains a cycle.')
+                chain.append(task_id)
+                task_id = parents[task_id]
+            finished.update(chain)
+
+        Task.objects.bulk_update(changed, ['parent_task'], batch_size=self.batch_size)
+        self.stats['parents_updated'] += len(changed)
+
+    def create_missing(self, model, lookup, names, build, stat):
+        missing = [name for name in names if name not in lookup]
+        if not missing:
+            return
+        model.objects.bulk_create([build(name) for name in missing], batch_size=self.batch_size)
+        lookup.update(model.objects.filter(name__in=missing).values_list('name', 'id'))
+        self.stats[stat] += len(missing)
+
+    def sync_links(self, through, source_field, target_field, desired):
+        """
+        Makes the through-table links of each source id match ``desired`` exactly.
+        """
+        if not desired:
+            return
+        present = set()
+        stale_ids = []
+        existing = through.objects.filter(**{f'{source_field}__in': list(desired)}).values_list(
+            'id', source_field, target_field
+        )
+        for link_id, source_id, target_id in existing:
+            if target_id in desired[source_id]:
+                present.add((source_id, target_id))
+            else:
+                stale_ids.append(link_id)
+
+        new_links = [
+            through(**{source_field: source_id, target_field: target_id})
+            for source_id, target_ids in desired.items()
+            for target_id in target_ids
+            if (source_id, target_id) not in present
+        ]
+        through.objects.bulk_create(new_links, batch_size=self.batch_size)
+        if stale_ids:
+            through.objects.filter(id__in=stale_ids).delete()
+        self.stats['links_added'] += len(new_links)
+        self.stats['links_removed'] += len(stale_ids)
+
+    @staticmethod
+    def required(record, field):
+        value = (record.get(field) or '').strip()
+        if not value:
+            raise ValueError(f'{field} is required')
+        return value
+
+    @staticmethod
+    def parse_bool(value):
+        if value is None or isinstance(value, bool):
+            return value
+        value = str(value).strip().lower()
+        if not value:
+            return None
+        if value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return False
+        raise ValueError(f'{value!r} is not a boolean')
+
+    @staticmethod
+    def parse_generation(value):
+        line_name, separator, generation_number = value.rpartition(GENERATION_SEPARATOR)
+        if not separator or not line_name.strip() or not generation_number.strip():
+            raise ValueError(f'{value!r} is not a product generation like "Vehicle{GENERATION_SEPARATOR}2"')
+        return line_name.strip(), generation_number.strip()
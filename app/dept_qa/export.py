@@ -0,0 +1,112 @@
+"""
+Streams checklist task results as CSV or JSON Lines without loading them into memory.
+"""
+import csv
+import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from app.core.models import Component
+from .models import ChecklistTask
+
+# Export column -> ChecklistTask lookup
+EXPORT_COLUMNS = {
+    'checklist_id': 'checklist_id',
+    'iris_number': 'checklist__platform__iris_number',
+    'customer': 'checklist__platform__customer__name',
+    'product_line': 'checklist__platform__product_generation__product_line__name',
+    'generation_number': 'checklist__platform__product_generation__generation_number',
+    'checklist_created_on': 'checklist__created_on',
+    'checklist_completed_on': 'checklist__completed_on',
+    'task_id': 'task_id',
+    'task': 'name',
+    'path': 'path',
+    'component_type': 'group',
+    'component': 'component__name',
+    'status': 'status',
+    'notes': 'notes',
+}
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+class EchoBuffer:
+    """
+    A file-like object whose write returns the value, so csv.writer rows can be yielded.
+    """
+
+    def write(self, value):
+        return value
+
+
+def task_results(checklists, archives=None, chunk_size=2000):
+    """
+    Yields one row of EXPORT_COLUMNS values per task of ``checklists``, in checklist and task order,
+    followed by the tasks of the ``archives`` ArchivedChecklists.
+
+    The live rows are read from the same database as ``checklists`` through
+    ``iterator``, a server-side cursor where the database supports one, so
+    only ``chunk_size`` rows are in memory at a time.
+    """
+    rows = ChecklistTask.objects.using(checklists.db).filter(checklist__in=checklists.values('pk')).order_by(
+        'checklist_id', 'path'
+    ).values_list(*EXPORT_COLUMNS.values())
+    yield from rows.iterator(chunk_size=chunk_size)
+    if archives is not None:
+        yield from archived_task_results(archives)
+
+
+def archived_task_results(archives):
+    """
+    Yields the EXPORT_COLUMNS values of every task in ``archives``, unpacking one archive at a time.
+
+    Like the live rows, the platform columns come from the platform as it is now.
+    """
+    component_names = dict(Component.objects.using(archives.db).values_list('id', 'name'))
+    archives = archives.select_related('platform__customer', 'platform__product_generation__product_line').order_by(
+        'checklist_id'
+    )
+    for archive in archives.iterator(chunk_size=100):
+        platform = archive.platform
+        header = {
+            'checklist_id': archive.checklist_id,
+            'iris_number': platform.iris_number,
+            'customer': platform.customer.name,
+            'product_line': platform.product_generation.product_line.name,
+            'generation_number': platform.product_generation.generation_number,
+            'checklist_created_on': archive.created_on,
+            'checklist_completed_on': archive.completed_on,
+        }
+        for task in archive.tasks():
+            row = dict(
+                header,
+                task_id=task.task_id,
+                task=task.name,
+                path=task.path,
+                component_type=task.group,
+                component=component_names.get(task.component_id),
+                status=task.status,
+                notes=task.notes,
+            )
+            yield tuple(row[column] for column in EXPORT_COLUMNS)
+
+
+def stream_export(rows, format):
+    """
+    Yields ``rows`` of EXPORT_COLUMNS values as lines of CSV (with a header) or JSON Lines.
+    """
+    columns = list(EXPORT_COLUMNS)
+    if format == 'csv':
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([
+                value.isoformat() if isinstance(value, datetime.datetime) else value for value in row
+            ])
+    else:
+        encoder = DjangoJSONEncoder(separators=(',', ':'))
+        for row in rows:
+            yield encoder.encode(dict(zip(columns, row))) + '\n'
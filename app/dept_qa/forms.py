@@ -1,10 +1,15 @@
+import datetime
+
 from django import forms
+from django.db.models import Exists, OuterRef
 from django.forms import formset_factory
+from django.utils import timezone
 
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Field, Submit
 
-from app.core.models import ProductGeneration, Component, AddOnProduct, Customer, Platform
+from app.core.models import ProductGeneration, Customer, Platform
+from .catalog import component_catalog
 from .models import Checklist
 
 
@@ -30,7 +35,7 @@ class PlatformSelectionForm(forms.Form):
         widget=forms.TextInput(attrs={'class': 'input input-bordered w-full'}),
     )
     product_generation = forms.ModelChoiceField(
-        queryset=ProductGeneration.objects.all(),
+        queryset=ProductGeneration.objects.select_related('product_line'),
         label='Platform',
         widget=forms.Select(attrs={'class': 'select select-bordered w-full'}),
     )
@@ -43,8 +48,9 @@ class PlatformSelectionForm(forms.Form):
             'autocomplete': 'off',
         }),
     )
-    components = forms.ModelMultipleChoiceField(
-        queryset=Component.objects.filter(add_on_products__isnull=True).distinct(),
+    # Choices come from the cached component catalog, see __init__
+    components = forms.TypedMultipleChoiceField(
+        coerce=int,
         widget=forms.CheckboxSelectMultiple,
         required=False,
         label='Components',
@@ -63,6 +69,7 @@ class PlatformSelectionForm(forms.Form):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.fields['components'].choices = component_catalog.get().choices
 
         # Initialize the FormHelper
         self.helper = FormHelper()
@@ -108,23 +115,19 @@ class PlatformSelectionForm(forms.Form):
         customer_name = cleaned_data.get('customer')
 
         if iris_number and product_generation and customer_name:
-            # Get or create the Customer instance
-            customer, _ = Customer.objects.get_or_create(name=customer_name)
-
-            # Check if a Platform with the given IRIS Number exists
-            try:
-                platform = Platform.objects.get(iris_number=iris_number)
+            # Look up the platform, its customer and whether it already has a checklist
+            # in one read-only query; the customer itself is only created on save
+            platform = Platform.objects.filter(iris_number=iris_number).annotate(
+                has_checklist=Exists(Checklist.objects.filter(platform=OuterRef('pk')))
+            ).values('product_generation_id', 'customer__name', 'has_checklist').first()
 
+            if platform is not None:
                 # Platform exists; check if product_generation and customer match
-                if platform.product_generation != product_generation or platform.customer != customer:
+                if platform['product_generation_id'] != product_generation.pk or platform['customer__name'] != customer_name:
                     self.add_error('iris_number', "A platform with this IRIS Number already exists with different product generation or customer.")
-                else:
-                    # Check if a Checklist already exists for this Platform
-                    if Checklist.objects.filter(platform=platform).exists():
-                        self.add_error('iris_number', "A checklist already exists for this platform.")
-            except Platform.DoesNotExist:
-                # Platform does not exist; no issues
-                pass
+                elif platform['has_checklist']:
+                    # A Checklist already exists for this Platform
+                    self.add_error('iris_number', "A checklist already exists for this platform.")
         else:
             # One or more required fields are missing; let individual field validators handle it
             pass
@@ -144,3 +147,120 @@ class PlatformSelectionForm(forms.Form):
         #         f"You have selected components that are included in the selected add-ons: {overlapping_names}. "
         #         "Please adjust your selections to avoid duplicates."
         #     )
+
+
+class ChecklistFilterForm(forms.Form):
+    """
+    Filters for the checklist index; every field is optional.
+    """
+    STATUS_CHOICES = [
+        ('', 'Any status'),
+        ('open', 'Open'),
+        ('failed', 'Has failures'),
+        ('complete', 'Complete'),
+    ]
+
+    iris_number = forms.CharField(
+        max_length=100,
+        required=False,
+        label='IRIS Number',
+        widget=forms.TextInput(attrs={'class': 'input input-bordered w-full', 'placeholder': 'IRIS Number'}),
+    )
+    customer = forms.CharField(
+        max_length=100,
+        required=False,
+        label='Customer',
+        widget=forms.TextInput(attrs={
+            'class': 'input input-bordered w-full',
+            'id': 'customer-input',
+            'autocomplete': 'off',
+            'placeholder': 'Customer',
+        }),
+    )
+    product_generation = forms.ModelChoiceField(
+        queryset=ProductGeneration.objects.select_related('product_line'),
+        required=False,
+        label='Platform',
+        empty_label='Any platform',
+        widget=forms.Select(attrs={'class': 'select select-bordered w-full'}),
+    )
+    status = forms.ChoiceField(
+        choices=STATUS_CHOICES,
+        required=False,
+        label='Status',
+        widget=forms.Select(attrs={'class': 'select select-bordered w-full'}),
+    )
+    created_from = forms.DateField(
+        required=False,
+        label='Created From',
+        widget=forms.DateInput(attrs={'class': 'input input-bordered w-full', 'type': 'date'}),
+    )
+    created_to = forms.DateField(
+        required=False,
+        label='Created To',
+        widget=forms.DateInput(attrs={'class': 'input input-bordered w-full', 'type': 'date'}),
+    )
+
+    def filter(self, checklists):
+        """
+        Narrows a Checklist queryset to the cleaned filters.
+        """
+        data = self.cleaned_data
+        if data.get('iris_number'):
+            checklists = checklists.filter(platform__iris_number__istartswith=data['iris_number'].strip())
+        if data.get('customer'):
+            checklists = checklists.filter(
+                platform__customer__in=Customer.objects.filter(name__icontains=data['customer'].strip())
+            )
+        if data.get('product_generation'):
+            checklists = checklists.filter(platform__product_generation=data['product_generation'])
+
+        status = data.get('status')
+        # Open covers every incomplete checklist, including the ones with failures
+        if status == 'open':
+            checklists = checklists.filter(completed_on__isnull=True)
+        elif status == 'failed':
+            checklists = checklists.filter(failed_tasks__gt=0)
+        elif status == 'complete':
+            checklists = checklists.filter(completed_on__isnull=False)
+
+        # Compare against whole local days as datetimes so the created_on index stays usable
+        if data.get('created_from'):
+            checklists = checklists.filter(created_on__gte=self.start_of_day(data['created_from']))
+        if data.get('created_to'):
+            checklists = checklists.filter(
+                created_on__lt=self.start_of_day(data['created_to'] + datetime.timedelta(days=1))
+            )
+        return checklists
+
+    def clean(self):
+        cleaned_data = super().clean()
+        created_from = cleaned_data.get('created_from')
+        created_to = cleaned_data.get('created_to')
+        if created_from and created_to and created_from > created_to:
+            self.add_error('created_to', 'The end date must not be before the start date.')
+        return cleaned_data
+
+    @staticmethod
+    def start_of_day(date):
+        return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+
+class ChecklistManifestForm(forms.Form):
+    """
+    Uploads a build manifest for ChecklistBatchGenerator.
+    """
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    ]
+
+    manifest = forms.FileField(
+        label='Manifest',
+        widget=forms.ClearableFileInput(attrs={'class': 'file-input file-input-bordered w-full'}),
+    )
+    format = forms.ChoiceField(
+        choices=FORMAT_CHOICES,
+        label='Format',
+        widget=forms.Select(attrs={'class': 'select select-bordered w-full'}),
+    )
@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from app.dept_qa.archive import archivable_checklists, archive_checklists
+
+
+class Command(BaseCommand):
+    help = (
+        'Moves checklists completed more than --days ago into compressed ArchivedChecklist rows '
+        'and deletes their hot rows. Checklists with open issues are skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='Archive checklists completed more than this many days ago (default 365).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of checklists archived per transaction.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many checklists would be archived.',
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--days must not be negative and --batch-size must be positive.')
+        completed_before = timezone.now() - timedelta(days=options['days'])
+
+        if options['dry_run']:
+            count = archivable_checklists(completed_before).count()
+            self.stdout.write(f'{count} checklist(s) completed before {completed_before:%Y-%m-%d} would be archived.')
+            return
+
+        archived = archive_checklists(
+            completed_before,
+            batch_size=options['batch_size'],
+            progress=lambda count: self.stdout.write(f'{count} checklist(s) archived'),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} checklist(s).'))
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from app.dept_qa import benchmark
+from app.dept_qa.task_index import task_index
+from app.dept_qa.catalog import component_catalog
+from app.core.autocomplete import customer_name_index
+
+DEFAULT_BASELINE = Path(benchmark.__file__).with_name('benchmark_baseline.json')
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the dept_qa views against synthetic data in a throwaway test database '
+        'and compares query counts with a saved baseline. Timings are compared relative to the '
+        'other scenarios and only reported, unless --strict-timing is given.'
+    )
+
+    def add_arguments(self, parser):
+        for option, default in benchmark.DEFAULT_SCALE.items():
+            parser.add_argument(
+                f'--{option.replace("_", "-")}',
+                type=int,
+                default=default,
+                help=f'Synthetic data scale (default {default}).',
+            )
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per scenario.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic data.')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON file.')
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Store these results as the baseline for the current database vendor.',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.5,
+            help=(
+                'Allowed median slowdown of a scenario beyond the overall slowdown against the baseline, '
+                'as a fraction (default 0.5).'
+            ),
+        )
+        parser.add_argument(
+            '--strict-timing',
+            action='store_true',
+            help='Fail on timing slowdowns too, not only on query count increases.',
+        )
+
+    def handle(self, *args, **options):
+        scale = {option: options[option] for option in benchmark.DEFAULT_SCALE}
+        vendor = connection.vendor
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            # The snapshots are keyed on versions in the shared cache; bump them so nothing stale is reused
+            for snapshot in (task_index, component_catalog, customer_name_index):
+                snapshot.invalidate()
+            benchmark.populate(scale, seed=options['seed'], progress=lambda message: self.stdout.write(message))
+            results = benchmark.run(scale, repeat=options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            for snapshot in (task_index, component_catalog, customer_name_index):
+                snapshot.invalidate()
+
+        self.stdout.write(f'\n{"Scenario":<32} {"median ms":>10} {"min ms":>10} {"queries":>8}')
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<32} {result["median_ms"]:>10} {result["min_ms"]:>10} {result["queries"]:>8}'
+            )
+
+        if options['save_baseline']:
+            benchmark.save_baseline(options['baseline'], vendor, scale, results)
+            self.stdout.write(self.style.SUCCESS(f'Saved the {vendor} baseline to {options["baseline"]}.'))
+            return
+
+        baseline = benchmark.load_baseline(options['baseline'], vendor, scale)
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(f'No {vendor} baseline at this scale to compare against.'))
+            return
+        regressions = benchmark.compare(results, baseline)
+        slowdowns = benchmark.compare_timings(results, baseline, options['tolerance'])
+        if options['strict_timing']:
+            regressions += slowdowns
+        elif slowdowns:
+            self.stdout.write(self.style.WARNING('Slower than the baseline (advisory):\n' + '\n'.join(slowdowns)))
+        if regressions:
+            raise CommandError('Regressions against the baseline:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.dept_qa.models import Checklist
+from app.dept_qa.pdf import build_pdf_archive
+
+
+class Command(BaseCommand):
+    help = 'Renders checklist PDFs in parallel and writes them into a single zip archive.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('iris_numbers', nargs='*', help='IRIS numbers of the checklists to export.')
+        parser.add_argument(
+            '--completed',
+            action='store_true',
+            help='Export every completed checklist.',
+        )
+        parser.add_argument('--output', required=True, help='Path of the zip archive to write.')
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=None,
+            help='Seconds to wait for rendering before giving up.',
+        )
+
+    def handle(self, *args, **options):
+        if not options['iris_numbers'] and not options['completed']:
+            raise CommandError('Pass one or more IRIS numbers or --completed.')
+
+        checklists = Checklist.objects.select_related('platform__product_generation', 'platform__customer')
+        if options['completed']:
+            checklists = checklists.filter(completed_on__isnull=False)
+        if options['iris_numbers']:
+            checklists = checklists.filter(platform__iris_number__in=options['iris_numbers'])
+
+        try:
+            with open(options['output'], 'wb') as fileobj:
+                exported = build_pdf_archive(checklists.order_by('id'), fileobj, timeout=options['timeout'])
+        except TimeoutError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f'Exported {exported} checklist PDF(s) to {options["output"]}.'))
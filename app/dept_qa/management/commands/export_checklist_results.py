@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.dept_qa.export import CONTENT_TYPES, stream_export, task_results
+from app.dept_qa.forms import ChecklistFilterForm
+from app.dept_qa.models import ArchivedChecklist, Checklist
+
+
+class Command(BaseCommand):
+    help = (
+        'Streams the task results of checklists, joined with their platform, customer, product generation '
+        'and Component Type, as CSV or JSON Lines in constant memory. Archived checklists are included '
+        'after the live ones.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=list(CONTENT_TYPES),
+            default='csv',
+            help='Output format (default csv).',
+        )
+        parser.add_argument('--output', help='File to write to. Defaults to standard output.')
+        parser.add_argument('--created-from', help='Only checklists created on or after this date (YYYY-MM-DD).')
+        parser.add_argument('--created-to', help='Only checklists created on or before this date (YYYY-MM-DD).')
+        parser.add_argument(
+            '--status',
+            choices=[value for value, _ in ChecklistFilterForm.STATUS_CHOICES if value],
+            help='Only open, failed or complete checklists.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Number of rows fetched from the database at a time.',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+        form = ChecklistFilterForm({
+            field: options[field] for field in ('created_from', 'created_to', 'status') if options[field]
+        })
+        if not form.is_valid():
+            errors = '; '.join(f'{field}: {" ".join(messages)}' for field, messages in form.errors.items())
+            raise CommandError(f'Invalid filters. {errors}')
+
+        rows = task_results(
+            form.filter(Checklist.objects.all()),
+            archives=form.filter(ArchivedChecklist.objects.all()),
+            chunk_size=options['chunk_size'],
+        )
+        lines = stream_export(rows, options['format'])
+        if options['output']:
+            try:
+                with open(options['output'], 'w', newline='', encoding='utf-8') as fileobj:
+                    fileobj.writelines(lines)
+            except OSError as error:
+                raise CommandError(f'Could not write {options["output"]}: {error}')
+            self.stderr.write(f'Exported checklist results to {options["output"]}.')
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.dept_qa.batch_generation import ChecklistBatchGenerator
+from app.dept_qa.catalog_import import read_records
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates a platform and checklist for every row of a CSV or JSON Lines build manifest. '
+        'Bad rows are reported and skipped; the other rows are still generated.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Manifest file to generate checklists from.')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='File format. Defaults to the file extension.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=25,
+            help='Number of rows generated per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+        path = Path(options['path'])
+        format = options['format'] or ('csv' if path.suffix.lower() == '.csv' else 'jsonl')
+
+        def report_progress(rows):
+            self.stdout.write(f'{rows} rows processed...')
+
+        generator = ChecklistBatchGenerator(chunk_size=options['chunk_size'], progress=report_progress)
+        try:
+            with path.open(newline='', encoding='utf-8') as fileobj:
+                stats = generator.run(read_records(fileobj, format))
+        except OSError as error:
+            raise CommandError(f'Could not read {path}: {error}')
+        except ValueError as error:
+            raise CommandError(f'Could not read {path}, rows before the error were generated. {error}')
+
+        for error in generator.errors:
+            self.stderr.write(f'Row {error.row} (IRIS{error.iris_number}): {error.message}')
+        summary = ', '.join(f'{name.replace("_", " ")}: {count}' for name, count in sorted(stats.items()))
+        if generator.errors:
+            raise CommandError(f'{len(generator.errors)} row(s) failed; the other rows were generated. {summary}')
+        self.stdout.write(self.style.SUCCESS(f'Generated {path}. {summary}'))
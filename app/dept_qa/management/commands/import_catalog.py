@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.dept_qa.catalog_import import CatalogImporter, read_records
+
+
+class Command(BaseCommand):
+    help = 'Streams a task catalog from a CSV or JSON Lines file and upserts it. Safe to re-run.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Catalog file to import.')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='File format. Defaults to the file extension.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of records written per batch.',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        format = options['format'] or ('csv' if path.suffix.lower() == '.csv' else 'jsonl')
+
+        def report_progress(rows):
+            self.stdout.write(f'{rows} rows processed...')
+
+        importer = CatalogImporter(batch_size=options['batch_size'], progress=report_progress)
+        try:
+            with path.open(newline='', encoding='utf-8') as fileobj:
+                stats = importer.run(read_records(fileobj, format))
+        except OSError as error:
+            raise CommandError(f'Could not read {path}: {error}')
+        except ValueError as error:
+            raise CommandError(f'Import failed, nothing was changed. {error}')
+
+        summary = ', '.join(f'{name.replace("_", " ")}: {count}' for name, count in sorted(stats.items()))
+        self.stdout.write(self.style.SUCCESS(f'Imported {path}. {summary}'))
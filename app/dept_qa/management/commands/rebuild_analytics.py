@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app.dept_qa.models import (
+    ComponentStatusSummary, ComponentTypeStatusSummary, CustomerIssueSummary, GenerationCompletionSummary,
+)
+
+
+class Command(BaseCommand):
+    help = 'Recomputes every QA analytics summary table from the checklist history.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            for model in (
+                ComponentStatusSummary,
+                ComponentTypeStatusSummary,
+                GenerationCompletionSummary,
+                CustomerIssueSummary,
+            ):
+                rows = model.rebuild()
+                self.stdout.write(f'{model._meta.verbose_name_plural}: {rows} row(s)')
+        self.stdout.write(self.style.SUCCESS('Rebuilt the analytics summaries.'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app.dept_qa.models import Task
+from app.dept_qa.signals import invalidate_task_index
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the materialized path and depth of every Task.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Task.objects.rebuild_paths()
+            # bulk_update skips post_save, and the task index caches paths
+            invalidate_task_index()
+        self.stdout.write(self.style.SUCCESS(f'Updated the path of {updated} task(s).'))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from app.dept_qa.models import Checklist
+
+
+class Command(BaseCommand):
+    help = 'Verifies the denormalized Checklist progress counters and recomputes any that drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report drifted checklists and exit with an error if any are found.',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute every checklist, not just the ones that drifted.',
+        )
+
+    def handle(self, *args, **options):
+        checklists = Checklist.objects.with_actual_progress().order_by('id')
+        drifted_ids = []
+        for checklist in checklists.iterator(chunk_size=2000):
+            stored = [getattr(checklist, field) for field in Checklist.PROGRESS_FIELDS]
+            actual = [getattr(checklist, f'actual_{field}') for field in Checklist.PROGRESS_FIELDS]
+            if stored != actual:
+                drifted_ids.append(checklist.id)
+                self.stdout.write(f'Checklist {checklist.id}: stored {stored}, actual {actual}')
+
+        if options['check']:
+            if drifted_ids:
+                raise CommandError(f'{len(drifted_ids)} checklist(s) have drifted progress counters.')
+            self.stdout.write(self.style.SUCCESS('All checklist progress counters are correct.'))
+            return
+
+        with transaction.atomic():
+            recomputed = Checklist.objects.all() if options['all'] else Checklist.objects.filter(pk__in=drifted_ids)
+            updated = recomputed.refresh_progress()
+            # Corrected counters can complete a checklist or reopen one
+            fields = ['id', 'platform_id', 'created_on', 'completed_on', *Checklist.PROGRESS_FIELDS]
+            for checklist in recomputed.only(*fields).iterator(chunk_size=2000):
+                checklist.sync_completed_on()
+        self.stdout.write(self.style.SUCCESS(f'Recomputed progress counters for {updated} checklist(s).'))
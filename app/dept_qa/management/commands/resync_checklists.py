@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.dept_qa.resync import ChecklistResync
+
+
+class Command(BaseCommand):
+    help = (
+        'Adds catalog tasks that now apply to open checklists and removes the ones that no longer do. '
+        'Statuses and notes of the remaining tasks are kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of checklists resynced per transaction.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list the differences; nothing is written.',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        def report(diff):
+            changes = [f'+{name}' for _, name in diff.added] + [f'-{name}' for _, name in diff.removed]
+            self.stdout.write(f'IRIS{diff.iris_number} (checklist {diff.checklist_id}): {", ".join(changes)}')
+
+        resync = ChecklistResync(
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+            report=report,
+            progress=lambda count: self.stdout.write(f'{count} checklist(s) checked...'),
+        )
+        stats = resync.run()
+
+        summary = ', '.join(f'{name.replace("_", " ")}: {count}' for name, count in sorted(stats.items()))
+        if options['dry_run']:
+            self.stdout.write(f'Dry run, nothing was changed. {summary}')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Resynced open checklists. {summary}'))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app.dept_qa.models import ChecklistTask
+from app.dept_qa.task_index import task_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Copies task snapshots onto ChecklistTasks created before they were stored on the row. '
+        'Run rebuild_analytics afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of checklists updated per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        index = task_index.get()
+        checklist_ids = list(
+            ChecklistTask.objects.filter(name='', task__isnull=False).order_by('checklist_id').values_list(
+                'checklist_id', flat=True
+            ).distinct()
+        )
+
+        updated = 0
+        batch_size = options['batch_size']
+        for start in range(0, len(checklist_ids), batch_size):
+            with transaction.atomic():
+                rows = list(ChecklistTask.objects.filter(checklist_id__in=checklist_ids[start:start + batch_size]).only(
+                    'id', 'checklist_id', 'task_id', 'name', 'parent_id'
+                ))
+                by_task = {(row.checklist_id, row.task_id): row for row in rows}
+                changed = [row for row in rows if not row.name and row.task_id is not None]
+                ChecklistTask.snapshot_tasks(changed)
+                for row in changed:
+                    row.parent = by_task.get((row.checklist_id, index.parent_id(row.task_id)))
+                ChecklistTask.objects.bulk_update(
+                    changed, ['name', 'order', 'path', 'group', 'component', 'parent'], batch_size=1000
+                )
+            updated += len(changed)
+        self.stdout.write(self.style.SUCCESS(f'Snapshotted {updated} checklist task(s).'))
@@ -1,16 +1,112 @@
-from django.db import models
-from app.core.models import Platform, Component, ProductGeneration
+import json
+import zlib
+from collections import Counter, defaultdict, namedtuple
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Concat, Substr
+from django.utils import timezone
+from app.core.models import Platform, Component, Customer, ProductGeneration
+
+# Checklist counter field for each ChecklistTask status
+STATUS_COUNTER_FIELDS = {
+    'Complete': 'complete_tasks',
+    'Failed': 'failed_tasks',
+    'Incomplete': 'incomplete_tasks',
+}
+
+# One ChecklistTask write: statuses as described in Checklist.record_task_changes, plus
+# the snapshotted component and group the analytics summaries are keyed on
+TaskChange = namedtuple(
+    'TaskChange', ['checklist_id', 'old_status', 'new_status', 'component_id', 'group'], defaults=[None, '']
+)
+
+
+def status_deltas(changes, key):
+    """
+    Sums status changes into counter deltas per value of the TaskChange field ``key``.
+
+    Changes that leave the status as it was add an empty delta, and changes whose
+    key is None are skipped.
+    """
+    deltas = defaultdict(Counter)
+    for change in changes:
+        key_value = getattr(change, key)
+        if key_value is None:
+            continue
+        delta = deltas[key_value]
+        if change.old_status == change.new_status:
+            continue
+        if change.old_status is None:
+            delta['total_tasks'] += 1
+        else:
+            delta[STATUS_COUNTER_FIELDS[change.old_status]] -= 1
+        if change.new_status is None:
+            delta['total_tasks'] -= 1
+        else:
+            delta[STATUS_COUNTER_FIELDS[change.new_status]] += 1
+    return deltas
+
+
+def increment(model, lookup, values):
+    """
+    Adds ``values`` to the counters of the summary row matching ``lookup``, creating it if missing.
+    """
+    values = {field: F(field) + amount for field, amount in values.items() if amount}
+    if not values or model.objects.filter(**lookup).update(**values):
+        return
+    model.objects.bulk_create([model(**lookup)], ignore_conflicts=True)
+    model.objects.filter(**lookup).update(**values)
+
+
+class TaskQuerySet(models.QuerySet):
+    def rebuild_paths(self):
+        """
+        Recomputes the materialized path and depth of every Task in memory and
+        writes the ones that changed with a single bulk_update.
+        """
+        rows = list(Task.objects.values_list('id', 'parent_task_id', 'order', 'path', 'depth'))
+        children = defaultdict(list)
+        for task_id, parent_id, order, path, depth in rows:
+            children[parent_id].append((task_id, order))
+        stored = {task_id: (path, depth) for task_id, _, _, path, depth in rows}
+
+        changed = []
+        stack = [(task_id, order, '', 0) for task_id, order in children[None]]
+        while stack:
+            task_id, order, parent_path, depth = stack.pop()
+            path = parent_path + Task.path_segment(task_id, order)
+            if stored[task_id] != (path, depth):
+                changed.append(Task(id=task_id, path=path, depth=depth))
+            stack.extend((child_id, child_order, path, depth + 1) for child_id, child_order in children[task_id])
+
+        Task.objects.bulk_update(changed, ['path', 'depth'], batch_size=1000)
+        return len(changed)
 
 
 class Task(models.Model):
     """
     Represents tasks or subtasks needed for QA checklists.
+
+    The hierarchy is stored as a materialized path: each task's path is its
+    parent's path plus a fixed-width (order, id) segment, so ordering by path
+    returns a whole tree depth-first with siblings in Task.order.
     """
+    SEGMENT_WIDTH = 10
+
     name = models.CharField(max_length=500)
+    # Stable identifier the catalog import matches rows on; see catalog_import
+    key = models.CharField(max_length=100, unique=True, blank=True, null=True)
     parent_task = models.ForeignKey('self', on_delete=models.CASCADE, related_name='subtasks', blank=True, null=True)
     components = models.ManyToManyField(Component, related_name='tasks', blank=True)
     product_generations = models.ManyToManyField(ProductGeneration, related_name='tasks', blank=True)
     order = models.PositiveIntegerField(default=0)
+    path = models.CharField(max_length=255, db_index=True, editable=False, default='')
+    depth = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = TaskQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -22,14 +118,120 @@ class Task(models.Model):
         """
         return self.parent_task is not None
 
+    @classmethod
+    def path_segment(cls, task_id, order):
+        return f'{order:0{cls.SEGMENT_WIDTH}d}{task_id:0{cls.SEGMENT_WIDTH}d}/'
+
+    def clean(self):
+        super().clean()
+        try:
+            self.parent_position()
+        except ValueError as error:
+            raise ValidationError({'parent_task': str(error)})
+
+    def save(self, *args, **kwargs):
+        # Blank keys are stored as NULL so any number of tasks can go without one
+        self.key = self.key or None
+        parent_position = self.parent_position()
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            self.update_path(*parent_position)
+
+    def parent_position(self):
+        """
+        Returns the (path, depth) of the parent task, or ('', -1) for a root task.
+        """
+        if not self.parent_task_id:
+            return '', -1
+        parent_path, parent_depth = Task.objects.values_list('path', 'depth').get(pk=self.parent_task_id)
+        if self.parent_task_id == self.pk or (self.path and parent_path.startswith(self.path)):
+            raise ValueError('A task cannot be nested under itself or one of its subtasks.')
+        return parent_path, parent_depth
+
+    def update_path(self, parent_path, parent_depth):
+        """
+        Recomputes this task's path from its parent's and moves its subtree along with it.
+        """
+        path = parent_path + self.path_segment(self.pk, self.order)
+        depth = parent_depth + 1
+        if path == self.path and depth == self.depth:
+            return
+
+        old_path, old_depth = self.path, self.depth
+        Task.objects.filter(pk=self.pk).update(path=path, depth=depth)
+        if old_path:
+            Task.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                path=Concat(Value(path), Substr('path', len(old_path) + 1)),
+                depth=F('depth') + (depth - old_depth),
+            )
+        self.path, self.depth = path, depth
+
+    def subtree(self):
+        """
+        Returns this task and all of its descendants, depth-first in display order.
+        """
+        return Task.objects.filter(path__startswith=self.path).order_by('path')
+
+
+class ChecklistQuerySet(models.QuerySet):
+    def actual_progress(self):
+        """
+        Returns subquery expressions counting each checklist's tasks, keyed by counter field.
+        """
+        def task_count(**filters):
+            counts = ChecklistTask.objects.filter(checklist=OuterRef('pk'), **filters).order_by().values(
+                'checklist'
+            ).annotate(count=Count('pk')).values('count')
+            return Coalesce(Subquery(counts), Value(0))
+
+        expressions = {'total_tasks': task_count()}
+        for status, field in STATUS_COUNTER_FIELDS.items():
+            expressions[field] = task_count(status=status)
+        return expressions
+
+    def with_actual_progress(self):
+        """
+        Annotates each checklist with its task counts aggregated from ChecklistTask.
+        """
+        return self.annotate(**{
+            f'actual_{field}': expression for field, expression in self.actual_progress().items()
+        })
+
+    def refresh_progress(self):
+        """
+        Recomputes the progress counters of every checklist in the queryset.
+        """
+        return self.update(version=F('version') + 1, **self.actual_progress())
+
 
 class Checklist(models.Model):
     """
     Represents a QA checklist for a specific platform.
+
+    The task counters are maintained by ChecklistTask and its queryset whenever a
+    status changes, so progress is read from the row instead of aggregated. The
+    version is bumped on every ChecklistTask write and keys cached page fragments.
     """
+    PROGRESS_FIELDS = ['total_tasks', 'complete_tasks', 'failed_tasks', 'incomplete_tasks']
+
     platform = models.ForeignKey(Platform, on_delete=models.CASCADE, related_name='checklists')
     created_on = models.DateTimeField(auto_now_add=True)
     completed_on = models.DateTimeField(blank=True, null=True)
+    total_tasks = models.PositiveIntegerField(default=0)
+    complete_tasks = models.PositiveIntegerField(default=0)
+    failed_tasks = models.PositiveIntegerField(default=0)
+    incomplete_tasks = models.PositiveIntegerField(default=0)
+    version = models.PositiveIntegerField(default=0)
+
+    objects = ChecklistQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the checklist index, newest first
+            models.Index(fields=['-created_on', '-id'], name='dept_qa_checklist_created_idx'),
+            models.Index(fields=['completed_on', '-created_on', '-id'], name='dept_qa_checklist_done_idx'),
+            models.Index(fields=['platform', '-created_on', '-id'], name='dept_qa_checklist_platform_idx'),
+        ]
 
     def __str__(self):
         return f"Checklist for {self.platform.iris_number} - {self.created_on.strftime('%Y-%m-%d')}"
@@ -39,21 +241,147 @@ class Checklist(models.Model):
         Checks if all tasks are marked as complete.
         Returns False if there are no tasks.
         """
-        if not self.tasks.exists():
-            return False
-        return not self.tasks.filter(status__in=['Incomplete', 'Failed']).exists()
-    
+        return self.total_tasks > 0 and self.complete_tasks == self.total_tasks
+
     def completion_percentage(self):
-        total_tasks = self.tasks.count()
-        if total_tasks == 0:
+        if self.total_tasks == 0:
             return 0
-        completed_tasks = self.tasks.filter(status='Complete').count()
-        return int((completed_tasks / total_tasks) * 100)
+        return int((self.complete_tasks / self.total_tasks) * 100)
+
+    def completion_time(self):
+        if self.completed_on is None:
+            return None
+        return self.completed_on - self.created_on
+
+    def sync_completed_on(self):
+        """
+        Stamps or clears completed_on to match the progress counters.
+
+        Keeps the completion analytics in step; expects the counters to be fresh.
+        """
+        is_complete = self.is_complete()
+        if is_complete == (self.completed_on is not None):
+            return
+        generation_id = Platform.objects.filter(pk=self.platform_id).values_list(
+            'product_generation_id', flat=True
+        ).first()
+        if is_complete:
+            self.completed_on = timezone.now()
+            GenerationCompletionSummary.record(generation_id, self.completion_time())
+        else:
+            GenerationCompletionSummary.record(generation_id, self.completion_time(), sign=-1)
+            self.completed_on = None
+        self.save(update_fields=['completed_on'])
+
+    @classmethod
+    def record_task_changes(cls, changes):
+        """
+        Applies ChecklistTask writes to the progress counters and version.
+
+        ``changes`` is an iterable of TaskChange (or plain checklist_id, old_status,
+        new_status) tuples, where an old status of None means the task was added
+        and a new status of None means it was removed; equal statuses mean some
+        other field changed. Each affected checklist gets one UPDATE that also
+        bumps its version, and the analytics summaries are moved along with it.
+        """
+        changes = [TaskChange(*change) for change in changes]
+        # Rows are always updated in key order, so concurrent writers lock them in the same order
+        for checklist_id, delta in sorted(status_deltas(changes, 'checklist_id').items()):
+            values = {field: F(field) + amount for field, amount in delta.items() if amount}
+            cls.objects.filter(pk=checklist_id).update(version=F('version') + 1, **values)
+
+        ComponentStatusSummary.record_deltas(status_deltas(changes, 'component_id'))
+        ComponentTypeStatusSummary.record_deltas(status_deltas(changes, 'group'))
+
+
+class ChecklistTaskQuerySet(models.QuerySet):
+    """
+    Keeps the Checklist progress counters and version in step with bulk writes.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        if kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'):
+            # Which rows were actually inserted is unknown, so the counters and summaries could not follow
+            raise ValueError('ChecklistTask rows cannot be bulk-created with ignore_conflicts or update_conflicts.')
+        objs = list(objs)
+        ChecklistTask.snapshot_tasks(objs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            Checklist.record_task_changes(obj.task_change(None, obj.status) for obj in objs)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            if 'status' in fields:
+                changes = self.status_changes(objs)
+            else:
+                changes = [(obj.checklist_id, None, None) for obj in objs]
+
+            # Run the writes through a plain QuerySet so its internal update() calls are not tracked twice
+            rows = models.QuerySet(self.model, using=self.db).bulk_update(objs, fields, *args, **kwargs)
+            Checklist.record_task_changes(changes)
+        return rows
+
+    def status_changes(self, objs):
+        """
+        Returns a TaskChange per object, from its stored status to its current one.
+
+        The stored rows are read in one query and locked until the transaction
+        ends, so a concurrent edit of the same task cannot change the status
+        the counters are moved from.
+        """
+        rows = self.model.objects.using(self.db).select_for_update().filter(
+            pk__in=[obj.pk for obj in objs]
+        ).values_list('pk', 'status', 'component_id', 'group')
+        stored = {pk: (status, component_id, group) for pk, status, component_id, group in rows}
+
+        changes = []
+        for obj in objs:
+            # A row deleted in the meantime is not written by the update either
+            if obj.pk in stored:
+                old_status, component_id, group = stored[obj.pk]
+                changes.append(TaskChange(obj.checklist_id, old_status, obj.status, component_id, group))
+        return changes
+
+    def update(self, **kwargs):
+        new_status = kwargs.get('status')
+        with transaction.atomic(using=self.db, savepoint=False):
+            rows = list(self.values_list('checklist_id', 'status', 'component_id', 'group'))
+            count = super().update(**kwargs)
+            if 'status' not in kwargs:
+                Checklist.record_task_changes((checklist_id, None, None) for checklist_id, *_ in rows)
+            elif isinstance(new_status, str):
+                Checklist.record_task_changes(
+                    TaskChange(checklist_id, old_status, new_status, component_id, group)
+                    for checklist_id, old_status, component_id, group in rows
+                )
+            else:
+                # The new statuses are unknown here; rebuild_analytics picks the summaries back up
+                Checklist.objects.filter(pk__in={checklist_id for checklist_id, *_ in rows}).refresh_progress()
+        return count
+
+    def delete(self):
+        with transaction.atomic(using=self.db, savepoint=False):
+            rows = list(self.values_list('checklist_id', 'status', 'component_id', 'group'))
+            result = super().delete()
+            Checklist.record_task_changes(
+                TaskChange(checklist_id, old_status, None, component_id, group)
+                for checklist_id, old_status, component_id, group in rows
+            )
+        return result
 
 
 class ChecklistTask(models.Model):
     """
     Tracks the status of individual tasks within a checklist.
+
+    Every write path keeps the parent Checklist's progress counters current; see
+    ChecklistTaskQuerySet for the bulk paths.
+
+    The task's name, order, path and Component Type group are copied onto the
+    row when it is created, so rendering reads this table alone and later
+    catalog edits never rewrite an existing checklist.
     """
     STATUS_CHOICES = [
         ('Complete', 'Complete'),
@@ -62,16 +390,123 @@ class ChecklistTask(models.Model):
     ]
 
     checklist = models.ForeignKey(Checklist, on_delete=models.CASCADE, related_name='tasks')
-    task = models.ForeignKey(Task, on_delete=models.CASCADE)
+    task = models.ForeignKey(Task, on_delete=models.SET_NULL, blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Incomplete')
     notes = models.TextField(blank=True, null=True)
+    # Snapshot of the task at generation time
+    name = models.CharField(max_length=500, blank=True, default='')
+    order = models.PositiveIntegerField(default=0)
+    path = models.CharField(max_length=255, blank=True, default='')
+    group = models.CharField(max_length=255, blank=True, default='')
+    parent = models.ForeignKey('self', on_delete=models.SET_NULL, related_name='subtasks', blank=True, null=True)
+    # The platform component that brought the task into the checklist, if any
+    component = models.ForeignKey(
+        Component, on_delete=models.SET_NULL, related_name='checklist_tasks', blank=True, null=True
+    )
+
+    objects = ChecklistTaskQuerySet.as_manager()
 
     class Meta:
         unique_together = ('checklist', 'task')
-        ordering = ['task__order']
+        ordering = ['path']
+        indexes = [
+            models.Index(fields=['checklist', 'path'], name='dept_qa_ctask_path_idx'),
+            models.Index(fields=['checklist', 'group', 'path'], name='dept_qa_ctask_group_idx'),
+            # Per-status task counts of a checklist, see ChecklistQuerySet.actual_progress
+            models.Index(fields=['checklist', 'status'], name='dept_qa_ctask_status_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.task.name} - {self.status}"
+        return f"{self.name} - {self.status}"
+
+    def stored_status(self):
+        """
+        Returns the status currently saved in the database, or None for a new row.
+
+        Called inside the write's transaction; the row stays locked until it
+        ends, so concurrent edits of the task are counted one after the other.
+        """
+        if self._state.adding:
+            return None
+        return ChecklistTask.objects.select_for_update().filter(pk=self.pk).values_list('status', flat=True).first()
+
+    @classmethod
+    def snapshot_tasks(cls, objs):
+        """
+        Copies the catalog fields of each task onto ChecklistTasks that have no snapshot yet.
+        """
+        from .task_index import task_index
+
+        missing = [obj for obj in objs if obj.task_id and not obj.name]
+        if not missing:
+            return
+        platform_components = defaultdict(list)
+        component_rows = Platform.components.through.objects.filter(
+            platform__checklists__in={obj.checklist_id for obj in missing}
+        ).values_list('platform__checklists', 'component_id')
+        for checklist_id, component_id in component_rows:
+            platform_components[checklist_id].append(component_id)
+
+        index = task_index.get()
+        for obj in missing:
+            for field, value in index.snapshot(obj.task_id, platform_components[obj.checklist_id]).items():
+                setattr(obj, field, value)
+
+    def task_change(self, old_status, new_status):
+        return TaskChange(self.checklist_id, old_status, new_status, self.component_id, self.group)
+
+    def find_parent(self):
+        """
+        Returns the row of the same checklist that holds this task's parent task, if any.
+        """
+        from .task_index import task_index
+
+        parent_task_id = task_index.get().parent_id(self.task_id)
+        if parent_task_id is None:
+            return None
+        return ChecklistTask.objects.filter(checklist_id=self.checklist_id, task_id=parent_task_id).first()
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if self._state.adding and self.task_id and not self.name:
+            self.snapshot_tasks([self])
+            if self.parent_id is None:
+                self.parent = self.find_parent()
+            # The parent row keeps the path it was generated with, which the catalog may have moved since
+            if self.parent is not None:
+                self.path = self.parent.path + Task.path_segment(self.task_id, self.order)
+        with transaction.atomic(savepoint=False):
+            if update_fields is not None and 'status' not in update_fields:
+                super().save(*args, **kwargs)
+                Checklist.record_task_changes([(self.checklist_id, None, None)])
+                return
+
+            old_status = self.stored_status()
+            super().save(*args, **kwargs)
+            Checklist.record_task_changes([self.task_change(old_status, self.status)])
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            old_status = self.stored_status()
+            result = super().delete(*args, **kwargs)
+            Checklist.record_task_changes([self.task_change(old_status, None)])
+        return result
+
+
+class IssueResolutionQuerySet(models.QuerySet):
+    """
+    Keeps the open issue counts per customer in step with bulk deletes, such as the admin's delete action.
+    """
+
+    def delete(self):
+        with transaction.atomic(using=self.db, savepoint=False):
+            per_customer = list(self.filter(resolved_on__isnull=True).order_by().values_list(
+                'checklist__platform__customer_id'
+            ).annotate(count=Count('pk')))
+            result = super().delete()
+            for customer_id, count in per_customer:
+                CustomerIssueSummary.record(customer_id, -count)
+        return result
 
 
 class IssueResolution(models.Model):
@@ -84,5 +519,289 @@ class IssueResolution(models.Model):
     reported_on = models.DateTimeField(auto_now_add=True)
     resolved_on = models.DateTimeField(blank=True, null=True)
 
+    objects = IssueResolutionQuerySet.as_manager()
+
     def __str__(self):
         return f"Issue on {self.checklist.platform.iris_number} - Reported on {self.reported_on.strftime('%Y-%m-%d')}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember whether the stored issue was open so saves can move the summary
+        instance._loaded_open = instance.__dict__.get('resolved_on') is None
+        return instance
+
+    def is_open(self):
+        return self.resolved_on is None
+
+    def stored_open(self):
+        """
+        Returns whether the saved issue is open, or None for a new row.
+        """
+        if self._state.adding:
+            return None
+        if 'resolved_on' not in self.__dict__ or not hasattr(self, '_loaded_open'):
+            return IssueResolution.objects.filter(pk=self.pk, resolved_on__isnull=True).exists()
+        return self._loaded_open
+
+    def customer_id(self):
+        return Checklist.objects.filter(pk=self.checklist_id).values_list('platform__customer_id', flat=True).first()
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            was_open = bool(self.stored_open())
+            super().save(*args, **kwargs)
+            if self.is_open() != was_open:
+                CustomerIssueSummary.record(self.customer_id(), 1 if self.is_open() else -1)
+        self._loaded_open = self.is_open()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            was_open = self.stored_open()
+            customer_id = self.customer_id()
+            result = super().delete(*args, **kwargs)
+            if was_open:
+                CustomerIssueSummary.record(customer_id, -1)
+        return result
+
+
+class ArchivedChecklistQuerySet(models.QuerySet):
+    def task_changes(self):
+        """
+        Yields a TaskChange adding each archived task, for rebuilding the analytics summaries.
+        """
+        for archive in self.only('pk', 'checklist_id', 'data').iterator(chunk_size=100):
+            for task in archive.tasks():
+                yield TaskChange(archive.checklist_id, None, task.status, task.component_id, task.group)
+
+
+class ArchivedChecklist(models.Model):
+    """
+    A completed Checklist moved out of the hot tables by the archive_checklists command.
+
+    The checklist header, its tasks and its issues are kept as one
+    zlib-compressed JSON document (see app.dept_qa.archive); the columns hold
+    what listings and the analytics rebuild need without unpacking it. The
+    archived checklist still counts towards the analytics summaries.
+    """
+    # Fields of each row in the document's task and issue lists
+    TASK_FIELDS = ['id', 'task_id', 'parent_id', 'component_id', 'name', 'order', 'path', 'group', 'status', 'notes']
+    ISSUE_FIELDS = ['issue_description', 'resolution', 'reported_on', 'resolved_on']
+
+    # Primary key the checklist had while it was live
+    checklist_id = models.BigIntegerField(unique=True)
+    platform = models.ForeignKey(Platform, on_delete=models.CASCADE, related_name='archived_checklists')
+    created_on = models.DateTimeField()
+    completed_on = models.DateTimeField()
+    archived_on = models.DateTimeField(auto_now_add=True)
+    total_tasks = models.PositiveIntegerField(default=0)
+    complete_tasks = models.PositiveIntegerField(default=0)
+    failed_tasks = models.PositiveIntegerField(default=0)
+    data = models.BinaryField()
+
+    objects = ArchivedChecklistQuerySet.as_manager()
+
+    def __str__(self):
+        return f"Archived checklist for {self.platform.iris_number} - {self.created_on.strftime('%Y-%m-%d')}"
+
+    def completion_time(self):
+        return self.completed_on - self.created_on
+
+    def document(self):
+        """
+        Returns the unpacked archive document, decompressing it once per instance.
+        """
+        if not hasattr(self, '_document'):
+            self._document = json.loads(zlib.decompress(self.data))
+        return self._document
+
+    def tasks(self):
+        """
+        Returns the archived tasks as ArchivedTask tuples in path order.
+        """
+        return [ArchivedTask(*row) for row in self.document()['tasks']]
+
+    def issues(self):
+        return [dict(zip(self.ISSUE_FIELDS, row)) for row in self.document()['issues']]
+
+
+# Read-only stand-in for a ChecklistTask restored from an archive
+ArchivedTask = namedtuple('ArchivedTask', ArchivedChecklist.TASK_FIELDS)
+
+
+class StatusSummary(models.Model):
+    """
+    ChecklistTask status counters for one analytics dimension, moved by every status change.
+
+    Counters are plain integers so a row created after history was written can
+    go briefly negative instead of failing a write; rebuild_analytics squares
+    them with the ChecklistTask table.
+    """
+    total_tasks = models.IntegerField(default=0)
+    complete_tasks = models.IntegerField(default=0)
+    failed_tasks = models.IntegerField(default=0)
+    incomplete_tasks = models.IntegerField(default=0)
+
+    # ChecklistTask field the summary is keyed on, and the matching field on the summary
+    task_key = None
+    summary_key = None
+
+    class Meta:
+        abstract = True
+
+    def failure_rate(self):
+        if self.total_tasks <= 0:
+            return 0
+        return round(self.failed_tasks / self.total_tasks * 100, 1)
+
+    @classmethod
+    def record_deltas(cls, deltas):
+        # In key order, like Checklist.record_task_changes, so concurrent writers cannot deadlock
+        for key, delta in sorted(deltas.items()):
+            increment(cls, {cls.summary_key: key}, delta)
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recomputes every row from the ChecklistTask table and the archived checklists.
+        """
+        counts = {'total_tasks': Count('pk')}
+        for status, field in STATUS_COUNTER_FIELDS.items():
+            counts[field] = Count('pk', filter=Q(status=status))
+        rows = ChecklistTask.objects.exclude(**{f'{cls.task_key}__isnull': True}).order_by().values(
+            cls.task_key
+        ).annotate(**counts)
+
+        totals = defaultdict(Counter)
+        for row in rows.iterator(chunk_size=2000):
+            totals[row.pop(cls.task_key)].update(row)
+        for key, delta in status_deltas(ArchivedChecklist.objects.task_changes(), cls.task_key).items():
+            totals[key].update(delta)
+
+        cls.objects.all().delete()
+        cls.objects.bulk_create(
+            [cls(**{cls.summary_key: key}, **totals[key]) for key in cls.existing_keys(totals)],
+            batch_size=1000,
+        )
+        return cls.objects.count()
+
+    @classmethod
+    def existing_keys(cls, keys):
+        """
+        Returns the keys a summary row can still be created for.
+        """
+        return list(keys)
+
+
+class ComponentStatusSummary(StatusSummary):
+    """
+    Task outcomes per Component, attributed through ChecklistTask.component.
+    """
+    component = models.OneToOneField(Component, on_delete=models.CASCADE, related_name='status_summary')
+
+    task_key = 'component_id'
+    summary_key = 'component_id'
+
+    @classmethod
+    def existing_keys(cls, keys):
+        # Archives may still name components deleted since
+        return list(Component.objects.filter(pk__in=list(keys)).values_list('pk', flat=True))
+
+    def __str__(self):
+        return f"{self.component} - {self.failure_rate()}% failed"
+
+
+class ComponentTypeStatusSummary(StatusSummary):
+    """
+    Task outcomes per Component Type, keyed on the group snapshotted onto ChecklistTask.
+
+    Tasks without a Component Type are counted under the blank group.
+    """
+    group = models.CharField(max_length=255, unique=True, blank=True)
+
+    task_key = 'group'
+    summary_key = 'group'
+
+    def __str__(self):
+        return f"{self.group or 'General'} - {self.failure_rate()}% failed"
+
+
+class GenerationCompletionSummary(models.Model):
+    """
+    Count and summed duration of completed checklists per Product Generation.
+    """
+    product_generation = models.OneToOneField(
+        ProductGeneration, on_delete=models.CASCADE, related_name='completion_summary'
+    )
+    completed_checklists = models.IntegerField(default=0)
+    total_completion_time = models.DurationField(default=timedelta)
+
+    def __str__(self):
+        return f"{self.product_generation} - {self.completed_checklists} completed"
+
+    def average_completion_time(self):
+        if self.completed_checklists <= 0:
+            return None
+        return self.total_completion_time / self.completed_checklists
+
+    def average_completion_hours(self):
+        average = self.average_completion_time()
+        if average is None:
+            return None
+        return round(average.total_seconds() / 3600, 1)
+
+    @classmethod
+    def record(cls, product_generation_id, completion_time, sign=1):
+        """
+        Adds (or with a negative ``sign``, removes) one completed checklist.
+        """
+        increment(cls, {'product_generation_id': product_generation_id}, {
+            'completed_checklists': sign,
+            'total_completion_time': completion_time * sign,
+        })
+
+    @classmethod
+    def rebuild(cls):
+        totals = {}
+        for queryset in (Checklist.objects.filter(completed_on__isnull=False), ArchivedChecklist.objects.all()):
+            rows = queryset.order_by().values('platform__product_generation_id').annotate(
+                completed_checklists=Count('pk'),
+                total_completion_time=Sum(F('completed_on') - F('created_on'), output_field=models.DurationField()),
+            )
+            for row in rows:
+                summary = totals.setdefault(
+                    row['platform__product_generation_id'],
+                    cls(product_generation_id=row['platform__product_generation_id']),
+                )
+                summary.completed_checklists += row['completed_checklists']
+                summary.total_completion_time += row['total_completion_time']
+        cls.objects.all().delete()
+        cls.objects.bulk_create(totals.values(), batch_size=1000)
+        return cls.objects.count()
+
+
+class CustomerIssueSummary(models.Model):
+    """
+    Number of unresolved IssueResolutions per Customer.
+    """
+    customer = models.OneToOneField(Customer, on_delete=models.CASCADE, related_name='issue_summary')
+    open_issues = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.customer} - {self.open_issues} open"
+
+    @classmethod
+    def record(cls, customer_id, delta):
+        if customer_id is not None:
+            increment(cls, {'customer_id': customer_id}, {'open_issues': delta})
+
+    @classmethod
+    def rebuild(cls):
+        rows = IssueResolution.objects.filter(resolved_on__isnull=True).order_by().values(
+            'checklist__platform__customer_id'
+        ).annotate(open_issues=Count('pk'))
+        cls.objects.all().delete()
+        cls.objects.bulk_create([
+            cls(customer_id=row['checklist__platform__customer_id'], open_issues=row['open_issues']) for row in rows
+        ], batch_size=1000)
+        return cls.objects.count()
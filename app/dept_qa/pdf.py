@@ -0,0 +1,124 @@
+import logging
+import multiprocessing
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from .models import ChecklistTask
+from .pdf_worker import write_pdf
+from .task_groups import build_sections
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_lock = threading.Lock()
+# PDF path -> Future of the render currently producing it
+_pending = {}
+
+
+def get_executor():
+    """
+    Returns the process pool that renders PDFs, starting it on first use.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.CHECKLIST_PDF_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+
+def pdf_directory():
+    return Path(settings.MEDIA_ROOT) / settings.CHECKLIST_PDF_DIR
+
+
+def pdf_path(checklist):
+    """
+    Returns where the PDF of the checklist's current version is stored.
+    """
+    return pdf_directory() / f'checklist-{checklist.pk}-v{checklist.version}.pdf'
+
+
+def pdf_filename(checklist):
+    return f'IRIS{checklist.platform.iris_number}-checklist.pdf'
+
+
+def render_checklist_html(checklist):
+    tasks = ChecklistTask.objects.filter(checklist=checklist).order_by('path')
+    return render_to_string('dept_qa/checklist_pdf.html', {
+        'checklist': checklist,
+        'completion_percentage': checklist.completion_percentage(),
+        'sections': build_sections(tasks),
+    })
+
+
+def schedule_pdf(checklist):
+    """
+    Queues the PDF of the checklist's current version for rendering and returns its Future.
+
+    A render already in flight for the same version is reused rather than queued twice.
+    """
+    path = pdf_path(checklist)
+    with _lock:
+        future = _pending.get(path)
+    if future is not None:
+        return future
+
+    # Rendering the HTML needs the database, so it happens here; only WeasyPrint runs in the pool
+    html = render_checklist_html(checklist)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stale_pattern = str(pdf_directory() / f'checklist-{checklist.pk}-v*.pdf')
+    executor = get_executor()
+
+    with _lock:
+        future = _pending.get(path)
+        if future is None:
+            future = executor.submit(write_pdf, html, str(settings.BASE_DIR), str(path), stale_pattern)
+            _pending[path] = future
+            future.add_done_callback(lambda done: _render_finished(path, done))
+    return future
+
+
+def _render_finished(path, future):
+    with _lock:
+        _pending.pop(path, None)
+    if not future.cancelled() and future.exception() is not None:
+        logger.error('Rendering %s failed', path, exc_info=future.exception())
+
+
+def request_pdf(checklist):
+    """
+    Returns the path of the checklist's cached PDF, or queues a render and returns None.
+    """
+    path = pdf_path(checklist)
+    if path.exists():
+        return path
+    schedule_pdf(checklist)
+    return None
+
+
+def build_pdf_archive(checklists, fileobj, timeout=None):
+    """
+    Writes the PDFs of several checklists into one zip archive.
+
+    Missing PDFs are rendered in parallel by the worker pool first. Raises
+    TimeoutError if they are not all ready within ``timeout`` seconds.
+    """
+    checklists = list(checklists)
+    futures = [schedule_pdf(checklist) for checklist in checklists if not pdf_path(checklist).exists()]
+    done, not_done = wait(futures, timeout=timeout)
+    if not_done:
+        raise TimeoutError(f'{len(not_done)} checklist PDF(s) were not rendered in time.')
+    for future in done:
+        future.result()
+
+    with zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for checklist in checklists:
+            archive.write(pdf_path(checklist), arcname=pdf_filename(checklist))
+    return len(checklists)
@@ -0,0 +1,28 @@
+"""
+Code that runs inside the checklist PDF worker processes.
+
+It deliberately imports nothing from Django: the workers receive fully
+rendered HTML, so they start quickly and never touch the database.
+"""
+import glob
+import os
+
+
+def write_pdf(html, base_url, path, stale_pattern):
+    """
+    Renders ``html`` to a PDF at ``path`` and removes older versions matching ``stale_pattern``.
+    """
+    from weasyprint import HTML
+
+    # Write to a temporary file first so a half-written PDF is never served
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    HTML(string=html, base_url=base_url).write_pdf(temp_path)
+    os.replace(temp_path, path)
+
+    for stale_path in glob.glob(stale_pattern):
+        if stale_path != path:
+            try:
+                os.remove(stale_path)
+            except FileNotFoundError:
+                pass
+    return path
@@ -0,0 +1,171 @@
+"""
+Brings the tasks of open checklists in line with the current task catalog.
+"""
+from collections import Counter, defaultdict, namedtuple
+
+from django.db import transaction
+
+from app.core.models import Platform
+from .models import Checklist, ChecklistTask, Task
+from .task_index import task_index
+
+# ``added`` holds (task id, name) pairs still to be created, ``removed`` (ChecklistTask id, name) pairs to delete
+ChecklistDiff = namedtuple('ChecklistDiff', ['checklist_id', 'iris_number', 'added', 'removed'])
+
+
+def open_checklists():
+    """
+    Returns the checklists that are still being worked on and can be resynced.
+    """
+    return Checklist.objects.filter(completed_on__isnull=True)
+
+
+class ChecklistResync:
+    """
+    Adds the tasks that now apply to each open checklist and removes the ones that no longer do.
+
+    What applies is resolved exactly as for a new checklist, from the platform's
+    product generation and components. Rows that still apply are left alone,
+    so their status and notes are kept. Checklists run in batches of one
+    transaction each, with one bulk INSERT and one DELETE per batch. With
+    ``dry_run`` nothing is written; either way every difference is passed to
+    ``report``.
+    """
+
+    def __init__(self, batch_size=200, dry_run=False, report=None, progress=None):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.report = report
+        self.progress = progress
+        self.stats = Counter()
+        self.task_sets = {}
+
+    def run(self, checklists=None):
+        checklists = open_checklists() if checklists is None else checklists.filter(completed_on__isnull=True)
+        self.index = task_index.get()
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                # Lock the batch so its tasks are not edited while the diff is applied
+                batch = checklists.filter(pk__gt=last_id).order_by('pk')
+                if not self.dry_run:
+                    batch = batch.select_for_update(of=('self',))
+                rows = list(batch.values_list(
+                    'pk', 'platform_id', 'platform__iris_number', 'platform__product_generation_id'
+                )[:self.batch_size])
+                if not rows:
+                    return self.stats
+                diffs = self.diff_batch(rows)
+                if diffs and not self.dry_run:
+                    self.apply(diffs)
+            last_id = rows[-1][0]
+            self.stats['checklists_checked'] += len(rows)
+            if self.progress:
+                self.progress(self.stats['checklists_checked'])
+
+    def diff_batch(self, rows):
+        """
+        Returns a ChecklistDiff for each checklist of the batch whose tasks differ from the catalog.
+        """
+        checklist_ids = [checklist_id for checklist_id, *_ in rows]
+        platform_components = defaultdict(list)
+        component_rows = Platform.components.through.objects.filter(
+            platform_id__in={platform_id for _, platform_id, *_ in rows}
+        ).values_list('platform_id', 'component_id')
+        for platform_id, component_id in component_rows:
+            platform_components[platform_id].append(component_id)
+
+        current = defaultdict(dict)
+        paths = defaultdict(dict)
+        task_rows = ChecklistTask.objects.filter(checklist_id__in=checklist_ids).order_by().values_list(
+            'checklist_id', 'task_id', 'pk', 'name', 'path'
+        )
+        for checklist_id, task_id, pk, name, path in task_rows:
+            # Rows whose catalog task was deleted have no task and never apply
+            current[checklist_id][task_id if task_id is not None else ('deleted', pk)] = (pk, name)
+            paths[checklist_id][task_id] = path
+
+        diffs = []
+        for checklist_id, platform_id, iris_number, generation_id in rows:
+            component_ids = platform_components[platform_id]
+            wanted = self.resolve(generation_id, component_ids)
+            existing = current[checklist_id]
+            added = [
+                (task_id, self.index.task_snapshots[task_id][0]) for task_id in wanted if task_id not in existing
+            ]
+            removed = [row for task_id, row in existing.items() if task_id not in wanted]
+            if added or removed:
+                diff = ChecklistDiff(checklist_id, iris_number, added, removed)
+                kept_paths = {task_id: path for task_id, path in paths[checklist_id].items() if task_id in wanted}
+                diffs.append((diff, platform_id, component_ids, existing, kept_paths))
+                self.stats['checklists_changed'] += 1
+                self.stats['tasks_added'] += len(added)
+                self.stats['tasks_removed'] += len(removed)
+                if self.report:
+                    self.report(diff)
+        return diffs
+
+    def resolve(self, generation_id, component_ids):
+        key = (generation_id, tuple(sorted(component_ids)))
+        if key not in self.task_sets:
+            self.task_sets[key] = self.index.resolve(generation_id, component_ids)
+        return self.task_sets[key]
+
+    def catalog_path(self, task_id):
+        return self.index.task_snapshots[task_id][1]
+
+    def new_row(self, checklist_id, task_id, component_ids, paths):
+        """
+        Returns an unsaved ChecklistTask for a task added to a checklist, and records its path in ``paths``.
+
+        Existing rows keep the path they were generated with, so a subtask of
+        one of them is placed under that row's path rather than the parent's
+        current catalog path.
+        """
+        fields = self.index.snapshot(task_id, component_ids)
+        parent_path = paths.get(self.index.parent_id(task_id))
+        if parent_path is not None:
+            fields['path'] = parent_path + Task.path_segment(task_id, fields['order'])
+        paths[task_id] = fields['path']
+        return ChecklistTask(checklist_id=checklist_id, task_id=task_id, **fields)
+
+    def apply(self, diffs):
+        removed_ids = [pk for diff, *_ in diffs for pk, _ in diff.removed]
+        if removed_ids:
+            ChecklistTask.objects.filter(pk__in=removed_ids).delete()
+
+        new_tasks = ChecklistTask.objects.bulk_create([
+            self.new_row(diff.checklist_id, task_id, component_ids, paths)
+            for diff, platform_id, component_ids, existing, paths in diffs
+            # Catalog path order, so a new parent's path is known before its subtasks'
+            for task_id in sorted((task_id for task_id, _ in diff.added), key=self.catalog_path)
+        ])
+
+        # Link each new row to its parent row, and existing rows to a parent that was just added
+        row_ids = {}
+        for diff, platform_id, component_ids, existing, paths in diffs:
+            removed = {pk for pk, _ in diff.removed}
+            for task_id, (pk, _) in existing.items():
+                if pk not in removed:
+                    row_ids[diff.checklist_id, task_id] = pk
+        added_ids = set()
+        for checklist_task in new_tasks:
+            row_ids[checklist_task.checklist_id, checklist_task.task_id] = checklist_task.pk
+            added_ids.add(checklist_task.pk)
+
+        with_parent = []
+        for (checklist_id, task_id), pk in row_ids.items():
+            if not isinstance(task_id, int):
+                continue
+            parent_pk = row_ids.get((checklist_id, self.index.parent_id(task_id)))
+            if parent_pk is not None and (pk in added_ids or parent_pk in added_ids):
+                with_parent.append(ChecklistTask(pk=pk, checklist_id=checklist_id, parent_id=parent_pk))
+        if with_parent:
+            ChecklistTask.objects.bulk_update(with_parent, ['parent'])
+
+        # Removing the last open tasks can complete a checklist
+        if removed_ids:
+            for checklist in Checklist.objects.filter(pk__in=[diff.checklist_id for diff, *_ in diffs]).only(
+                'id', 'platform_id', 'created_on', 'completed_on', *Checklist.PROGRESS_FIELDS
+            ):
+                checklist.sync_completed_on()
@@ -0,0 +1,132 @@
+from django.db import transaction
+
+from app.core.models import Customer, Platform
+from .models import Checklist, ChecklistTask
+from .task_index import task_index
+
+
+def resolve_task_ids(product_generation, component_ids):
+    """
+    Returns the ids of every Task that applies to a platform, ordered by Task.order.
+
+    A task applies when it is linked to one of the selected components, or when it
+    is linked to the product generation and not tied to any component.
+    """
+    return task_index.get().resolve(product_generation.pk, component_ids)
+
+
+def generate_checklist(
+    iris_number, product_generation, customer_name, component_ids, customer_presets=None, task_ids=None,
+):
+    """
+    Creates (or updates) the Platform for an IRIS number and materializes its Checklist.
+
+    Everything runs in a single transaction so a failure never leaves a
+    half-populated checklist behind. ``task_ids`` may pass in the result of
+    resolve_task_ids for the same generation and components, to reuse it.
+    """
+    component_ids = list(component_ids)
+
+    with transaction.atomic():
+        # Get or create the Customer instance
+        customer, _ = Customer.objects.get_or_create(name=customer_name)
+
+        # Get or create the Platform instance
+        platform, created = Platform.objects.get_or_create(
+            iris_number=iris_number,
+            defaults={
+                'product_generation': product_generation,
+                'customer': customer,
+                'customer_presets': customer_presets,
+            }
+        )
+
+        # Update Platform details if it already exists
+        if not created:
+            platform.product_generation = product_generation
+            platform.customer = customer
+            platform.customer_presets = customer_presets
+            platform.save(update_fields=['product_generation', 'customer', 'customer_presets'])
+
+        # Set components
+        platform.components.set(component_ids)
+
+        # Generate the checklist and all of its tasks in one INSERT
+        checklist = Checklist.objects.create(platform=platform)
+        if task_ids is None:
+            task_ids = resolve_task_ids(product_generation, component_ids)
+        create_checklist_tasks(checklist, task_ids, component_ids)
+
+    return checklist
+
+
+def create_checklist_tasks(checklist, task_ids, component_ids=()):
+    """
+    Bulk-creates ChecklistTasks with their task snapshots and links each to its parent row.
+
+    Returns the created ChecklistTask instances.
+    """
+    index = task_index.get()
+    checklist_tasks = ChecklistTask.objects.bulk_create([
+        ChecklistTask(checklist=checklist, task_id=task_id, **index.snapshot(task_id, component_ids))
+        for task_id in task_ids
+    ])
+
+    by_task_id = {checklist_task.task_id: checklist_task for checklist_task in checklist_tasks}
+    with_parent = []
+    for checklist_task in checklist_tasks:
+        parent = by_task_id.get(index.parent_id(checklist_task.task_id))
+        if parent is not None:
+            checklist_task.parent = parent
+            with_parent.append(checklist_task)
+    if with_parent:
+        ChecklistTask.objects.bulk_update(with_parent, ['parent'])
+    return checklist_tasks
+
+
+def apply_task_updates(checklist, updates):
+    """
+    Applies posted status/notes values to the tasks of a checklist.
+
+    ``updates`` maps ChecklistTask ids to dicts with optional 'status' and 'notes'
+    keys. Only rows whose values actually change are written, with a single
+    bulk_update, and the checklist's completed_on is kept in step in the same
+    transaction. Returns the changed ChecklistTask instances.
+    """
+    status_values = {value for value, _ in ChecklistTask.STATUS_CHOICES}
+
+    with transaction.atomic():
+        # Locked so concurrent edits of the same tasks are compared and counted one after the other
+        tasks = ChecklistTask.objects.select_for_update().filter(checklist=checklist, id__in=list(updates)).only(
+            'id', 'checklist_id', 'status', 'notes'
+        )
+
+        changed_tasks = []
+        for task in tasks:
+            update = updates[task.id]
+
+            changed = False
+            status = update.get('status')
+            if status in status_values and status != task.status:
+                task.status = status
+                changed = True
+
+            # Blank and missing notes are the same thing
+            notes = update.get('notes')
+            if notes is not None and (notes or None) != (task.notes or None):
+                task.notes = notes
+                changed = True
+
+            if changed:
+                changed_tasks.append(task)
+
+        if not changed_tasks:
+            return changed_tasks
+
+        ChecklistTask.objects.bulk_update(changed_tasks, ['status', 'notes'])
+
+        # Stamp or clear the completion date from the refreshed counters
+        checklist.refresh_from_db(fields=Checklist.PROGRESS_FIELDS)
+        checklist.sync_completed_on()
+
+    return changed_tasks
@@ -0,0 +1,103 @@
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from app.core.models import Component, ComponentType, Platform, ProductGeneration
+from .catalog import component_catalog
+from .models import (
+    ArchivedChecklist, Checklist, ChecklistTask, ComponentStatusSummary, ComponentTypeStatusSummary,
+    CustomerIssueSummary, GenerationCompletionSummary, Task, TaskChange, status_deltas,
+)
+from .task_index import task_index
+
+
+@receiver(post_save, sender=Task, dispatch_uid='task_index_task_saved')
+@receiver(post_delete, sender=Task, dispatch_uid='task_index_task_deleted')
+@receiver(post_save, sender=Component, dispatch_uid='task_index_component_saved')
+@receiver(post_delete, sender=Component, dispatch_uid='task_index_component_deleted')
+@receiver(post_save, sender=ProductGeneration, dispatch_uid='task_index_generation_saved')
+@receiver(post_delete, sender=ProductGeneration, dispatch_uid='task_index_generation_deleted')
+@receiver(post_save, sender=ComponentType, dispatch_uid='task_index_type_saved')
+@receiver(post_delete, sender=ComponentType, dispatch_uid='task_index_type_deleted')
+def invalidate_task_index(**kwargs):
+    """
+    Drops the task applicability index now and again once the transaction commits,
+    so a rebuild that raced the write cannot keep serving stale data.
+    """
+    task_index.invalidate()
+    transaction.on_commit(task_index.invalidate)
+
+
+@receiver(m2m_changed, sender=Task.components.through, dispatch_uid='task_index_task_components')
+@receiver(m2m_changed, sender=Task.product_generations.through, dispatch_uid='task_index_task_generations')
+@receiver(m2m_changed, sender=Component.component_types.through, dispatch_uid='task_index_component_types')
+def task_links_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_task_index()
+
+
+@receiver(post_save, sender=Component, dispatch_uid='component_catalog_component_saved')
+@receiver(post_delete, sender=Component, dispatch_uid='component_catalog_component_deleted')
+@receiver(post_save, sender=ComponentType, dispatch_uid='component_catalog_type_saved')
+@receiver(post_delete, sender=ComponentType, dispatch_uid='component_catalog_type_deleted')
+def invalidate_component_catalog(**kwargs):
+    component_catalog.invalidate()
+    transaction.on_commit(component_catalog.invalidate)
+
+
+@receiver(m2m_changed, sender=Component.component_types.through, dispatch_uid='component_catalog_types')
+@receiver(m2m_changed, sender=Component.add_on_products.through, dispatch_uid='component_catalog_add_ons')
+def component_links_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_component_catalog()
+
+
+@receiver(pre_delete, sender=Checklist, dispatch_uid='analytics_checklist_deleted')
+def checklist_deleted(sender, instance, **kwargs):
+    """
+    Deleting a Checklist cascades to its tasks and issues outside of their tracked
+    write paths, so take them off the analytics summaries up front.
+
+    An archived checklist keeps counting through its ArchivedChecklist, which
+    archive_batch writes before deleting the checklist, so it is left alone.
+    """
+    if ArchivedChecklist.objects.filter(checklist_id=instance.pk).exists():
+        return
+    changes = [
+        TaskChange(instance.pk, status, None, component_id, group)
+        for status, component_id, group in ChecklistTask.objects.filter(checklist=instance).values_list(
+            'status', 'component_id', 'group'
+        )
+    ]
+    ComponentStatusSummary.record_deltas(status_deltas(changes, 'component_id'))
+    ComponentTypeStatusSummary.record_deltas(status_deltas(changes, 'group'))
+
+    generation_id, customer_id = Platform.objects.values_list('product_generation_id', 'customer_id').get(
+        pk=instance.platform_id
+    )
+    if instance.completed_on is not None:
+        GenerationCompletionSummary.record(generation_id, instance.completion_time(), sign=-1)
+    open_issues = instance.issues.filter(resolved_on__isnull=True).count()
+    if open_issues:
+        CustomerIssueSummary.record(customer_id, -open_issues)
+
+
+@receiver(pre_delete, sender=ArchivedChecklist, dispatch_uid='analytics_archive_deleted')
+def archived_checklist_deleted(sender, instance, **kwargs):
+    """
+    Archived checklists count towards the analytics summaries, so deleting one
+    takes it off them just like deleting a live Checklist.
+    """
+    changes = [
+        TaskChange(instance.checklist_id, task.status, None, task.component_id, task.group)
+        for task in instance.tasks()
+    ]
+    component_deltas = status_deltas(changes, 'component_id')
+    existing = set(ComponentStatusSummary.existing_keys(component_deltas))
+    ComponentStatusSummary.record_deltas({key: delta for key, delta in component_deltas.items() if key in existing})
+    ComponentTypeStatusSummary.record_deltas(status_deltas(changes, 'group'))
+
+    generation_id = Platform.objects.filter(pk=instance.platform_id).values_list(
+        'product_generation_id', flat=True
+    ).first()
+    GenerationCompletionSummary.record(generation_id, instance.completion_time(), sign=-1)
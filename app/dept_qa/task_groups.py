@@ -0,0 +1,57 @@
+def build_task_groups(tasks):
+    """
+    Groups ChecklistTasks by their snapshotted Component Type and flattens each group into indented rows.
+    """
+    # Organize tasks by their Component Types
+    component_type_groups = {}
+
+    # Tasks not associated with any Component Type
+    general_tasks = []
+
+    for task_obj in tasks:
+        if task_obj.group:
+            component_type_groups.setdefault(task_obj.group, []).append(task_obj)
+        else:
+            general_tasks.append(task_obj)
+
+    # Build task trees for each group
+    for ct_name, task_list in component_type_groups.items():
+        component_type_groups[ct_name] = build_task_tree(task_list)
+
+    # Build task tree for general tasks
+    general_task_tree = build_task_tree(general_tasks)
+
+    return {
+        'component_type_groups': component_type_groups,
+        'general_tasks': general_task_tree,
+    }
+
+
+def build_task_tree(tasks):
+    """
+    Flattens a path-ordered list of ChecklistTask objects into display rows.
+
+    Each row's level counts the task's ancestors present in the same list, so
+    a subtask whose parent lives in another group is shown rather than dropped.
+    """
+    rows = []
+    ancestor_paths = []
+    for task_obj in tasks:
+        path = task_obj.path
+        while ancestor_paths and not path.startswith(ancestor_paths[-1]):
+            ancestor_paths.pop()
+        rows.append({'task': task_obj, 'level': len(ancestor_paths)})
+        ancestor_paths.append(path)
+
+    return rows
+
+
+def build_sections(tasks):
+    """
+    Returns the (name, rows) sections of a checklist, with the General section last.
+    """
+    task_groups = build_task_groups(tasks)
+    sections = list(task_groups['component_type_groups'].items())
+    if task_groups['general_tasks']:
+        sections.append(('General', task_groups['general_tasks']))
+    return sections
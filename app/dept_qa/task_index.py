@@ -0,0 +1,96 @@
+from collections import defaultdict
+
+from app.core.models import Component
+from app.core.snapshots import VersionedSnapshot
+from .models import Task
+
+
+class TaskIndex:
+    """
+    In-memory view of which tasks apply to which components and product generations.
+    """
+
+    def __init__(self, component_tasks, generation_tasks, task_meta, task_snapshots, component_groups):
+        # Component id -> ids of the tasks linked to that component
+        self.component_tasks = component_tasks
+        # Product generation id -> ids of the generation tasks not tied to any component
+        self.generation_tasks = generation_tasks
+        # Task id -> (order, parent task id)
+        self.task_meta = task_meta
+        # Task id -> (name, path), copied onto new ChecklistTasks
+        self.task_snapshots = task_snapshots
+        # Component id -> the Component Type group of the tasks it brings into a checklist
+        self.component_groups = component_groups
+
+    @classmethod
+    def build(cls):
+        task_rows = Task.objects.values_list('id', 'order', 'parent_task_id', 'name', 'path')
+        task_meta = {}
+        task_snapshots = {}
+        for task_id, order, parent_id, name, path in task_rows:
+            task_meta[task_id] = (order, parent_id)
+            task_snapshots[task_id] = (name, path)
+
+        # A component's tasks are grouped under its first Component Type by name
+        component_groups = {}
+        type_pairs = Component.component_types.through.objects.values_list('component_id', 'componenttype__name')
+        for component_id, type_name in type_pairs:
+            if component_id not in component_groups or type_name < component_groups[component_id]:
+                component_groups[component_id] = type_name
+
+        component_tasks = defaultdict(set)
+        for task_id, component_id in Task.components.through.objects.values_list('task_id', 'component_id'):
+            component_tasks[component_id].add(task_id)
+        tasks_with_components = set().union(*component_tasks.values())
+
+        generation_tasks = defaultdict(set)
+        generation_pairs = Task.product_generations.through.objects.values_list('task_id', 'productgeneration_id')
+        for task_id, generation_id in generation_pairs:
+            if task_id not in tasks_with_components:
+                generation_tasks[generation_id].add(task_id)
+
+        return cls(
+            component_tasks={key: frozenset(value) for key, value in component_tasks.items()},
+            generation_tasks={key: frozenset(value) for key, value in generation_tasks.items()},
+            task_meta=task_meta,
+            task_snapshots=task_snapshots,
+            component_groups=component_groups,
+        )
+
+    def resolve(self, generation_id, component_ids):
+        """
+        Returns the ids of the tasks that apply to a platform, ordered by Task.order.
+        """
+        task_ids = set(self.generation_tasks.get(generation_id, ()))
+        for component_id in component_ids:
+            task_ids |= self.component_tasks.get(component_id, frozenset())
+        return sorted(task_ids, key=lambda task_id: (self.task_meta[task_id][0], task_id))
+
+    def parent_id(self, task_id):
+        return self.task_meta[task_id][1]
+
+    def snapshot(self, task_id, component_ids=()):
+        """
+        Returns the ChecklistTask snapshot fields of a task on a platform with ``component_ids``.
+
+        The task is attributed to the first of those components (by id) it is linked to,
+        and grouped under that component's Component Type.
+        """
+        name, path = self.task_snapshots[task_id]
+        component_id = next(
+            (
+                component_id for component_id in sorted(component_ids)
+                if task_id in self.component_tasks.get(component_id, ())
+            ),
+            None,
+        )
+        return {
+            'name': name,
+            'order': self.task_meta[task_id][0],
+            'path': path,
+            'group': self.component_groups.get(component_id, ''),
+            'component_id': component_id,
+        }
+
+
+task_index = VersionedSnapshot('dept_qa.task_index', TaskIndex.build)
@@ -1,7 +1,101 @@
-from django.test import TestCase
+import csv
+import json
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import Future
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, models
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.db.utils import IntegrityError
-from app.core.models import Platform, Component, ProductGeneration, ProductLine, Customer
-from .models import Task, Checklist, ChecklistTask, IssueResolution
+from django.http import QueryDict
+from django.urls import reverse
+from django.utils import timezone
+from app.core.models import AddOnProduct, Platform, Component, ComponentType, ProductGeneration, ProductLine, Customer
+from . import benchmark, pdf
+from .batch_generation import ChecklistBatchGenerator, parse_presets
+from .catalog import component_catalog
+from .catalog_import import CatalogImporter, read_records
+from .archive import archive_batch
+from .export import stream_export, task_results
+from .forms import PlatformSelectionForm
+from .models import (
+    ArchivedChecklist, Task, Checklist, ChecklistTask, IssueResolution, ComponentStatusSummary, ComponentTypeStatusSummary,
+    CustomerIssueSummary, GenerationCompletionSummary,
+)
+from .resync import ChecklistResync
+from .services import apply_task_updates, generate_checklist, resolve_task_ids
+from .task_index import task_index
+from .task_groups import build_task_groups, build_task_tree
+from .views import ChecklistListView, ChecklistTaskAutosaveView
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+class TaskHierarchyTest(TestCase):
+    def setUp(self):
+        self.root = Task.objects.create(name='Root', order=2)
+        self.child = Task.objects.create(name='Child', order=1, parent_task=self.root)
+        self.grandchild = Task.objects.create(name='Grandchild', order=1, parent_task=self.child)
+        self.other_root = Task.objects.create(name='Other Root', order=1)
+
+    def test_paths_and_depth(self):
+        self.assertEqual(self.root.depth, 0)
+        self.assertEqual(self.grandchild.depth, 2)
+        self.assertTrue(self.grandchild.path.startswith(self.child.path))
+        self.assertTrue(self.child.path.startswith(self.root.path))
+
+    def test_subtree_in_one_ordered_query(self):
+        with self.assertNumQueries(1):
+            names = [task.name for task in self.root.subtree()]
+        self.assertEqual(names, ['Root', 'Child', 'Grandchild'])
+        self.assertEqual(
+            list(Task.objects.order_by('path').values_list('name', flat=True)),
+            ['Other Root', 'Root', 'Child', 'Grandchild'],
+        )
+
+    def test_move_subtree(self):
+        self.child.parent_task = self.other_root
+        self.child.save()
+        self.grandchild.refresh_from_db()
+        self.assertTrue(self.grandchild.path.startswith(self.other_root.path))
+        self.assertEqual(self.grandchild.depth, 2)
+        self.assertEqual([task.name for task in self.other_root.subtree()], ['Other Root', 'Child', 'Grandchild'])
+
+    def test_reorder_moves_descendants(self):
+        self.root.order = 0
+        self.root.save()
+        self.assertEqual(
+            list(Task.objects.order_by('path').values_list('name', flat=True)),
+            ['Root', 'Child', 'Grandchild', 'Other Root'],
+        )
+
+    def test_cycle_rejected(self):
+        self.root.parent_task = self.grandchild
+        with self.assertRaises(ValidationError):
+            self.root.full_clean()
+        with self.assertRaises(ValueError):
+            self.root.save()
+
+    def test_rebuild_paths(self):
+        expected = dict(Task.objects.values_list('id', 'path'))
+        Task.objects.update(path='', depth=0)
+        call_command('rebuild_task_paths', stdout=StringIO())
+        self.assertEqual(dict(Task.objects.values_list('id', 'path')), expected)
+        self.assertEqual(Task.objects.get(pk=self.grandchild.pk).depth, 2)
+
 
 class TaskModelTest(TestCase):
     def setUp(self):
@@ -83,6 +177,35 @@ class ChecklistTaskModelTest(TestCase):
                 status='Incomplete'
             )
 
+    def test_save_snapshots_task(self):
+        camera_type = ComponentType.objects.create(name='Camera')
+        camera = Component.objects.create(name='Camera Model A')
+        camera.component_types.add(camera_type)
+        self.platform.components.add(camera)
+        subtask = Task.objects.create(name='Check Antenna', order=3, parent_task=self.task)
+        subtask.components.add(camera)
+
+        parent_row = ChecklistTask.objects.create(checklist=self.checklist, task=self.task)
+        checklist_task = ChecklistTask.objects.create(checklist=self.checklist, task=subtask)
+        self.assertEqual(
+            (checklist_task.name, checklist_task.order, checklist_task.path, checklist_task.group),
+            ('Check Antenna', 3, subtask.path, 'Camera'),
+        )
+        self.assertEqual(checklist_task.parent, parent_row)
+
+    def test_snapshot_command_backfills_rows(self):
+        subtask = Task.objects.create(name='Check Antenna', order=3, parent_task=self.task)
+        rows = ChecklistTask.objects.bulk_create([
+            ChecklistTask(checklist=self.checklist, task=task) for task in (self.task, subtask)
+        ])
+        ChecklistTask.objects.filter(pk__in=[row.pk for row in rows]).update(name='', path='')
+
+        call_command('snapshot_checklist_tasks', stdout=StringIO())
+        parent_row, subtask_row = ChecklistTask.objects.filter(checklist=self.checklist).order_by('path')
+        self.assertEqual((parent_row.name, subtask_row.name), ('Test GPS Functionality', 'Check Antenna'))
+        self.assertEqual(subtask_row.parent, parent_row)
+
+
 class IssueResolutionModelTest(TestCase):
     def setUp(self):
         self.customer = Customer.objects.create(name='Test Agency', timezone='UTC')
@@ -106,3 +229,1699 @@ class IssueResolutionModelTest(TestCase):
         self.assertIsNotNone(issue.reported_on)
         self.assertIsNone(issue.resolved_on)
         self.assertEqual(str(issue), f"Issue on IRIS200 - Reported on {issue.reported_on.strftime('%Y-%m-%d')}")
+
+
+class GenerateChecklistServiceTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=self.product_line, generation_number='1')
+        self.other_generation = ProductGeneration.objects.create(product_line=self.product_line, generation_number='2')
+        self.camera = Component.objects.create(name='Camera Model A')
+        self.radio = Component.objects.create(name='Mesh Radio')
+
+        self.camera_task = Task.objects.create(name='Test Camera', order=2)
+        self.camera_task.components.add(self.camera)
+        self.radio_task = Task.objects.create(name='Test Radio', order=3)
+        self.radio_task.components.add(self.radio)
+        self.generation_task = Task.objects.create(name='Inspect Wiring', order=1)
+        self.generation_task.product_generations.add(self.generation)
+        self.other_generation_task = Task.objects.create(name='Inspect Gen 2 Wiring', order=1)
+        self.other_generation_task.product_generations.add(self.other_generation)
+
+    def test_resolve_task_ids(self):
+        task_ids = resolve_task_ids(self.generation, [self.camera.id])
+        self.assertEqual(task_ids, [self.generation_task.id, self.camera_task.id])
+
+    def test_generate_checklist(self):
+        checklist = generate_checklist(
+            iris_number='IRIS300',
+            product_generation=self.generation,
+            customer_name='Test Agency',
+            component_ids=[self.camera.id],
+            customer_presets=[{'preset': '1', 'channel': 'A'}],
+        )
+        platform = checklist.platform
+        self.assertEqual(platform.customer.name, 'Test Agency')
+        self.assertEqual(platform.customer_presets, [{'preset': '1', 'channel': 'A'}])
+        self.assertEqual(list(platform.components.all()), [self.camera])
+        self.assertEqual(
+            set(checklist.tasks.values_list('task_id', flat=True)),
+            {self.generation_task.id, self.camera_task.id},
+        )
+
+    def test_generate_checklist_snapshots_tasks(self):
+        camera_type = ComponentType.objects.create(name='Camera')
+        self.camera.component_types.add(camera_type)
+        subtask = Task.objects.create(name='Check Lens', order=1, parent_task=self.camera_task)
+        subtask.components.add(self.camera)
+
+        checklist = generate_checklist(
+            iris_number='IRIS300',
+            product_generation=self.generation,
+            customer_name='Test Agency',
+            component_ids=[self.camera.id],
+        )
+        rows = {row.task_id: row for row in checklist.tasks.all()}
+        self.assertEqual((rows[subtask.id].name, rows[subtask.id].group), ('Check Lens', 'Camera'))
+        self.assertEqual(rows[subtask.id].parent, rows[self.camera_task.id])
+        self.assertEqual(rows[self.generation_task.id].group, '')
+
+        # Later catalog edits do not reach the generated checklist
+        self.camera_task.name = 'Renamed'
+        self.camera_task.save()
+        rows[self.camera_task.id].refresh_from_db()
+        self.assertEqual(rows[self.camera_task.id].name, 'Test Camera')
+
+    def test_generate_checklist_updates_existing_platform(self):
+        customer = Customer.objects.create(name='Old Agency')
+        Platform.objects.create(iris_number='IRIS300', product_generation=self.other_generation, customer=customer)
+        checklist = generate_checklist(
+            iris_number='IRIS300',
+            product_generation=self.generation,
+            customer_name='Test Agency',
+            component_ids=[self.radio.id],
+        )
+        checklist.platform.refresh_from_db()
+        self.assertEqual(checklist.platform.product_generation, self.generation)
+        self.assertEqual(checklist.platform.customer.name, 'Test Agency')
+        self.assertEqual(checklist.tasks.count(), 2)
+
+    def test_query_budget_is_independent_of_task_count(self):
+        for i in range(50):
+            task = Task.objects.create(name=f'Camera Check {i}', order=10 + i)
+            task.components.add(self.camera)
+        task_index.get()
+
+        # Includes creating the three analytics summary rows (camera, radio, General) on first use
+        with self.assertNumQueries(24):
+            checklist = generate_checklist(
+                iris_number='IRIS300',
+                product_generation=self.generation,
+                customer_name='Test Agency',
+                component_ids=[self.camera.id, self.radio.id],
+            )
+        self.assertEqual(checklist.tasks.count(), 53)
+
+    def test_failure_rolls_back_checklist(self):
+        with mock.patch.object(ChecklistTask.objects, 'bulk_create', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                generate_checklist(
+                    iris_number='IRIS300',
+                    product_generation=self.generation,
+                    customer_name='Test Agency',
+                    component_ids=[self.camera.id],
+                )
+        self.assertFalse(Platform.objects.filter(iris_number='IRIS300').exists())
+        self.assertFalse(Checklist.objects.exists())
+
+
+class TaskIndexTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=self.product_line, generation_number='1')
+        self.camera = Component.objects.create(name='Camera Model A')
+        self.camera_task = Task.objects.create(name='Test Camera', order=2)
+        self.camera_task.components.add(self.camera)
+        self.camera_subtask = Task.objects.create(name='Check Focus', order=3, parent_task=self.camera_task)
+        self.camera_subtask.components.add(self.camera)
+        self.generation_task = Task.objects.create(name='Inspect Wiring', order=1)
+        self.generation_task.product_generations.add(self.generation)
+
+    def test_resolve_in_memory(self):
+        index = task_index.get()
+        with self.assertNumQueries(0):
+            task_ids = index.resolve(self.generation.id, [self.camera.id])
+            index = task_index.get()
+        self.assertEqual(task_ids, [self.generation_task.id, self.camera_task.id, self.camera_subtask.id])
+        self.assertEqual(index.parent_id(self.camera_subtask.id), self.camera_task.id)
+
+    def test_component_linked_generation_task_is_not_generation_only(self):
+        self.camera_task.product_generations.add(self.generation)
+        self.assertEqual(task_index.get().resolve(self.generation.id, []), [self.generation_task.id])
+
+    def test_snapshot_group_follows_the_attributed_component(self):
+        # The task is shared by a Camera and a Radio component; the Radio type sorts first by name
+        self.camera.component_types.add(ComponentType.objects.create(name='Video'))
+        radio = Component.objects.create(name='Mesh Radio')
+        radio.component_types.add(ComponentType.objects.create(name='Radio'))
+        self.camera_task.components.add(radio)
+
+        index = task_index.get()
+        self.assertEqual(index.snapshot(self.camera_task.id, [radio.id])['group'], 'Radio')
+        self.assertEqual(index.snapshot(self.camera_task.id, [self.camera.id])['group'], 'Video')
+        both = index.snapshot(self.camera_task.id, [radio.id, self.camera.id])
+        self.assertEqual((both['component_id'], both['group']), (self.camera.id, 'Video'))
+        self.assertEqual(index.snapshot(self.generation_task.id, [self.camera.id])['group'], '')
+
+    def test_invalidated_by_task_save(self):
+        task_index.get()
+        new_task = Task.objects.create(name='Inspect Antenna', order=4)
+        new_task.product_generations.add(self.generation)
+        self.assertIn(new_task.id, task_index.get().resolve(self.generation.id, []))
+
+    def test_invalidated_by_m2m_change(self):
+        task_index.get()
+        self.camera.tasks.remove(self.camera_task)
+        self.assertNotIn(self.camera_task.id, task_index.get().resolve(self.generation.id, [self.camera.id]))
+
+    def test_invalidated_by_component_delete(self):
+        task_index.get()
+        self.camera.delete()
+        self.assertEqual(task_index.get().component_tasks, {})
+
+
+class ComponentCatalogTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.camera_type = ComponentType.objects.create(name='Cameras')
+        self.radio_type = ComponentType.objects.create(name='Radios')
+        self.camera_b = Component.objects.create(name='Camera B')
+        self.camera_a = Component.objects.create(name='Camera A')
+        self.radio = Component.objects.create(name='Mesh Radio')
+        self.camera_a.component_types.add(self.camera_type)
+        self.camera_b.component_types.add(self.camera_type)
+        self.radio.component_types.add(self.radio_type, self.camera_type)
+        self.add_on = AddOnProduct.objects.create(name='Mesh Package')
+        self.radio.add_on_products.add(self.add_on)
+
+    def test_built_in_one_query(self):
+        with self.assertNumQueries(1):
+            catalog = component_catalog.get()
+        self.assertEqual(
+            [(component_type.name, [component.name for component in components])
+             for component_type, components in catalog.groups.items()],
+            [('Cameras', ['Camera A', 'Camera B', 'Mesh Radio']), ('Radios', ['Mesh Radio'])],
+        )
+        self.assertEqual(catalog.choices, [(self.camera_a.id, 'Camera A'), (self.camera_b.id, 'Camera B')])
+
+    def test_invalidated_by_catalog_changes(self):
+        component_catalog.get()
+        self.radio.add_on_products.remove(self.add_on)
+        self.assertIn((self.radio.id, 'Mesh Radio'), component_catalog.get().choices)
+        self.camera_type.delete()
+        self.assertEqual([ct.name for ct in component_catalog.get().groups], ['Radios'])
+
+    def test_form_validates_components_without_queries(self):
+        component_catalog.get()
+        form = PlatformSelectionForm(data={'components': [str(self.camera_a.id), str(self.radio.id)]})
+        with self.assertNumQueries(0):
+            form.fields['components'].clean([str(self.camera_a.id)])
+        self.assertFalse(form.is_valid())
+        self.assertIn('components', form.errors)
+
+
+class PlatformSelectionFormTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=self.product_line, generation_number='1')
+        self.other_generation = ProductGeneration.objects.create(product_line=self.product_line, generation_number='2')
+        self.customer = Customer.objects.create(name='Test Agency')
+        self.platform = Platform.objects.create(
+            iris_number='IRIS200',
+            product_generation=self.generation,
+            customer=self.customer
+        )
+        component_catalog.get()
+
+    def form(self, **overrides):
+        data = {
+            'iris_number': 'IRIS200',
+            'product_generation': self.generation.id,
+            'customer': 'Test Agency',
+        }
+        data.update(overrides)
+        return PlatformSelectionForm(data=data)
+
+    def test_clean_is_read_only_and_single_query(self):
+        form = self.form(customer='New Agency', iris_number='IRIS300')
+        # One query for the product generation choice, one for the platform check
+        with self.assertNumQueries(2):
+            self.assertTrue(form.is_valid())
+        self.assertFalse(Customer.objects.filter(name='New Agency').exists())
+
+    def test_existing_platform_must_match(self):
+        form = self.form(customer='Other Agency')
+        self.assertFalse(form.is_valid())
+        self.assertIn('different product generation or customer', form.errors['iris_number'][0])
+        self.assertFalse(Customer.objects.filter(name='Other Agency').exists())
+
+        form = self.form(product_generation=self.other_generation.id)
+        self.assertFalse(form.is_valid())
+
+    def test_existing_checklist_rejected(self):
+        self.assertTrue(self.form().is_valid())
+        Checklist.objects.create(platform=self.platform)
+        form = self.form()
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['iris_number'], ['A checklist already exists for this platform.'])
+
+
+class GenerateChecklistViewTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=self.product_line, generation_number='1')
+        self.camera_type = ComponentType.objects.create(name='Camera')
+        self.camera = Component.objects.create(name='Camera Model A')
+        self.camera.component_types.add(self.camera_type)
+        self.camera_task = Task.objects.create(name='Test Camera', order=1)
+        self.camera_task.components.add(self.camera)
+
+    def post_data(self, **overrides):
+        data = {
+            'iris_number': 'IRIS300',
+            'product_generation': self.generation.id,
+            'customer': 'Test Agency',
+            'components': [self.camera.id],
+            'form-TOTAL_FORMS': '1',
+            'form-INITIAL_FORMS': '0',
+            'form-0-preset': 'Preset 1',
+            'form-0-channel': 'Channel A',
+        }
+        data.update(overrides)
+        return data
+
+    def test_post_generates_checklist(self):
+        response = self.client.post(reverse('dept_qa:generate_checklist'), self.post_data())
+        self.assertRedirects(
+            response,
+            reverse('dept_qa:checklist_detail', kwargs={'iris_number': 'IRIS300'}),
+            fetch_redirect_response=False,
+        )
+        checklist = Checklist.objects.get(platform__iris_number='IRIS300')
+        self.assertEqual(checklist.platform.customer_presets, [{'preset': 'Preset 1', 'channel': 'Channel A'}])
+        self.assertEqual(list(checklist.tasks.values_list('task_id', flat=True)), [self.camera_task.id])
+
+    def test_get_renders_catalog(self):
+        component_catalog.get()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('dept_qa:generate_checklist'))
+        self.assertContains(response, 'Camera Model A')
+
+    def test_invalid_post_rerenders_catalog(self):
+        response = self.client.post(reverse('dept_qa:generate_checklist'), self.post_data(iris_number=''))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Camera Model A')
+        self.assertFalse(Checklist.objects.exists())
+
+
+class ChecklistDetailViewTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.customer = Customer.objects.create(name='Test Agency', timezone='UTC')
+        self.product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=self.product_line, generation_number='1')
+        self.platform = Platform.objects.create(
+            iris_number='IRIS200',
+            product_generation=self.generation,
+            customer=self.customer
+        )
+        self.checklist = Checklist.objects.create(platform=self.platform)
+        self.camera_type = ComponentType.objects.create(name='Camera')
+        self.camera = Component.objects.create(name='Camera Model A')
+        self.camera.component_types.add(self.camera_type)
+        self.platform.components.add(self.camera)
+        self.url = reverse('dept_qa:checklist_detail', kwargs={'iris_number': 'IRIS200'})
+
+    def add_tasks(self, count):
+        for i in range(count):
+            parent = Task.objects.create(name=f'Camera Check {i}', order=i)
+            parent.components.add(self.camera)
+            subtask = Task.objects.create(name=f'Camera Subcheck {i}', order=i, parent_task=parent)
+            subtask.components.add(self.camera)
+            general = Task.objects.create(name=f'General Check {i}', order=i)
+            for task in (parent, subtask, general):
+                ChecklistTask.objects.create(checklist=self.checklist, task=task)
+
+    def count_get_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response
+
+    def test_get_groups_tasks(self):
+        self.add_tasks(1)
+        tasks = ChecklistTask.objects.filter(checklist=self.checklist).order_by('path')
+        task_groups = build_task_groups(tasks)
+        camera_rows = task_groups['component_type_groups']['Camera']
+        self.assertEqual(
+            [(row['task'].name, row['level']) for row in camera_rows],
+            [('Camera Check 0', 0), ('Camera Subcheck 0', 1)],
+        )
+        self.assertEqual(task_groups['general_tasks'][0]['task'].name, 'General Check 0')
+
+    def test_get_keeps_subtask_of_parent_in_another_group(self):
+        parent = Task.objects.create(name='Camera Check', order=1)
+        parent.components.add(self.camera)
+        subtask = Task.objects.create(name='Label Cable', order=1, parent_task=parent)
+        for task in (parent, subtask):
+            ChecklistTask.objects.create(checklist=self.checklist, task=task)
+        tasks = ChecklistTask.objects.filter(checklist=self.checklist).order_by('path')
+        general_rows = build_task_groups(tasks)['general_tasks']
+        self.assertEqual([(row['task'].name, row['level']) for row in general_rows], [('Label Cable', 0)])
+
+    def get_section(self, group):
+        url = reverse('dept_qa:checklist_section', kwargs={'iris_number': 'IRIS200'})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'group': group})
+        self.assertEqual(response.status_code, 200)
+        return context.captured_queries, response
+
+    def test_get_query_count_is_independent_of_checklist_size(self):
+        self.add_tasks(2)
+        small_count, _ = self.count_get_queries()
+        self.add_tasks(20)
+        large_count, _ = self.count_get_queries()
+        self.assertEqual(small_count, large_count)
+        self.assertLessEqual(large_count, 5)
+
+    def test_get_renders_section_outline_without_tasks(self):
+        self.add_tasks(3)
+        _, response = self.count_get_queries()
+        self.assertEqual(response.context['sections'], [
+            {'name': 'Camera', 'group': 'Camera', 'task_count': 6},
+            {'name': 'General', 'group': '', 'task_count': 3},
+        ])
+        self.assertContains(response, '?group=Camera')
+        self.assertNotContains(response, 'Camera Subcheck 2')
+
+    def test_get_serves_cached_outline(self):
+        self.add_tasks(3)
+        first_count, first_response = self.count_get_queries()
+        cached_count, cached_response = self.count_get_queries()
+        self.assertLess(cached_count, first_count)
+        self.assertEqual(cached_count, 1)
+        self.assertEqual(cached_response.context['sections'], first_response.context['sections'])
+
+    def test_section_renders_only_its_own_tasks(self):
+        self.add_tasks(3)
+        queries, response = self.get_section('Camera')
+        self.assertContains(response, 'Camera Subcheck 2')
+        self.assertNotContains(response, 'General Check')
+        # The outline aggregate, then the rows of this section only
+        task_queries = [query['sql'] for query in queries if 'dept_qa_checklisttask' in query['sql']]
+        self.assertEqual(len(task_queries), 2)
+        self.assertIn('"group" = ', task_queries[1])
+
+        _, response = self.get_section('')
+        self.assertContains(response, 'General Check 2')
+        self.assertNotContains(response, 'Camera Check')
+
+    def test_section_query_count_is_independent_of_checklist_size(self):
+        self.add_tasks(2)
+        small_queries, _ = self.get_section('Camera')
+        self.add_tasks(20)
+        large_queries, _ = self.get_section('Camera')
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertLessEqual(len(large_queries), 3)
+
+    def test_section_is_cached(self):
+        self.add_tasks(3)
+        _, first_response = self.get_section('Camera')
+        queries, cached_response = self.get_section('Camera')
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(cached_response.content, first_response.content)
+
+    def test_unknown_section_is_not_cached(self):
+        self.add_tasks(1)
+        url = reverse('dept_qa:checklist_section', kwargs={'iris_number': 'IRIS200'})
+        fragment_cache = caches[settings.CHECKLIST_FRAGMENT_CACHE]
+        with mock.patch.object(fragment_cache, 'set', wraps=fragment_cache.set) as cache_set:
+            response = self.client.get(url, {'group': 'No Such Type'})
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse([call for call in cache_set.call_args_list if ':section:' in call.args[0]])
+
+    def test_task_write_invalidates_cached_sections(self):
+        self.add_tasks(1)
+        self.get_section('')
+        checklist_task = self.checklist.tasks.get(name='General Check 0')
+        checklist_task.notes = 'Loose connector'
+        checklist_task.save()
+        _, response = self.get_section('')
+        self.assertContains(response, 'Loose connector')
+
+    def test_catalog_change_leaves_checklist_unchanged(self):
+        self.add_tasks(1)
+        self.get_section('')
+        task = Task.objects.get(name='General Check 0')
+        task.name = 'Inspect Harness'
+        task.save()
+        clear_caches()
+        _, response = self.get_section('')
+        self.assertContains(response, 'General Check 0')
+        self.assertNotContains(response, 'Inspect Harness')
+
+    def post_all(self, **overrides):
+        data = {}
+        for checklist_task in self.checklist.tasks.all():
+            data[f'status_{checklist_task.id}'] = checklist_task.status
+            data[f'notes_{checklist_task.id}'] = checklist_task.notes or ''
+        data.update(overrides)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, data)
+        self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        return [query['sql'] for query in context.captured_queries]
+
+    def test_post_unchanged_writes_nothing(self):
+        self.add_tasks(5)
+        queries = self.post_all()
+        self.assertFalse([sql for sql in queries if sql.startswith('UPDATE')])
+
+    def test_post_writes_changed_rows_in_one_update(self):
+        self.add_tasks(5)
+        first, second = self.checklist.tasks.all()[:2]
+        queries = self.post_all(**{
+            f'status_{first.id}': 'Failed',
+            f'notes_{second.id}': 'Loose connector',
+        })
+        self.assertEqual(len([sql for sql in queries if sql.startswith('UPDATE "dept_qa_checklisttask"')]), 1)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, 'Failed')
+        self.assertEqual(second.notes, 'Loose connector')
+
+    def test_post_ignores_invalid_status(self):
+        self.add_tasks(1)
+        checklist_task = self.checklist.tasks.first()
+        self.post_all(**{f'status_{checklist_task.id}': 'Bogus'})
+        checklist_task.refresh_from_db()
+        self.assertEqual(checklist_task.status, 'Incomplete')
+
+    def test_post_stamps_and_clears_completed_on(self):
+        self.add_tasks(1)
+        ids = list(self.checklist.tasks.values_list('id', flat=True))
+        self.post_all(**{f'status_{task_id}': 'Complete' for task_id in ids})
+        self.checklist.refresh_from_db()
+        self.assertIsNotNone(self.checklist.completed_on)
+
+        self.post_all(**{f'status_{ids[0]}': 'Failed'})
+        self.checklist.refresh_from_db()
+        self.assertIsNone(self.checklist.completed_on)
+
+
+class ChecklistListViewTest(TestCase):
+    def setUp(self):
+        self.product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=self.product_line, generation_number='1')
+        self.other_generation = ProductGeneration.objects.create(product_line=self.product_line, generation_number='2')
+        self.springfield = Customer.objects.create(name='Springfield Police Department', timezone='UTC')
+        self.salem = Customer.objects.create(name='Salem Fire Rescue', timezone='UTC')
+        self.url = reverse('dept_qa:checklist_list')
+
+    def create_checklist(self, iris_number, created_on, customer=None, generation=None, **fields):
+        platform = Platform.objects.create(
+            iris_number=iris_number,
+            product_generation=generation or self.generation,
+            customer=customer or self.springfield,
+        )
+        checklist = Checklist.objects.create(platform=platform)
+        # created_on is auto_now_add, so move it afterwards
+        Checklist.objects.filter(pk=checklist.pk).update(created_on=created_on, **fields)
+        return checklist
+
+    def listed(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [checklist.platform.iris_number for checklist in response.context['checklists']], response
+
+    def test_lists_newest_first(self):
+        now = timezone.now()
+        self.create_checklist('100', now - timezone.timedelta(days=2))
+        self.create_checklist('101', now)
+        self.create_checklist('102', now - timezone.timedelta(days=1))
+        iris_numbers, response = self.listed()
+        self.assertEqual(iris_numbers, ['101', '102', '100'])
+        self.assertIsNone(response.context['next_query'])
+
+    def test_keyset_pages_cover_every_checklist_once(self):
+        # Equal timestamps are ordered by id, so ties never repeat or skip rows
+        now = timezone.now()
+        for i in range(7):
+            self.create_checklist(f'{200 + i}', now - timezone.timedelta(hours=i // 2))
+        with mock.patch.object(ChecklistListView.paginator, 'per_page', 3):
+            seen = []
+            params = {}
+            while True:
+                iris_numbers, response = self.listed(**params)
+                seen.extend(iris_numbers)
+                if response.context['next_query'] is None:
+                    break
+                params = dict(QueryDict(response.context['next_query']).items())
+        self.assertEqual(seen, ['201', '200', '203', '202', '205', '204', '206'])
+
+    def test_page_query_count_is_independent_of_depth(self):
+        now = timezone.now()
+        for i in range(12):
+            self.create_checklist(f'{300 + i}', now - timezone.timedelta(minutes=i))
+        with mock.patch.object(ChecklistListView.paginator, 'per_page', 5):
+            with CaptureQueriesContext(connection) as first:
+                response = self.client.get(self.url)
+            next_query = response.context['next_query']
+            with CaptureQueriesContext(connection) as second:
+                response = self.client.get(f'{self.url}?{next_query}')
+        self.assertEqual(len(first.captured_queries), len(second.captured_queries))
+        self.assertNotIn('OFFSET', second.captured_queries[-1]['sql'])
+        self.assertEqual(
+            [checklist.platform.iris_number for checklist in response.context['checklists']],
+            [f'{300 + i}' for i in range(5, 10)],
+        )
+
+    def test_invalid_cursor_starts_from_first_page(self):
+        self.create_checklist('400', timezone.now())
+        iris_numbers, _ = self.listed(after='not-a-cursor')
+        self.assertEqual(iris_numbers, ['400'])
+
+    def test_filters(self):
+        now = timezone.now()
+        self.create_checklist('500', now, completed_on=now)
+        self.create_checklist('501', now - timezone.timedelta(days=3), customer=self.salem, failed_tasks=2)
+        self.create_checklist('502', now - timezone.timedelta(days=10), generation=self.other_generation)
+
+        self.assertEqual(self.listed(customer='salem')[0], ['501'])
+        self.assertEqual(self.listed(iris_number='50')[0], ['500', '501', '502'])
+        self.assertEqual(self.listed(iris_number='502')[0], ['502'])
+        self.assertEqual(self.listed(product_generation=self.other_generation.pk)[0], ['502'])
+        self.assertEqual(self.listed(status='complete')[0], ['500'])
+        self.assertEqual(self.listed(status='failed')[0], ['501'])
+        self.assertEqual(self.listed(status='open')[0], ['501', '502'])
+
+        today = timezone.localdate()
+        week_ago = today - timezone.timedelta(days=7)
+        self.assertEqual(self.listed(created_from=week_ago.isoformat())[0], ['500', '501'])
+        self.assertEqual(self.listed(created_to=week_ago.isoformat())[0], ['502'])
+
+    def test_invalid_filters_list_nothing(self):
+        self.create_checklist('600', timezone.now())
+        iris_numbers, response = self.listed(created_from='2024-05-02', created_to='2024-05-01')
+        self.assertEqual(iris_numbers, [])
+        self.assertIn('created_to', response.context['form'].errors)
+
+
+class ChecklistProgressCounterTest(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name='Test Agency', timezone='UTC')
+        self.product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=self.product_line, generation_number='1')
+        self.platform = Platform.objects.create(
+            iris_number='IRIS200',
+            product_generation=self.generation,
+            customer=self.customer
+        )
+        self.checklist = Checklist.objects.create(platform=self.platform)
+        self.tasks = [Task.objects.create(name=f'Task {i}', order=i) for i in range(4)]
+
+    def assertCounters(self, total, complete, failed, incomplete):
+        self.checklist.refresh_from_db()
+        self.assertEqual(
+            [getattr(self.checklist, field) for field in Checklist.PROGRESS_FIELDS],
+            [total, complete, failed, incomplete],
+        )
+        actual = Checklist.objects.with_actual_progress().get(pk=self.checklist.pk)
+        self.assertEqual(
+            [getattr(actual, f'actual_{field}') for field in Checklist.PROGRESS_FIELDS],
+            [total, complete, failed, incomplete],
+        )
+
+    def test_save_and_delete(self):
+        checklist_task = ChecklistTask.objects.create(checklist=self.checklist, task=self.tasks[0])
+        self.assertCounters(1, 0, 0, 1)
+        checklist_task.status = 'Failed'
+        checklist_task.save()
+        self.assertCounters(1, 0, 1, 0)
+        checklist_task.notes = 'Replaced'
+        checklist_task.save(update_fields=['notes'])
+        self.assertCounters(1, 0, 1, 0)
+        checklist_task.delete()
+        self.assertCounters(0, 0, 0, 0)
+
+    def test_bulk_paths(self):
+        checklist_tasks = ChecklistTask.objects.bulk_create([
+            ChecklistTask(checklist=self.checklist, task=task) for task in self.tasks
+        ])
+        self.assertCounters(4, 0, 0, 4)
+
+        checklist_tasks[0].status = 'Complete'
+        checklist_tasks[1].status = 'Failed'
+        ChecklistTask.objects.bulk_update(checklist_tasks, ['status'])
+        self.assertCounters(4, 1, 1, 2)
+
+        ChecklistTask.objects.filter(status='Incomplete').update(status='Complete')
+        self.assertCounters(4, 3, 1, 0)
+        self.assertFalse(self.checklist.is_complete())
+        self.assertEqual(self.checklist.completion_percentage(), 75)
+
+        ChecklistTask.objects.filter(status='Failed').delete()
+        self.assertCounters(3, 3, 0, 0)
+        self.assertTrue(self.checklist.is_complete())
+
+    def test_concurrent_edits_count_from_the_stored_status(self):
+        created = ChecklistTask.objects.create(checklist=self.checklist, task=self.tasks[0])
+        first, second = ChecklistTask.objects.get(pk=created.pk), ChecklistTask.objects.get(pk=created.pk)
+        first.status = 'Complete'
+        first.save()
+        second.status = 'Failed'
+        second.save()
+        self.assertCounters(1, 0, 1, 0)
+
+        first.status = 'Incomplete'
+        ChecklistTask.objects.bulk_update([first], ['status'])
+        second.status = 'Complete'
+        ChecklistTask.objects.bulk_update([second], ['status'])
+        self.assertCounters(1, 1, 0, 0)
+
+    def test_bulk_create_rejects_conflict_handling(self):
+        ChecklistTask.objects.create(checklist=self.checklist, task=self.tasks[0])
+        with self.assertRaisesMessage(ValueError, 'ignore_conflicts'):
+            ChecklistTask.objects.bulk_create([
+                ChecklistTask(checklist=self.checklist, task=task) for task in self.tasks
+            ], ignore_conflicts=True)
+        self.assertCounters(1, 0, 0, 1)
+
+    def test_summary_rows_are_updated_in_key_order(self):
+        other = Checklist.objects.create(platform=self.platform)
+        with CaptureQueriesContext(connection) as context:
+            Checklist.record_task_changes([
+                (other.pk, None, 'Incomplete'), (self.checklist.pk, None, 'Incomplete'),
+            ])
+        updated = [query['sql'] for query in context.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertTrue(updated[0].endswith(f'= {self.checklist.pk}'))
+        self.assertTrue(updated[1].endswith(f'= {other.pk}'))
+
+        with mock.patch('app.dept_qa.models.increment') as increment:
+            ComponentStatusSummary.record_deltas({5: {'total_tasks': 1}, 2: {'total_tasks': 1}})
+        self.assertEqual([call.args[1] for call in increment.call_args_list], [
+            {'component_id': 2}, {'component_id': 5},
+        ])
+
+    def test_task_delete_keeps_checklist_rows(self):
+        ChecklistTask.objects.bulk_create([
+            ChecklistTask(checklist=self.checklist, task=task) for task in self.tasks
+        ])
+        self.tasks[0].delete()
+        self.assertCounters(4, 0, 0, 4)
+        checklist_task = ChecklistTask.objects.get(checklist=self.checklist, name='Task 0')
+        self.assertIsNone(checklist_task.task)
+
+    def test_progress_is_a_column_read(self):
+        ChecklistTask.objects.bulk_create([
+            ChecklistTask(checklist=self.checklist, task=task) for task in self.tasks
+        ])
+        self.checklist.refresh_from_db()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.checklist.completion_percentage(), 0)
+            self.assertFalse(self.checklist.is_complete())
+
+    def test_recompute_command(self):
+        ChecklistTask.objects.bulk_create([
+            ChecklistTask(checklist=self.checklist, task=task) for task in self.tasks
+        ])
+        Checklist.objects.filter(pk=self.checklist.pk).update(total_tasks=0, incomplete_tasks=0)
+
+        with self.assertRaises(CommandError):
+            call_command('recompute_checklist_progress', '--check', stdout=StringIO())
+        call_command('recompute_checklist_progress', stdout=StringIO())
+        self.assertCounters(4, 0, 0, 4)
+        call_command('recompute_checklist_progress', '--check', stdout=StringIO())
+
+    def test_recompute_command_syncs_completion(self):
+        ChecklistTask.objects.bulk_create([
+            ChecklistTask(checklist=self.checklist, task=task, status='Complete') for task in self.tasks
+        ])
+        # Drifted counters that left the checklist open, and a stale completion on another
+        Checklist.objects.filter(pk=self.checklist.pk).update(complete_tasks=3, incomplete_tasks=1)
+        stale = Checklist.objects.create(platform=self.platform)
+        ChecklistTask.objects.create(checklist=stale, task=self.tasks[0])
+        Checklist.objects.filter(pk=stale.pk).update(
+            complete_tasks=1, incomplete_tasks=0, completed_on=timezone.now()
+        )
+
+        call_command('recompute_checklist_progress', stdout=StringIO())
+        self.assertCounters(4, 4, 0, 0)
+        self.assertIsNotNone(self.checklist.completed_on)
+        stale.refresh_from_db()
+        self.assertIsNone(stale.completed_on)
+
+
+class CustomerAutocompleteViewTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.url = reverse('dept_qa:customer_autocomplete')
+        for i in range(15):
+            Customer.objects.create(name=f'Metro Unit {i:02d}')
+        Customer.objects.create(name='County of Metro')
+
+    def test_short_term_returns_nothing(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'term': 'm'})
+        self.assertEqual(response.json(), [])
+
+    def test_results_are_ranked_and_limited(self):
+        response = self.client.get(self.url, {'term': 'metro'})
+        names = response.json()
+        self.assertEqual(len(names), 10)
+        self.assertEqual(names[0], 'Metro Unit 00')
+        self.assertNotIn('County of Metro', names)
+
+        response = self.client.get(self.url, {'term': 'of m'})
+        self.assertEqual(response.json(), ['County of Metro'])
+
+    def test_repeat_lookups_do_not_query(self):
+        self.client.get(self.url, {'term': 'metro'})
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {'term': 'metro u'})
+
+
+class ChecklistPdfTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media_override = override_settings(MEDIA_ROOT=self.media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        # Never start real worker processes; hand back futures the test controls
+        self.executor = mock.Mock()
+        self.executor.submit.side_effect = lambda *args: Future()
+        patcher = mock.patch.object(pdf, 'get_executor', return_value=self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(pdf._pending.clear)
+
+        customer = Customer.objects.create(name='Test Agency', timezone='UTC')
+        product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        generation = ProductGeneration.objects.create(product_line=product_line, generation_number='1')
+        platform = Platform.objects.create(iris_number='400', product_generation=generation, customer=customer)
+        self.checklist = Checklist.objects.create(platform=platform)
+        task = Task.objects.create(name='Label Cable', order=1)
+        ChecklistTask.objects.create(checklist=self.checklist, task=task, notes='Checked twice')
+        self.checklist.refresh_from_db()
+        self.url = reverse('dept_qa:checklist_pdf', kwargs={'iris_number': '400'})
+
+    def write_cached_pdf(self, checklist):
+        path = pdf.pdf_path(checklist)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'%PDF-1.7 test')
+        return path
+
+    def test_render_checklist_html(self):
+        html = pdf.render_checklist_html(self.checklist)
+        self.assertIn('IRIS400', html)
+        self.assertIn('Label Cable', html)
+        self.assertIn('Checked twice', html)
+
+    def test_missing_pdf_is_queued_once(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Retry-After'], '3')
+
+        self.client.get(self.url)
+        self.assertEqual(self.executor.submit.call_count, 1)
+        _, _, _, path, stale_pattern = self.executor.submit.call_args.args
+        self.assertEqual(path, str(pdf.pdf_path(self.checklist)))
+        self.assertTrue(stale_pattern.endswith(f'checklist-{self.checklist.pk}-v*.pdf'))
+
+    def test_finished_render_is_no_longer_pending(self):
+        future = pdf.schedule_pdf(self.checklist)
+        future.set_result(str(pdf.pdf_path(self.checklist)))
+        self.assertEqual(pdf._pending, {})
+
+    def test_cached_pdf_is_served(self):
+        self.write_cached_pdf(self.checklist)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('IRIS400-checklist.pdf', response['Content-Disposition'])
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.7 test')
+        self.executor.submit.assert_not_called()
+
+    def test_task_change_invalidates_cached_pdf(self):
+        self.write_cached_pdf(self.checklist)
+        ChecklistTask.objects.filter(checklist=self.checklist).update(status='Complete')
+        self.checklist.refresh_from_db()
+        self.assertIsNone(pdf.request_pdf(self.checklist))
+        self.executor.submit.assert_called_once()
+
+    def test_build_pdf_archive(self):
+        self.write_cached_pdf(self.checklist)
+        fileobj = BytesIO()
+        self.assertEqual(pdf.build_pdf_archive([self.checklist], fileobj), 1)
+        with zipfile.ZipFile(fileobj) as archive:
+            self.assertEqual(archive.namelist(), ['IRIS400-checklist.pdf'])
+        self.executor.submit.assert_not_called()
+
+    def test_build_pdf_archive_times_out(self):
+        with self.assertRaises(TimeoutError):
+            pdf.build_pdf_archive([self.checklist], BytesIO(), timeout=0)
+
+    def test_export_command_requires_selection(self):
+        with self.assertRaises(CommandError):
+            call_command('export_checklist_pdfs', '--output', f'{self.media_root}/out.zip')
+
+
+class CatalogImportTest(TestCase):
+    CSV = (
+        'type,key,name,parent,order,component_types,requires_customer_preset,components,product_generations\n'
+        'task,camera-wiring,Check Wiring,camera,2,,,Camera Model A,\n'
+        'component,,Camera Model A,,,Camera|Video,yes,,\n'
+        'task,camera,Check Camera,,1,,,Camera Model A,\n'
+        'task,label,Label Cable,,3,,,,Vehicle Surveillance System - Gen 1\n'
+    )
+
+    def setUp(self):
+        clear_caches()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write_file(self, name, content):
+        path = f'{self.directory}/{name}'
+        with open(path, 'w', encoding='utf-8') as fileobj:
+            fileobj.write(content)
+        return path
+
+    def import_csv(self, content=CSV, batch_size=2):
+        out = StringIO()
+        call_command('import_catalog', self.write_file('catalog.csv', content), batch_size=batch_size, stdout=out)
+        return out.getvalue()
+
+    def test_import_creates_catalog(self):
+        output = self.import_csv()
+        self.assertIn('4 rows processed', output)
+
+        camera = Component.objects.get(name='Camera Model A')
+        self.assertTrue(camera.requires_customer_preset)
+        self.assertEqual(sorted(camera.component_types.values_list('name', flat=True)), ['Camera', 'Video'])
+
+        parent = Task.objects.get(key='camera')
+        child = Task.objects.get(key='camera-wiring')
+        self.assertEqual(child.parent_task, parent)
+        self.assertEqual(child.depth, 1)
+        self.assertTrue(child.path.startswith(parent.path))
+        self.assertEqual(list(child.components.all()), [camera])
+
+        generation = ProductGeneration.objects.get(product_line__name='Vehicle Surveillance System')
+        self.assertEqual(generation.generation_number, '1')
+        label = Task.objects.get(key='label')
+        self.assertEqual(resolve_task_ids(generation, [camera.id]), [parent.id, child.id, label.id])
+
+    def test_reimport_is_idempotent(self):
+        self.import_csv()
+        before = list(Task.objects.order_by('id').values_list('id', 'name', 'parent_task_id', 'path'))
+        output = self.import_csv()
+        self.assertIn('tasks created: 0', output)
+        self.assertIn('links added: 0', output)
+        self.assertEqual(list(Task.objects.order_by('id').values_list('id', 'name', 'parent_task_id', 'path')), before)
+        self.assertEqual(Component.objects.count(), 1)
+        self.assertEqual(ComponentType.objects.count(), 2)
+
+    def test_reimport_updates_rows_and_links(self):
+        self.import_csv()
+        self.import_csv(
+            'type,key,name,parent,order,components\n'
+            'task,camera-wiring,Check Wiring Harness,,5,\n'
+        )
+        task = Task.objects.get(key='camera-wiring')
+        self.assertEqual((task.name, task.order, task.parent_task_id, task.depth), ('Check Wiring Harness', 5, None, 0))
+        self.assertFalse(task.components.exists())
+
+    def test_jsonl_import(self):
+        path = self.write_file('catalog.jsonl', '\n'.join([
+            '{"type": "component", "name": "Radio X", "component_types": ["Radio"]}',
+            '',
+            '{"type": "task", "key": "radio", "name": "Check Radio", "components": ["Radio X"], "order": 1}',
+        ]))
+        call_command('import_catalog', path, stdout=StringIO())
+        task = Task.objects.get(key='radio')
+        self.assertEqual(list(task.components.values_list('component_types__name', flat=True)), ['Radio'])
+
+    def test_unknown_parent_rolls_back(self):
+        with self.assertRaisesMessage(CommandError, "unknown parent 'missing'"):
+            self.import_csv('type,key,name,parent\ntask,orphan,Orphan Task,missing\n')
+        self.assertFalse(Task.objects.exists())
+
+    def test_cycle_is_rejected(self):
+        with self.assertRaisesMessage(CommandError, 'cycle'):
+            self.import_csv('type,key,name,parent\ntask,a,Task A,b\ntask,b,Task B,a\n')
+
+    def test_invalid_row_reports_row_number(self):
+        with self.assertRaisesMessage(CommandError, 'Row 2: unknown record type'):
+            self.import_csv('type,key,name\ntask,a,Task A\nwidget,b,Widget\n')
+
+    def test_import_refreshes_task_index(self):
+        task_index.get()
+        records = [
+            {'type': 'task', 'key': 'general', 'name': 'General Check', 'product_generations': ['Vehicle - Gen 2']},
+        ]
+        CatalogImporter().run(records)
+        generation = ProductGeneration.objects.get(generation_number='2')
+        self.assertEqual(resolve_task_ids(generation, []), [Task.objects.get(key='general').id])
+
+    def test_read_records_reports_bad_json(self):
+        with self.assertRaisesMessage(ValueError, 'Line 2'):
+            list(read_records(StringIO('{"type": "task"}\n{oops\n'), 'jsonl'))
+
+
+class ChecklistBatchGenerationTest(TestCase):
+    MANIFEST = (
+        'iris_number,customer,product_generation,components,customer_presets\n'
+        '501,Test Agency,Vehicle Surveillance System - Gen 1,Camera Model A,Dispatch:4|Tac 1:7\n'
+        '502,Test Agency,Vehicle Surveillance System - Gen 1,Camera Model A,\n'
+        '503,Other Agency,Vehicle Surveillance System - Gen 1,Camera Model A|Mesh Radio,\n'
+    )
+
+    def setUp(self):
+        clear_caches()
+        product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=product_line, generation_number='1')
+        self.camera = Component.objects.create(name='Camera Model A')
+        self.radio = Component.objects.create(name='Mesh Radio')
+        Task.objects.create(name='Inspect Wiring', order=1).product_generations.add(self.generation)
+        Task.objects.create(name='Test Camera', order=2).components.add(self.camera)
+        Task.objects.create(name='Test Radio', order=3).components.add(self.radio)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write_manifest(self, content=MANIFEST):
+        path = f'{self.directory}/manifest.csv'
+        with open(path, 'w', encoding='utf-8') as fileobj:
+            fileobj.write(content)
+        return path
+
+    def test_generates_every_row_and_reuses_task_sets(self):
+        generator = ChecklistBatchGenerator(chunk_size=2)
+        stats = generator.run(read_records(StringIO(self.MANIFEST), 'csv'))
+        self.assertEqual(generator.errors, [])
+        self.assertEqual(stats['checklists_created'], 3)
+        # 501 and 502 share a configuration
+        self.assertEqual(stats['task_sets_resolved'], 2)
+
+        first = Checklist.objects.get(platform__iris_number='501')
+        self.assertEqual(
+            list(first.tasks.order_by('path').values_list('name', flat=True)), ['Inspect Wiring', 'Test Camera']
+        )
+        self.assertEqual(first.platform.customer_presets, [
+            {'preset': 'Dispatch', 'channel': '4'}, {'preset': 'Tac 1', 'channel': '7'},
+        ])
+        self.assertEqual(Checklist.objects.get(platform__iris_number='503').total_tasks, 3)
+        self.assertEqual(Customer.objects.count(), 2)
+
+    def test_bad_rows_are_reported_without_aborting(self):
+        generate_checklist(
+            iris_number='600', product_generation=self.generation, customer_name='Test Agency', component_ids=[],
+        )
+        def row(iris_number, generation='1', **fields):
+            return {
+                'iris_number': iris_number, 'customer': 'Test Agency',
+                'product_generation': f'Vehicle Surveillance System - Gen {generation}', **fields,
+            }
+
+        records = [
+            row('601', generation='9'),
+            row('602', components=['Laser']),
+            row('600'),
+            row('603'),
+            row('603'),
+            row('604', customer_presets='Dispatch'),
+        ]
+        generator = ChecklistBatchGenerator(chunk_size=4)
+        stats = generator.run(records)
+        self.assertEqual([(error.row, error.iris_number) for error in generator.errors], [
+            (1, '601'), (2, '602'), (3, '600'), (5, '603'), (6, '604'),
+        ])
+        self.assertIn('unknown components: Laser', generator.errors[1].message)
+        self.assertIn('already exists', generator.errors[3].message)
+        self.assertEqual((stats['rows'], stats['rows_failed'], stats['checklists_created']), (6, 5, 1))
+        self.assertEqual(
+            sorted(Checklist.objects.values_list('platform__iris_number', flat=True)), ['600', '603']
+        )
+        self.assertFalse(Platform.objects.filter(iris_number__in=['601', '602', '604']).exists())
+
+    def test_parse_presets(self):
+        self.assertEqual(parse_presets(''), [])
+        self.assertEqual(parse_presets('[{"preset": "A", "channel": "1"}]'), [{'preset': 'A', 'channel': '1'}])
+        self.assertEqual(parse_presets('Tac:1:2'), [{'preset': 'Tac:1', 'channel': '2'}])
+        with self.assertRaisesMessage(ValueError, 'needs both'):
+            parse_presets([{'preset': 'A'}])
+
+    def test_command_reports_failed_rows(self):
+        out = StringIO()
+        call_command('generate_checklists', self.write_manifest(), stdout=out)
+        self.assertIn('checklists created: 3', out.getvalue())
+
+        err = StringIO()
+        with self.assertRaisesMessage(CommandError, '3 row(s) failed'):
+            call_command('generate_checklists', self.write_manifest(), stdout=StringIO(), stderr=err)
+        self.assertIn('Row 1 (IRIS501): A checklist already exists', err.getvalue())
+
+    def test_upload_view_is_staff_only(self):
+        url = reverse('dept_qa:generate_checklists')
+        user = get_user_model().objects.create_user('tech', password='secret')
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        user.is_staff = True
+        user.save()
+        response = self.client.post(url, {
+            'manifest': SimpleUploadedFile('manifest.csv', self.MANIFEST.encode()),
+            'format': 'csv',
+        })
+        self.assertContains(response, '3 of 3 checklists generated')
+        self.assertEqual(Checklist.objects.count(), 3)
+
+
+class ChecklistResyncTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=product_line, generation_number='1')
+        self.camera = Component.objects.create(name='Camera Model A')
+        self.wiring_task = Task.objects.create(name='Inspect Wiring', order=1)
+        self.wiring_task.product_generations.add(self.generation)
+        self.camera_task = Task.objects.create(name='Test Camera', order=2)
+        self.camera_task.components.add(self.camera)
+        self.checklist = generate_checklist(
+            iris_number='700', product_generation=self.generation, customer_name='Test Agency',
+            component_ids=[self.camera.id],
+        )
+        self.camera_row = self.checklist.tasks.get(task=self.camera_task)
+        apply_task_updates(self.checklist, {self.camera_row.id: {'status': 'Failed', 'notes': 'No video'}})
+
+    def change_catalog(self):
+        # A new subtask for the camera, and the wiring task no longer applies to the generation
+        lens_task = Task.objects.create(name='Check Lens', order=1, parent_task=self.camera_task)
+        lens_task.components.add(self.camera)
+        self.wiring_task.product_generations.clear()
+        return lens_task
+
+    def test_dry_run_reports_without_writing(self):
+        self.change_catalog()
+        diffs = []
+        stats = ChecklistResync(dry_run=True, report=diffs.append).run()
+        self.assertEqual(
+            [(diff.iris_number, diff.added, [name for _, name in diff.removed]) for diff in diffs],
+            [('700', [(Task.objects.get(name='Check Lens').id, 'Check Lens')], ['Inspect Wiring'])],
+        )
+        self.assertEqual((stats['tasks_added'], stats['tasks_removed']), (1, 1))
+        self.assertEqual(
+            sorted(self.checklist.tasks.values_list('name', flat=True)), ['Inspect Wiring', 'Test Camera']
+        )
+
+    def test_resync_adds_and_removes_tasks(self):
+        lens_task = self.change_catalog()
+        version = Checklist.objects.get(pk=self.checklist.pk).version
+        ChecklistResync().run()
+
+        rows = {row.task_id: row for row in self.checklist.tasks.all()}
+        self.assertEqual(set(rows), {self.camera_task.id, lens_task.id})
+        self.assertEqual((rows[self.camera_task.id].status, rows[self.camera_task.id].notes), ('Failed', 'No video'))
+        lens_row = rows[lens_task.id]
+        self.assertEqual((lens_row.status, lens_row.parent_id), ('Incomplete', self.camera_row.id))
+
+        checklist = Checklist.objects.get(pk=self.checklist.pk)
+        self.assertEqual(
+            (checklist.total_tasks, checklist.failed_tasks, checklist.incomplete_tasks, checklist.complete_tasks),
+            (2, 1, 1, 0),
+        )
+        self.assertGreater(checklist.version, version)
+        self.assertEqual(ChecklistResync().run()['checklists_changed'], 0)
+
+    def test_new_subtask_follows_its_parent_row_after_a_reorder(self):
+        self.camera_task.order = 0
+        self.camera_task.save()
+        lens_task = self.change_catalog()
+        ChecklistResync().run()
+
+        lens_row = self.checklist.tasks.get(task=lens_task)
+        self.assertEqual(lens_row.path, self.camera_row.path + Task.path_segment(lens_task.id, 1))
+        rows = build_task_tree(self.checklist.tasks.order_by('path'))
+        self.assertEqual([(row['task'].name, row['level']) for row in rows], [('Test Camera', 0), ('Check Lens', 1)])
+
+        # Saving a single new row places it under its parent row the same way
+        lens_row.delete()
+        lens_row = ChecklistTask.objects.create(checklist=self.checklist, task=lens_task)
+        self.assertEqual((lens_row.parent_id, lens_row.path), (self.camera_row.id, rows[1]['task'].path))
+
+    def test_completed_checklists_are_left_alone(self):
+        apply_task_updates(self.checklist, {
+            task_id: {'status': 'Complete'} for task_id in self.checklist.tasks.values_list('id', flat=True)
+        })
+        self.change_catalog()
+        stats = ChecklistResync().run()
+        self.assertEqual((stats['checklists_checked'], stats['checklists_changed']), (0, 0))
+        self.assertEqual(self.checklist.tasks.count(), 2)
+
+    def test_removing_the_last_open_task_completes_the_checklist(self):
+        apply_task_updates(self.checklist, {self.camera_row.id: {'status': 'Complete'}})
+        self.wiring_task.product_generations.clear()
+        ChecklistResync().run()
+        checklist = Checklist.objects.get(pk=self.checklist.pk)
+        self.assertIsNotNone(checklist.completed_on)
+        summary = GenerationCompletionSummary.objects.get(product_generation=self.generation)
+        self.assertEqual(summary.completed_checklists, 1)
+
+    def test_command(self):
+        self.change_catalog()
+        out = StringIO()
+        call_command('resync_checklists', dry_run=True, stdout=out)
+        self.assertIn('IRIS700 (checklist %d): +Check Lens, -Inspect Wiring' % self.checklist.pk, out.getvalue())
+        self.assertIn('Dry run, nothing was changed', out.getvalue())
+        self.assertEqual(self.checklist.tasks.count(), 2)
+
+        out = StringIO()
+        call_command('resync_checklists', stdout=out)
+        self.assertIn('tasks added: 1', out.getvalue())
+        self.assertEqual(
+            sorted(self.checklist.tasks.values_list('name', flat=True)), ['Check Lens', 'Test Camera']
+        )
+
+
+class ChecklistExportTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=product_line, generation_number='1')
+        camera = Component.objects.create(name='Camera Model A')
+        camera.component_types.add(ComponentType.objects.create(name='Video'))
+        Task.objects.create(name='Inspect Wiring', order=1).product_generations.add(self.generation)
+        Task.objects.create(name='Test Camera', order=2).components.add(camera)
+        self.checklist = generate_checklist(
+            iris_number='900', product_generation=self.generation, customer_name='Test Agency',
+            component_ids=[camera.id],
+        )
+        old = generate_checklist(
+            iris_number='901', product_generation=self.generation, customer_name='Old Agency', component_ids=[],
+        )
+        Checklist.objects.filter(pk=old.pk).update(created_on=timezone.now() - timezone.timedelta(days=30))
+        camera_row = self.checklist.tasks.get(name='Test Camera')
+        apply_task_updates(self.checklist, {camera_row.id: {'status': 'Failed', 'notes': 'No video, "blank" feed'}})
+        self.staff = get_user_model().objects.create_user('staff', password='secret', is_staff=True)
+
+    def export(self, **params):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('dept_qa:checklist_export'), params)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        response, content = self.export(created_from=timezone.localdate().isoformat())
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual([(row['iris_number'], row['task']) for row in rows], [
+            ('900', 'Inspect Wiring'), ('900', 'Test Camera'),
+        ])
+        camera = rows[1]
+        self.assertEqual(
+            (camera['customer'], camera['product_line'], camera['generation_number']),
+            ('Test Agency', 'Vehicle Surveillance System', '1'),
+        )
+        self.assertEqual((camera['component_type'], camera['component']), ('Video', 'Camera Model A'))
+        self.assertEqual((camera['status'], camera['notes']), ('Failed', 'No video, "blank" feed'))
+        self.assertEqual(camera['checklist_created_on'], self.checklist.created_on.isoformat())
+
+    def test_jsonl_export(self):
+        response, content = self.export(format='jsonl', customer='Old')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([(row['iris_number'], row['task'], row['component']) for row in rows], [
+            ('901', 'Inspect Wiring', None),
+        ])
+
+    def test_export_streams_from_one_query(self):
+        for i in range(3):
+            generate_checklist(
+                iris_number=f'91{i}', product_generation=self.generation, customer_name='Test Agency', component_ids=[],
+            )
+        with self.assertNumQueries(1):
+            lines = list(stream_export(task_results(Checklist.objects.all(), chunk_size=2), 'jsonl'))
+        self.assertEqual(len(lines), 6)
+
+    def test_export_includes_archived_checklists(self):
+        old = Checklist.objects.get(platform__iris_number='901')
+        apply_task_updates(old, {task_id: {'status': 'Complete'} for task_id in old.tasks.values_list('id', flat=True)})
+        _, before = self.export(format='jsonl')
+        archive_batch([old.pk])
+        self.assertFalse(Checklist.objects.filter(pk=old.pk).exists())
+
+        _, after = self.export(format='jsonl')
+        self.assertEqual(
+            [json.loads(line) for line in after.splitlines()], [json.loads(line) for line in before.splitlines()]
+        )
+        _, open_only = self.export(format='jsonl', status='open')
+        self.assertEqual({json.loads(line)['iris_number'] for line in open_only.splitlines()}, {'900'})
+
+    def test_export_is_staff_only_and_validates(self):
+        url = reverse('dept_qa:checklist_export')
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(url, {'format': 'xml'}).status_code, 400)
+        response = self.client.get(url, {'created_from': '2024-02-01', 'created_to': '2024-01-01'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('export_checklist_results', format='jsonl', status='failed', stdout=out)
+        self.assertEqual([json.loads(line)['iris_number'] for line in out.getvalue().splitlines()], ['900', '900'])
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = f'{directory}/results.csv'
+        call_command('export_checklist_results', output=path, stderr=StringIO())
+        with open(path, newline='', encoding='utf-8') as fileobj:
+            self.assertEqual(len(list(csv.DictReader(fileobj))), 3)
+
+        with self.assertRaisesMessage(CommandError, 'Invalid filters'):
+            call_command('export_checklist_results', created_from='yesterday', stdout=StringIO())
+
+
+class AnalyticsSummaryTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=product_line, generation_number='1')
+        camera_type = ComponentType.objects.create(name='Camera')
+        self.camera = Component.objects.create(name='Camera Model A')
+        self.camera.component_types.add(camera_type)
+        for i in range(3):
+            task = Task.objects.create(name=f'Camera Check {i}', order=i)
+            task.components.add(self.camera)
+        Task.objects.create(name='Inspect Wiring', order=9).product_generations.add(self.generation)
+
+        self.checklist = generate_checklist(
+            iris_number='500',
+            product_generation=self.generation,
+            customer_name='Test Agency',
+            component_ids=[self.camera.id],
+        )
+        self.customer = self.checklist.platform.customer
+
+    def summaries(self):
+        return {
+            # Rows zeroed out incrementally are equivalent to rows a rebuild never creates
+            'components': list(ComponentStatusSummary.objects.filter(total_tasks__gt=0).order_by(
+                'component_id'
+            ).values_list(
+                'component_id', 'total_tasks', 'complete_tasks', 'failed_tasks', 'incomplete_tasks'
+            )),
+            'types': list(ComponentTypeStatusSummary.objects.filter(total_tasks__gt=0).order_by('group').values_list(
+                'group', 'total_tasks', 'complete_tasks', 'failed_tasks', 'incomplete_tasks'
+            )),
+            'generations': list(GenerationCompletionSummary.objects.filter(completed_checklists__gt=0).values_list(
+                'product_generation_id', 'completed_checklists'
+            )),
+            'customers': list(CustomerIssueSummary.objects.filter(open_issues__gt=0).values_list(
+                'customer_id', 'open_issues'
+            )),
+        }
+
+    def assertMatchesRebuild(self):
+        incremental = self.summaries()
+        call_command('rebuild_analytics', stdout=StringIO())
+        self.assertEqual(incremental, self.summaries())
+        return incremental
+
+    def set_statuses(self, **statuses):
+        updates = {
+            checklist_task.id: {'status': statuses.get(checklist_task.name, checklist_task.status)}
+            for checklist_task in self.checklist.tasks.all()
+        }
+        apply_task_updates(self.checklist, updates)
+
+    def test_status_changes_move_summaries(self):
+        self.set_statuses(**{'Camera Check 0': 'Failed', 'Camera Check 1': 'Complete', 'Inspect Wiring': 'Complete'})
+        summaries = self.assertMatchesRebuild()
+        self.assertEqual(summaries['components'], [(self.camera.id, 3, 1, 1, 1)])
+        self.assertEqual(summaries['types'], [('', 1, 1, 0, 0), ('Camera', 3, 1, 1, 1)])
+        self.assertEqual(ComponentStatusSummary.objects.get().failure_rate(), 33.3)
+
+    def test_completion_time_per_generation(self):
+        self.set_statuses(**{name: 'Complete' for name in self.checklist.tasks.values_list('name', flat=True)})
+        summary = GenerationCompletionSummary.objects.get(product_generation=self.generation)
+        self.assertEqual(summary.completed_checklists, 1)
+        self.checklist.refresh_from_db()
+        self.assertEqual(summary.average_completion_time(), self.checklist.completion_time())
+
+        # Reopening the checklist takes it back out
+        self.set_statuses(**{'Inspect Wiring': 'Failed'})
+        summary.refresh_from_db()
+        self.assertEqual(summary.completed_checklists, 0)
+        self.assertMatchesRebuild()
+
+    def test_open_issues_per_customer(self):
+        issue = IssueResolution.objects.create(checklist=self.checklist, issue_description='Loose connector')
+        IssueResolution.objects.create(checklist=self.checklist, issue_description='Scratched lens')
+        self.assertEqual(self.assertMatchesRebuild()['customers'], [(self.customer.id, 2)])
+
+        issue = IssueResolution.objects.get(pk=issue.pk)
+        issue.resolved_on = timezone.now()
+        issue.save()
+        self.assertEqual(self.assertMatchesRebuild()['customers'], [(self.customer.id, 1)])
+
+        IssueResolution.objects.get(resolved_on__isnull=True).delete()
+        self.assertEqual(self.assertMatchesRebuild()['customers'], [])
+
+    def test_bulk_issue_delete(self):
+        IssueResolution.objects.create(checklist=self.checklist, issue_description='Loose connector')
+        IssueResolution.objects.create(
+            checklist=self.checklist, issue_description='Scratched lens', resolved_on=timezone.now()
+        )
+        IssueResolution.objects.create(checklist=self.checklist, issue_description='Cracked housing')
+        self.assertEqual(self.assertMatchesRebuild()['customers'], [(self.customer.id, 2)])
+
+        IssueResolution.objects.filter(issue_description__startswith='Scratched').delete()
+        self.assertEqual(self.assertMatchesRebuild()['customers'], [(self.customer.id, 2)])
+        IssueResolution.objects.all().delete()
+        self.assertEqual(self.assertMatchesRebuild()['customers'], [])
+
+    def test_checklist_delete_removes_its_history(self):
+        self.set_statuses(**{name: 'Complete' for name in self.checklist.tasks.values_list('name', flat=True)})
+        IssueResolution.objects.create(checklist=self.checklist, issue_description='Loose connector')
+        self.checklist.delete()
+        summaries = self.assertMatchesRebuild()
+        self.assertEqual(summaries['generations'], [])
+        self.assertEqual(summaries['customers'], [])
+        self.assertEqual(summaries['components'], [])
+
+    def test_dashboard_reads_only_summaries(self):
+        self.set_statuses(**{'Camera Check 0': 'Failed'})
+        IssueResolution.objects.create(checklist=self.checklist, issue_description='Loose connector')
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('dept_qa:dashboard'))
+        self.assertContains(response, 'Camera Model A')
+        self.assertContains(response, '33.3%')
+        self.assertContains(response, 'Test Agency')
+
+
+class ChecklistArchiveTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=product_line, generation_number='1')
+        camera_type = ComponentType.objects.create(name='Camera')
+        self.camera = Component.objects.create(name='Camera Model A')
+        self.camera.component_types.add(camera_type)
+        parent = Task.objects.create(name='Camera Check', order=1)
+        parent.components.add(self.camera)
+        Task.objects.create(name='Camera Subcheck', order=1, parent_task=parent).components.add(self.camera)
+        Task.objects.create(name='Inspect Wiring', order=9).product_generations.add(self.generation)
+
+        self.checklist = self.completed_checklist('700', days_ago=400)
+        IssueResolution.objects.create(
+            checklist=self.checklist, issue_description='Loose connector', resolution='Reseated',
+            resolved_on=timezone.now(),
+        )
+
+    def completed_checklist(self, iris_number, days_ago):
+        checklist = generate_checklist(
+            iris_number=iris_number,
+            product_generation=self.generation,
+            customer_name='Test Agency',
+            component_ids=[self.camera.id],
+        )
+        updates = {task_id: {'status': 'Complete'} for task_id in checklist.tasks.values_list('id', flat=True)}
+        updates[checklist.tasks.get(name='Camera Subcheck').id] = {'status': 'Complete', 'notes': 'Replaced lens'}
+        apply_task_updates(checklist, updates)
+        # Keep the completion time while moving both dates back
+        age = timezone.timedelta(days=days_ago)
+        Checklist.objects.filter(pk=checklist.pk).update(
+            created_on=models.F('created_on') - age, completed_on=models.F('completed_on') - age,
+        )
+        return checklist
+
+    def archive(self, *args):
+        output = StringIO()
+        call_command('archive_checklists', *args, stdout=output)
+        return output.getvalue()
+
+    def test_archives_old_completed_checklists(self):
+        recent = self.completed_checklist('701', days_ago=10)
+        self.archive('--days', '365')
+
+        self.assertFalse(Checklist.objects.filter(pk=self.checklist.pk).exists())
+        self.assertFalse(ChecklistTask.objects.filter(checklist_id=self.checklist.pk).exists())
+        self.assertFalse(IssueResolution.objects.filter(checklist_id=self.checklist.pk).exists())
+        self.assertTrue(Checklist.objects.filter(pk=recent.pk).exists())
+
+        archive = ArchivedChecklist.objects.get()
+        self.assertEqual(archive.checklist_id, self.checklist.pk)
+        self.assertEqual((archive.total_tasks, archive.complete_tasks), (3, 3))
+        self.assertEqual(
+            [(task.name, task.status, task.group, task.notes) for task in archive.tasks()],
+            [
+                ('Camera Check', 'Complete', 'Camera', None),
+                ('Camera Subcheck', 'Complete', 'Camera', 'Replaced lens'),
+                ('Inspect Wiring', 'Complete', '', None),
+            ],
+        )
+        self.assertEqual(archive.issues()[0]['resolution'], 'Reseated')
+        self.assertEqual(archive.document()['checklist']['customer'], 'Test Agency')
+
+    def test_skips_open_issues_and_incomplete_checklists(self):
+        self.checklist.issues.create(issue_description='Missing antenna')
+        incomplete = generate_checklist(
+            iris_number='702', product_generation=self.generation, customer_name='Test Agency', component_ids=[],
+        )
+        Checklist.objects.filter(pk=incomplete.pk).update(created_on=timezone.now() - timezone.timedelta(days=900))
+        self.assertIn('0 checklist(s)', self.archive('--dry-run'))
+        self.archive()
+        self.assertFalse(ArchivedChecklist.objects.exists())
+
+    def test_dry_run_changes_nothing(self):
+        self.assertIn('1 checklist(s)', self.archive('--dry-run'))
+        self.assertTrue(Checklist.objects.filter(pk=self.checklist.pk).exists())
+
+    def test_analytics_keep_archived_history(self):
+        before = AnalyticsSummaryTest.summaries(self)
+        self.archive()
+        self.assertEqual(AnalyticsSummaryTest.summaries(self), before)
+
+        call_command('rebuild_analytics', stdout=StringIO())
+        self.assertEqual(AnalyticsSummaryTest.summaries(self), before)
+        summary = GenerationCompletionSummary.objects.get(product_generation=self.generation)
+        self.assertEqual(summary.completed_checklists, 1)
+
+    def test_deleting_live_checklists_after_archiving_keeps_summaries_balanced(self):
+        live = self.completed_checklist('703', days_ago=10)
+        live.issues.create(issue_description='Cracked housing')
+        self.archive()
+        Checklist.objects.filter(pk=live.pk).delete()
+        summaries = AnalyticsSummaryTest.summaries(self)
+        call_command('rebuild_analytics', stdout=StringIO())
+        self.assertEqual(AnalyticsSummaryTest.summaries(self), summaries)
+        self.assertEqual(summaries['generations'], [(self.generation.pk, 1)])
+        self.assertEqual(summaries['customers'], [])
+
+    def test_deleting_an_archive_removes_its_history(self):
+        self.archive()
+        ArchivedChecklist.objects.get().delete()
+        summaries = AnalyticsSummaryTest.summaries(self)
+        self.assertEqual(summaries, {'components': [], 'types': [], 'generations': [], 'customers': []})
+
+    def test_archived_checklist_stays_viewable(self):
+        self.archive()
+        detail_url = reverse('dept_qa:checklist_detail', kwargs={'iris_number': '700'})
+        archive_url = reverse('dept_qa:archived_checklist', kwargs={'checklist_id': self.checklist.pk})
+        self.assertRedirects(self.client.get(detail_url), archive_url)
+
+        response = self.client.get(archive_url)
+        self.assertContains(response, 'Camera Subcheck')
+        self.assertContains(response, 'Replaced lens')
+        self.assertContains(response, 'Loose connector')
+        self.assertNotContains(response, 'name="status_')
+
+        response = self.client.get(archive_url, {'format': 'json'})
+        self.assertIn('attachment', response['Content-Disposition'])
+        self.assertEqual(len(response.json()['tasks']), 3)
+
+
+class QaAdminTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        self.admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'secret')
+        self.client.force_login(self.admin)
+        product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        self.generation = ProductGeneration.objects.create(product_line=product_line, generation_number='1')
+        for i in range(3):
+            Task.objects.create(name=f'Inspect Wiring {i}', order=i).product_generations.add(self.generation)
+
+    def add_checklists(self, start, count):
+        checklists = []
+        for i in range(start, start + count):
+            checklist = generate_checklist(
+                iris_number=f'{800 + i}', product_generation=self.generation,
+                customer_name=f'Agency {i}', component_ids=[],
+            )
+            checklist.issues.create(issue_description=f'Issue {i}')
+            checklists.append(checklist)
+        return checklists
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_changelist_query_counts_are_independent_of_rows(self):
+        urls = [
+            reverse(f'admin:dept_qa_{model}_changelist')
+            for model in ('checklist', 'checklisttask', 'issueresolution', 'task')
+        ]
+        self.add_checklists(0, 2)
+        small_counts = [self.count_queries(url) for url in urls]
+        self.add_checklists(2, 20)
+        self.assertEqual([self.count_queries(url) for url in urls], small_counts)
+
+    def run_action(self, model, action, objs):
+        return self.client.post(reverse(f'admin:dept_qa_{model}_changelist'), {
+            'action': action,
+            '_selected_action': [obj.pk for obj in objs],
+        })
+
+    def test_mark_tasks_complete_keeps_checklist_in_step(self):
+        checklist, other = self.add_checklists(0, 2)
+        self.run_action('checklisttask', 'mark_complete', checklist.tasks.all())
+        checklist.refresh_from_db()
+        self.assertEqual(checklist.complete_tasks, 3)
+        self.assertIsNotNone(checklist.completed_on)
+        self.assertEqual(other.tasks.filter(status='Complete').count(), 0)
+
+    def test_mark_issues_resolved_moves_open_issue_summary(self):
+        checklist, _ = self.add_checklists(0, 2)
+        self.run_action('issueresolution', 'mark_resolved', checklist.issues.all())
+        self.assertFalse(checklist.issues.filter(resolved_on__isnull=True).exists())
+        summary = CustomerIssueSummary.objects.get(customer=checklist.platform.customer)
+        self.assertEqual(summary.open_issues, 0)
+
+    def test_archive_action_skips_incomplete_checklists(self):
+        complete, incomplete = self.add_checklists(0, 2)
+        complete.issues.update(resolved_on=timezone.now())
+        apply_task_updates(complete, {task_id: {'status': 'Complete'} for task_id in complete.tasks.values_list(
+            'id', flat=True
+        )})
+        self.run_action('checklist', 'archive_selected', [complete, incomplete])
+        self.assertEqual(list(ArchivedChecklist.objects.values_list('checklist_id', flat=True)), [complete.pk])
+        self.assertTrue(Checklist.objects.filter(pk=incomplete.pk).exists())
+        response = self.client.get(reverse('admin:dept_qa_archivedchecklist_changelist'))
+        self.assertContains(response, '800')
+
+
+class BenchmarkTest(TestCase):
+    scale = {
+        'components': 20,
+        'component_types': 4,
+        'tasks': 30,
+        'subtasks': 2,
+        'customers': 10,
+        'checklists': 3,
+        'components_per_platform': 4,
+    }
+
+    def setUp(self):
+        clear_caches()
+
+    def test_populate_and_run(self):
+        benchmark.populate(self.scale)
+        self.assertEqual(Component.objects.count(), 20)
+        self.assertEqual(Task.objects.filter(parent_task__isnull=True).count(), 30)
+        self.assertEqual(Checklist.objects.count(), 3)
+
+        results = benchmark.run(self.scale, repeat=1)
+        self.assertEqual(results['checklist_detail GET (cached)']['queries'], 1)
+        self.assertEqual(results['customer_autocomplete GET']['queries'], 0)
+
+    def test_compare_flags_query_regressions(self):
+        baseline = {'detail': {'median_ms': 10.0, 'min_ms': 9.0, 'queries': 2}}
+        slower_machine = {'detail': {'median_ms': 30.0, 'min_ms': 27.0, 'queries': 2}}
+        self.assertEqual(benchmark.compare(slower_machine, baseline), [])
+        more_queries = {'detail': {'median_ms': 10.0, 'min_ms': 9.0, 'queries': 3}}
+        self.assertEqual(len(benchmark.compare(more_queries, baseline)), 1)
+
+    def test_compare_timings_is_relative_to_the_machine(self):
+        baseline = {
+            'detail': {'median_ms': 10.0, 'min_ms': 9.0, 'queries': 2},
+            'list': {'median_ms': 4.0, 'min_ms': 3.0, 'queries': 1},
+            'section': {'median_ms': 2.0, 'min_ms': 2.0, 'queries': 1},
+        }
+        # Everything twice as slow is the machine, not a regression
+        uniform = {name: dict(result, median_ms=result['median_ms'] * 2) for name, result in baseline.items()}
+        self.assertEqual(benchmark.compare_timings(uniform, baseline, 0.5), [])
+        uniform['detail']['median_ms'] = 40.0
+        slowdowns = benchmark.compare_timings(uniform, baseline, 0.5)
+        self.assertEqual(len(slowdowns), 1)
+        self.assertTrue(slowdowns[0].startswith('detail:'))
+
+    def test_baseline_round_trip(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = f'{directory}/baseline.json'
+        self.assertIsNone(benchmark.load_baseline(path, 'sqlite', self.scale))
+        results = {'detail': {'median_ms': 10.0, 'min_ms': 9.0, 'queries': 2}}
+        benchmark.save_baseline(path, 'sqlite', self.scale, results)
+        self.assertEqual(benchmark.load_baseline(path, 'sqlite', self.scale), results)
+        self.assertIsNone(benchmark.load_baseline(path, 'sqlite', dict(self.scale, tasks=31)))
+
+
+class ChecklistTaskAutosaveViewTest(TestCase):
+    def setUp(self):
+        clear_caches()
+        customer = Customer.objects.create(name='Test Agency', timezone='UTC')
+        product_line = ProductLine.objects.create(name='Vehicle Surveillance System')
+        generation = ProductGeneration.objects.create(product_line=product_line, generation_number='1')
+        platform = Platform.objects.create(iris_number='600', product_generation=generation, customer=customer)
+        self.checklist = Checklist.objects.create(platform=platform)
+        self.tasks = ChecklistTask.objects.bulk_create([
+            ChecklistTask(checklist=self.checklist, task=Task.objects.create(name=f'Task {i}', order=i))
+            for i in range(4)
+        ])
+        self.url = reverse('dept_qa:checklist_autosave', kwargs={'iris_number': '600'})
+
+    def post(self, payload):
+        return self.client.post(self.url, json.dumps(payload), content_type='application/json')
+
+    def test_saves_single_task_and_returns_progress(self):
+        response = self.post({'updates': {str(self.tasks[0].id): {'status': 'Complete', 'notes': 'Torqued'}}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'changed': [self.tasks[0].id],
+            'total_tasks': 4,
+            'complete_tasks': 1,
+            'failed_tasks': 0,
+            'incomplete_tasks': 3,
+            'completion_percentage': 25,
+            'is_complete': False,
+        })
+        self.tasks[0].refresh_from_db()
+        self.assertEqual((self.tasks[0].status, self.tasks[0].notes), ('Complete', 'Torqued'))
+
+    def test_batch_completes_checklist(self):
+        response = self.post({'updates': {str(task.id): {'status': 'Complete'} for task in self.tasks}})
+        self.assertTrue(response.json()['is_complete'])
+        self.checklist.refresh_from_db()
+        self.assertIsNotNone(self.checklist.completed_on)
+
+    def test_unchanged_update_writes_nothing(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.post({'updates': {str(self.tasks[0].id): {'status': 'Incomplete'}}})
+        self.assertEqual(response.json()['changed'], [])
+        self.assertFalse([query for query in context.captured_queries if query['sql'].startswith('UPDATE')])
+
+    def test_ignores_tasks_of_other_checklists(self):
+        platform = self.checklist.platform
+        other = Checklist.objects.create(platform=Platform.objects.create(
+            iris_number='601', product_generation=platform.product_generation, customer=platform.customer
+        ))
+        other_task = ChecklistTask.objects.create(checklist=other, task=Task.objects.create(name='Other'))
+        response = self.post({'updates': {str(other_task.id): {'status': 'Failed'}}})
+        self.assertEqual(response.json()['changed'], [])
+        other_task.refresh_from_db()
+        self.assertEqual(other_task.status, 'Incomplete')
+
+    def test_rejects_malformed_payloads(self):
+        for body in ('not json', json.dumps([1, 2]), json.dumps({'updates': {'abc': {}}})):
+            response = self.client.post(self.url, body, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+
+        updates = {str(i): {'status': 'Complete'} for i in range(ChecklistTaskAutosaveView.max_updates + 1)}
+        self.assertEqual(self.post({'updates': updates}).status_code, 400)
@@ -5,7 +5,15 @@ app_name = 'app.dept_qa'
 
 urlpatterns = [
     path('generate-checklist/', views.GenerateChecklistView.as_view(), name='generate_checklist'),
+    path('generate-checklists/', views.GenerateChecklistBatchView.as_view(), name='generate_checklists'),
+    path('checklists/', views.ChecklistListView.as_view(), name='checklist_list'),
+    path('checklists/export/', views.ChecklistExportView.as_view(), name='checklist_export'),
     path('checklist/iris-<str:iris_number>/', views.ChecklistDetailView.as_view(), name='checklist_detail'),
+    path('checklist/iris-<str:iris_number>/section/', views.ChecklistSectionView.as_view(), name='checklist_section'),
+    path('checklist/iris-<str:iris_number>/autosave/', views.ChecklistTaskAutosaveView.as_view(), name='checklist_autosave'),
+    path('checklist/iris-<str:iris_number>/pdf/', views.ChecklistPdfView.as_view(), name='checklist_pdf'),
+    path('archive/<int:checklist_id>/', views.ArchivedChecklistView.as_view(), name='archived_checklist'),
+    path('dashboard/', views.AnalyticsDashboardView.as_view(), name='dashboard'),
     path('customer-autocomplete/', views.CustomerAutocompleteView.as_view(), name='customer_autocomplete'),
     # Add more URLs as needed
 ]
@@ -1,21 +1,49 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import caches
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views import View
-from django.db import models
-from django.http import JsonResponse
+from django.db import models, router
+from django.db.models.functions import Cast
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 
+import io
+import json
 from collections import defaultdict
-
-from app.core.models import Platform, Component, ComponentType, AddOnProduct, Customer, ProductGeneration
-from .models import Checklist, ChecklistTask, Task
-from .forms import PlatformSelectionForm, CustomerPresetFormSet
+from urllib.parse import quote
+
+from app.core.autocomplete import customer_name_index
+from app.core.pagination import KeysetPaginator
+from .models import (
+    ArchivedChecklist, Checklist, ChecklistTask, ComponentStatusSummary, ComponentTypeStatusSummary,
+    CustomerIssueSummary, GenerationCompletionSummary,
+)
+from .batch_generation import ChecklistBatchGenerator
+from .catalog import component_catalog
+from .catalog_import import read_records
+from .export import CONTENT_TYPES, stream_export, task_results
+from .forms import ChecklistFilterForm, ChecklistManifestForm, PlatformSelectionForm, CustomerPresetFormSet
+from .pdf import pdf_filename, request_pdf
+from .services import apply_task_updates, generate_checklist
+from .task_groups import build_sections, build_task_tree
 
 
 class CustomerAutocompleteView(View):
+    """
+    Returns ranked customer names for the autocomplete on the generate checklist form.
+    """
+    min_term_length = 2
+    limit = 10
+
     def get(self, request):
-        term = request.GET.get('term', '')
-        customers = Customer.objects.filter(name__icontains=term).values_list('name', flat=True)
-        return JsonResponse(list(customers), safe=False)
+        term = request.GET.get('term', '').strip()
+        if len(term) < self.min_term_length:
+            return JsonResponse([], safe=False)
+        customers = customer_name_index.get().search(term, self.limit)
+        return JsonResponse(customers, safe=False)
 
 
 class GenerateChecklistView(View):
@@ -35,38 +63,7 @@ class GenerateChecklistView(View):
     def post(self, request):
         form = PlatformSelectionForm(request.POST)
         preset_formset = CustomerPresetFormSet(request.POST)
-        component_groups = self.get_component_groups()
         if form.is_valid() and preset_formset.is_valid():
-            # Retrieve form data
-            iris_number = form.cleaned_data['iris_number']
-            product_generation = form.cleaned_data['product_generation']
-            components = form.cleaned_data['components']
-            # add_ons = form.cleaned_data['add_ons']
-            customer_name = form.cleaned_data['customer']
-
-            # Get or create the Customer instance
-            customer, _ = Customer.objects.get_or_create(name=customer_name)
-
-            # Get or create the Platform instance
-            platform, created = Platform.objects.get_or_create(
-                iris_number=iris_number,
-                defaults={
-                    'product_generation': product_generation,
-                    'customer': customer,
-                }
-            )
-
-            # Update Platform details if it already exists
-            if not created:
-                platform.product_generation = product_generation
-                platform.customer = customer
-                platform.save()
-
-            # Set components and add-ons
-            platform.components.set(components)
-            # platform.add_ons.set(add_ons)
-            platform.save()
-
             # Process customer presets
             customer_presets = []
             for preset_form in preset_formset:
@@ -76,43 +73,18 @@ class GenerateChecklistView(View):
                     if preset and channel:
                         customer_presets.append({'preset': preset, 'channel': channel})
 
-            # Update customer_presets on the Platform
-            platform.customer_presets = customer_presets
-            platform.save()
-
-            # Generate the checklist
-            checklist = Checklist.objects.create(platform=platform)
-
-            # Collect components from selected add-ons
-            # add_on_components = Component.objects.filter(add_on_products__in=add_ons).distinct()
-
-            # Combine selected components and add-on components
-            all_components = components # | add_on_components
-
-            # Get the IDs of all components
-            all_component_ids = all_components.values_list('id', flat=True)
-
-            # Collect tasks associated with the combined components
-            component_tasks = Task.objects.filter(components__id__in=all_component_ids).distinct()
-
-            # Fetch generation-specific tasks not tied to components
-            generation_tasks = Task.objects.filter(
-                product_generations=product_generation,
-                components__isnull=True
-            ).distinct()
-
-            # Combine tasks
-            tasks = (component_tasks | generation_tasks).distinct().order_by('order')
-
-            # Create ChecklistTask instances
-            for task in tasks:
-                ChecklistTask.objects.create(
-                    checklist=checklist,
-                    task=task
-                )
+            # Create the platform and materialize its checklist
+            checklist = generate_checklist(
+                iris_number=form.cleaned_data['iris_number'],
+                product_generation=form.cleaned_data['product_generation'],
+                customer_name=form.cleaned_data['customer'],
+                component_ids=form.cleaned_data['components'],
+                customer_presets=customer_presets,
+            )
 
             return redirect('dept_qa:checklist_detail', iris_number=checklist.platform.iris_number)
         else:
+            component_groups = self.get_component_groups()
             return render(request, 'dept_qa/generate_checklist.html', {
                 'form': form,
                 'preset_formset': preset_formset,
@@ -120,23 +92,99 @@ class GenerateChecklistView(View):
             })
 
     def get_component_groups(self):
-        # Get all component types
-        component_types = ComponentType.objects.all().order_by('name')
+        """
+        Returns the Component Types with their components, from the cached catalog.
+        """
+        return component_catalog.get().groups
 
-        # Initialize the component groups dictionary
-        component_groups = {}
 
-        for ct in component_types:
-            # Get components for each component type
-            components = ct.components_set.filter(
-                # add_on_products__isnull=True
-            ).order_by('name')
+@method_decorator(staff_member_required, name='dispatch')
+class GenerateChecklistBatchView(View):
+    """
+    Generates checklists for every row of an uploaded build manifest and reports the rows that failed.
+    """
+    def get(self, request):
+        return render(request, 'dept_qa/generate_checklists.html', {'form': ChecklistManifestForm()})
 
-            if components.exists():
-                component_groups[ct] = components
+    def post(self, request):
+        form = ChecklistManifestForm(request.POST, request.FILES)
+        context = {'form': form}
+        if form.is_valid():
+            generator = ChecklistBatchGenerator()
+            fileobj = io.TextIOWrapper(form.cleaned_data['manifest'].file, encoding='utf-8', newline='')
+            try:
+                context['stats'] = generator.run(read_records(fileobj, form.cleaned_data['format']))
+            except ValueError as error:
+                form.add_error(
+                    'manifest', f'Could not read the manifest, rows before the error were generated. {error}'
+                )
+            context['errors'] = generator.errors
+        return render(request, 'dept_qa/generate_checklists.html', context)
 
-        return component_groups
 
+class ChecklistListView(View):
+    """
+    Lists checklists newest first, filtered by the ChecklistFilterForm and paged by keyset.
+    """
+    paginator = KeysetPaginator('created_on', per_page=50)
+
+    def get(self, request):
+        form = ChecklistFilterForm(request.GET)
+        checklists = Checklist.objects.select_related(
+            'platform__customer', 'platform__product_generation__product_line'
+        )
+        if form.is_valid():
+            checklists = form.filter(checklists)
+        else:
+            checklists = checklists.none()
+        page, next_cursor = self.paginator.page(checklists, request.GET.get('after'))
+
+        next_query = None
+        if next_cursor is not None:
+            query = request.GET.copy()
+            query['after'] = next_cursor
+            next_query = query.urlencode()
+        first_query = request.GET.copy()
+        first_query.pop('after', None)
+
+        return render(request, 'dept_qa/checklist_list.html', {
+            'form': form,
+            'checklists': page,
+            'next_query': next_query,
+            'first_query': first_query.urlencode(),
+            'is_first_page': 'after' not in request.GET,
+        })
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class ChecklistExportView(View):
+    """
+    Streams the task results of the checklists matching the ChecklistFilterForm as CSV or JSON Lines.
+
+    Archived checklists matching the filters are included after the live ones.
+    """
+    chunk_size = 2000
+
+    def get(self, request):
+        format = request.GET.get('format', 'csv')
+        if format not in CONTENT_TYPES:
+            return JsonResponse({'error': f'Unknown format {format!r}.'}, status=400)
+        form = ChecklistFilterForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+
+        # The rows are read after the view returns, outside of the request's routing, so pick the database now
+        using = router.db_for_read(Checklist)
+        rows = task_results(
+            form.filter(Checklist.objects.using(using)),
+            archives=form.filter(ArchivedChecklist.objects.using(using)),
+            chunk_size=self.chunk_size,
+        )
+        response = StreamingHttpResponse(stream_export(rows, format), content_type=CONTENT_TYPES[format])
+        response['Content-Disposition'] = (
+            f'attachment; filename="checklist-results-{timezone.localdate():%Y%m%d}.{format}"'
+        )
+        return response
 
 
 class ChecklistDetailView(View):
@@ -145,93 +193,214 @@ class ChecklistDetailView(View):
     """
     
     def post(self, request, iris_number):
-        platform = get_object_or_404(Platform, iris_number=iris_number)
-        checklist = get_object_or_404(Checklist, platform=platform)
-        tasks = ChecklistTask.objects.filter(checklist=checklist).select_related('task').order_by('task__order')
-
-        # Process form data
-        for task in tasks:
-            status = request.POST.get(f'status_{task.id}')
-            notes = request.POST.get(f'notes_{task.id}')
-            if status in ['Complete', 'Incomplete', 'Failed']:
-                task.status = status
-            task.notes = notes
-            task.save()
-
-        # Check if all tasks are complete
-        if checklist.is_complete():
-            checklist.completed_on = timezone.now()
-            checklist.save()
+        checklist = get_object_or_404(Checklist, platform__iris_number=iris_number)
+
+        # Collect the posted values per ChecklistTask id
+        updates = defaultdict(dict)
+        for key, value in request.POST.items():
+            field, _, task_id = key.partition('_')
+            if field in ('status', 'notes') and task_id.isdigit():
+                updates[int(task_id)][field] = value
+
+        # Write only what changed and keep completed_on in step
+        apply_task_updates(checklist, updates)
 
         return redirect('dept_qa:checklist_detail', iris_number=iris_number)
 
     def get(self, request, iris_number):
-        platform = get_object_or_404(Platform, iris_number=iris_number)
-        checklist = get_object_or_404(Checklist, platform=platform)
-        tasks = ChecklistTask.objects.filter(checklist=checklist).select_related('task').order_by('task__order')
+        try:
+            checklist = Checklist.objects.select_related(
+                'platform__product_generation__product_line', 'platform__customer'
+            ).get(platform__iris_number=iris_number)
+        except Checklist.DoesNotExist:
+            # Archived checklists stay reachable at their old address
+            archive = ArchivedChecklist.objects.filter(platform__iris_number=iris_number).order_by('-created_on').first()
+            if archive is None:
+                raise Http404('No checklist matches the given query.')
+            return redirect('dept_qa:archived_checklist', checklist_id=archive.checklist_id)
         completion_percentage = checklist.completion_percentage()
-        # Build the grouped task tree
-        task_groups = self.build_task_groups(tasks)
         return render(request, 'dept_qa/checklist_detail.html', {
             'checklist': checklist,
             'completion_percentage': completion_percentage,
-            'task_groups': task_groups,
+            'sections': section_outline(checklist),
         })
 
-    def build_task_groups(self, tasks):
-        """
-        Groups tasks by Component Type and builds a nested task tree.
-        """
-        # Organize tasks by their Component Types
-        component_type_groups = {}
-
-        # Tasks not associated with any Component Type
-        general_tasks = []
-
-        for task_obj in tasks:
-            task = task_obj.task
-            component_types = task.components.values_list('component_types__name', flat=True).distinct()
-
-            if component_types:
-                for ct_name in component_types:
-                    if ct_name not in component_type_groups:
-                        component_type_groups[ct_name] = []
-                    component_type_groups[ct_name].append(task_obj)
-            else:
-                # For tasks not associated with any Component Type
-                general_tasks.append(task_obj)
-
-        # Build task trees for each group
-        for ct_name, task_list in component_type_groups.items():
-            component_type_groups[ct_name] = self.build_task_tree(task_list)
-
-        # Build task tree for general tasks
-        general_task_tree = self.build_task_tree(general_tasks)
-
-        return {
-            'component_type_groups': component_type_groups,
-            'general_tasks': general_task_tree,
-        }
-
-    def build_task_tree(self, tasks):
+
+class ChecklistSectionView(View):
+    """
+    Returns the rendered task rows of one section of a checklist as an HTML fragment.
+
+    The section is picked by its ``group`` query parameter, the snapshotted
+    Component Type name, with an empty value for General.
+    """
+
+    def get(self, request, iris_number):
+        checklist = get_object_or_404(Checklist.objects.only('id', 'version'), platform__iris_number=iris_number)
+        group = request.GET.get('group', '')
+        # Only real sections get a cache entry
+        if group not in {section['group'] for section in section_outline(checklist)}:
+            raise Http404('No such section.')
+        return HttpResponse(self.get_section(checklist, group))
+
+    def get_section(self, checklist, group):
         """
-        Builds a nested task tree from a list of ChecklistTask objects.
+        Returns the section HTML, cached under the checklist version.
+
+        The version bumps on every ChecklistTask write, so an unchanged section
+        is served without touching its tasks, and a cache miss reads only the
+        tasks of this section through the (checklist, group, path) index.
         """
-        task_dict = {}
-        for task_obj in tasks:
-            task_dict[task_obj.task.id] = {'task': task_obj, 'subtasks': []}
-
-        root_tasks = []
-        for task_obj in tasks:
-            task = task_obj.task
-            if task.parent_task:
-                parent_id = task.parent_task.id
-                if parent_id in task_dict:
-                    task_dict[parent_id]['subtasks'].append(task_dict[task.id])
-                else:
-                    # Parent task not in tasks, could be a task from another component or general task
-                    pass
-            else:
-                root_tasks.append(task_dict[task.id])
-
-        return root_tasks
+        fragment_cache = caches[settings.CHECKLIST_FRAGMENT_CACHE]
+        key = f'{fragment_key_prefix(checklist)}:section:{quote(group)}'
+        html = fragment_cache.get(key)
+        if html is None:
+            tasks = ChecklistTask.objects.filter(checklist=checklist, group=group).order_by('path')
+            html = render_to_string('dept_qa/checklist_section.html', {'task_rows': build_task_tree(tasks)})
+            fragment_cache.set(key, html)
+        return html
+
+
+def fragment_key_prefix(checklist):
+    return f'dept_qa:checklist:{checklist.pk}:v{checklist.version}'
+
+
+def section_outline(checklist):
+    """
+    Returns the name, group and task count of each section, in display order, with General last.
+
+    The outline comes from one aggregate query and is cached under the
+    checklist version like the sections themselves; the task rows are
+    loaded per section by ChecklistSectionView, which also checks
+    requested groups against it.
+    """
+    fragment_cache = caches[settings.CHECKLIST_FRAGMENT_CACHE]
+    key = f'{fragment_key_prefix(checklist)}:outline'
+    outline = fragment_cache.get(key)
+    if outline is None:
+        groups = ChecklistTask.objects.filter(checklist=checklist).order_by().values('group').annotate(
+            task_count=models.Count('id'), first_path=models.Min('path'),
+        )
+        # Sections appear in the order of their first task, as on the PDF
+        groups = sorted(groups, key=lambda group: (group['group'] == '', group['first_path']))
+        outline = [
+            {'name': group['group'] or 'General', 'group': group['group'], 'task_count': group['task_count']}
+            for group in groups
+        ]
+        fragment_cache.set(key, outline)
+    return outline
+
+
+class ArchivedChecklistView(View):
+    """
+    Read-only view of an archived checklist, or its archive document as JSON with ``?format=json``.
+    """
+
+    def get(self, request, checklist_id):
+        archive = get_object_or_404(
+            ArchivedChecklist.objects.select_related('platform__product_generation__product_line', 'platform__customer'),
+            checklist_id=checklist_id,
+        )
+        if request.GET.get('format') == 'json':
+            response = JsonResponse(archive.document())
+            response['Content-Disposition'] = (
+                f'attachment; filename="IRIS{archive.platform.iris_number}-checklist-{archive.checklist_id}.json"'
+            )
+            return response
+        return render(request, 'dept_qa/archived_checklist.html', {
+            'archive': archive,
+            'sections': build_sections(archive.tasks()),
+            'issues': archive.issues(),
+        })
+
+
+class ChecklistTaskAutosaveView(View):
+    """
+    Saves the status and notes of one or a few checklist tasks posted as JSON and returns the new progress.
+
+    Expects ``{"updates": {"<ChecklistTask id>": {"status": ..., "notes": ...}}}``.
+    """
+    max_updates = 50
+
+    def post(self, request, iris_number):
+        try:
+            updates = self.parse_updates(request.body)
+        except ValueError as error:
+            return JsonResponse({'error': str(error)}, status=400)
+
+        checklist = get_object_or_404(Checklist, platform__iris_number=iris_number)
+        changed_tasks = apply_task_updates(checklist, updates)
+        return JsonResponse({
+            'changed': [task.id for task in changed_tasks],
+            'total_tasks': checklist.total_tasks,
+            'complete_tasks': checklist.complete_tasks,
+            'failed_tasks': checklist.failed_tasks,
+            'incomplete_tasks': checklist.incomplete_tasks,
+            'completion_percentage': checklist.completion_percentage(),
+            'is_complete': checklist.is_complete(),
+        })
+
+    def parse_updates(self, body):
+        try:
+            raw_updates = json.loads(body)['updates']
+            updates = {
+                int(task_id): {
+                    field: values[field] for field in ('status', 'notes') if isinstance(values.get(field), str)
+                }
+                for task_id, values in raw_updates.items()
+            }
+        except (AttributeError, KeyError, TypeError, ValueError):
+            raise ValueError('Expected {"updates": {"<task id>": {"status": ..., "notes": ...}}}.')
+        if len(updates) > self.max_updates:
+            raise ValueError(f'At most {self.max_updates} tasks can be saved at once.')
+        return updates
+
+
+class ChecklistPdfView(View):
+    """
+    Serves the checklist as a PDF, queueing it for background rendering when it is not ready yet.
+    """
+    retry_after = 3
+
+    def get(self, request, iris_number):
+        checklist = get_object_or_404(
+            Checklist.objects.select_related('platform__product_generation', 'platform__customer'),
+            platform__iris_number=iris_number,
+        )
+        path = request_pdf(checklist)
+        if path is None:
+            response = render(request, 'dept_qa/checklist_pdf_pending.html', {'checklist': checklist}, status=202)
+            response['Retry-After'] = str(self.retry_after)
+            response['Refresh'] = str(self.retry_after)
+            return response
+        return FileResponse(
+            open(path, 'rb'),
+            as_attachment=True,
+            filename=pdf_filename(checklist),
+            content_type='application/pdf',
+        )
+
+
+class AnalyticsDashboardView(View):
+    """
+    Shows QA analytics read only from the summary tables, so it costs the same however much history exists.
+    """
+    limit = 20
+
+    def get(self, request):
+        component_summaries = ComponentStatusSummary.objects.filter(total_tasks__gt=0).select_related(
+            'component'
+        ).annotate(
+            failure_ratio=Cast('failed_tasks', models.FloatField()) / models.F('total_tasks')
+        ).order_by('-failure_ratio', 'component__name')[:self.limit]
+        return render(request, 'base/dashboard.html', {
+            'component_summaries': component_summaries,
+            'component_type_summaries': ComponentTypeStatusSummary.objects.filter(total_tasks__gt=0).order_by('group'),
+            'generation_summaries': GenerationCompletionSummary.objects.filter(
+                completed_checklists__gt=0
+            ).select_related('product_generation__product_line').order_by(
+                'product_generation__product_line__name', 'product_generation__generation_number'
+            ),
+            'customer_summaries': CustomerIssueSummary.objects.filter(open_issues__gt=0).select_related(
+                'customer'
+            ).order_by('-open_issues', 'customer__name')[:self.limit],
+        })
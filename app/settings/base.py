@@ -39,6 +39,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Opt-in, see REQUEST_INSTRUMENTATION below
+    'app.core.middleware.QueryInstrumentationMiddleware',
+    # Opt-in, see REPLICA_DATABASE below
+    'app.core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -132,6 +136,57 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'  # For production
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'  # For user-uploaded files
 
+# Caches
+# The default cache holds small shared state such as snapshot version numbers.
+# Rendered checklist sections go to their own bounded cache so they cannot
+# crowd anything else out.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'default',
+    },
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fragments',
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+            'CULL_FREQUENCY': 4,
+        },
+    },
+}
+
+# Cache alias used for rendered checklist detail sections
+CHECKLIST_FRAGMENT_CACHE = 'fragments'
+
+# Seconds a process may keep a VersionedSnapshot (task index, component catalog, ...)
+# before rebuilding it. Invalidations only reach other processes through a shared
+# default cache, so with the local-memory cache this is how long they can lag.
+SNAPSHOT_MAX_AGE = 60
+
+# Per-request SQL and latency instrumentation (Server-Timing headers, JSON logs, /core/request-stats/)
+REQUEST_INSTRUMENTATION = config('REQUEST_INSTRUMENTATION', default=False, cast=bool)
+REQUEST_INSTRUMENTATION_SAMPLES = 1000
+
+# Read replica, enabled by adding a 'replica' alias to DATABASES in dev.py / prod.py.
+# Safe requests to REPLICA_VIEWS read from it; writes always go to the primary and
+# pin the client to it for REPLICA_PIN_SECONDS, longer than the expected replication lag.
+DATABASE_ROUTERS = ['app.core.db_router.PrimaryReplicaRouter']
+REPLICA_DATABASE = None
+REPLICA_PIN_SECONDS = 10
+REPLICA_VIEWS = [
+    'dept_qa:customer_autocomplete',
+    'dept_qa:checklist_detail',
+    'dept_qa:checklist_section',
+    'dept_qa:checklist_list',
+    'dept_qa:checklist_export',
+    'dept_qa:dashboard',
+]
+
+# Checklist PDFs are rendered by a pool of worker processes and kept under MEDIA_ROOT
+CHECKLIST_PDF_WORKERS = config('CHECKLIST_PDF_WORKERS', default=2, cast=int)
+CHECKLIST_PDF_DIR = 'checklists/pdf'
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -17,6 +17,13 @@ DATABASES = {
     )
 }
 
+# Optional read replica (e.g. a second SQLite file copied from the primary), see app.core.db_router
+if config('DEV_REPLICA_DB_URL', default=''):
+    DATABASES['replica'] = dj_database_url.parse(config('DEV_REPLICA_DB_URL'))
+    # Tests run against one database; the replica mirrors it
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    REPLICA_DATABASE = 'replica'
+
 # Email backend (console for development)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
@@ -15,8 +15,38 @@ DATABASES = {
     'default': dj_database_url.parse(config('PROD_PGSQL_DB_URL'))
 }
 
+# Optional read replica (a streaming replica of PROD_PGSQL_DB_URL), see app.core.db_router
+if config('PROD_REPLICA_DB_URL', default=''):
+    DATABASES['replica'] = dj_database_url.parse(config('PROD_REPLICA_DB_URL'))
+    # Tests run against one database; the replica mirrors it
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    REPLICA_DATABASE = 'replica'
+
+# Caches
+# Point REDIS_URL at any Redis-compatible server (configure it with a maxmemory
+# eviction policy such as allkeys-lru). It is required: the snapshot versions and
+# the checklist fragment cache are only correct when every worker process shares them.
+REDIS_URL = config('REDIS_URL')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'atg',
+    },
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'atg-fragments',
+        'TIMEOUT': 60 * 60 * 24,
+    },
+}
+
 # Static and Media files (using WhiteNoise for static file serving)
-MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
+# Right after SecurityMiddleware, so static responses still get the SSL redirect and HSTS header
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+)
 
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
@@ -22,4 +22,5 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include('allauth.urls')),
     path('qa/', include('app.dept_qa.urls', namespace='dept_qa')),
+    path('core/', include('app.core.urls', namespace='core')),
 ]